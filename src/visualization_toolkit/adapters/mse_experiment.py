@@ -3,7 +3,30 @@
 import numpy as np
 import pandas as pd
 
-from ..metrics.mse import mse
+from ..core import backend
+from ..core.planner import plan_execution, track
+from ..metrics.mse import mse_rows, segment_mse
+from ..metrics.spectral import band_energy, band_mse, energy_ratio_db
+from ..metrics.windowed import window_starts, windowed_mse
+
+
+def pack_signals(signals: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Concatenate signals of different lengths into a flat array with offsets.
+
+    Parameters:
+        signals (list[np.ndarray]): One-dimensional signals.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            The concatenated signals and the offsets of length
+            len(signals) + 1, signal i is `flat[offsets[i]:offsets[i + 1]]`.
+    """
+    lengths = [len(signal) for signal in signals]
+    offsets = np.zeros(len(signals) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    flat = np.concatenate(signals) if signals else np.empty(0)
+    return flat, offsets
 
 
 def mse_experiment(
@@ -11,6 +34,11 @@ def mse_experiment(
     malformed_signals: dict[str, np.ndarray],
     hue_values: list,
     hue_name: str,
+    offsets: np.ndarray | None = None,
+    window: int | None = None,
+    window_step: int | None = None,
+    bands: dict[str, tuple] | None = None,
+    fs: float = 1.0,
 ) -> pd.DataFrame:
     """
     Computes MSE between clean and malformed signals for different
@@ -19,11 +47,17 @@ def mse_experiment(
     The function assumes that signals are ordered such that for each hue value
     there are `n_samples` consecutive signal realizations.
 
+    Signals of different lengths are passed as flat arrays of concatenated
+    signals with their boundaries in `offsets`, see `pack_signals`.
+
     Returns a DataFrame with the following columns:
         - hue_name: value from the `hue_values` list
         - mse: mean squared error between clean and corresponding signal
         - label: key from the `signals` dictionary identifying the method/signal
         - run: index of the run within the same hue value
+        - window: start sample of the window, only if `window` is given
+        - band: name of the frequency band, only if `bands` is given
+        - spectral_snr: signal-to-error ratio of the band in dB, only if `bands` is given
 
     Parameters:
         original_signals (np.ndarray):
@@ -40,29 +74,195 @@ def mse_experiment(
 
         hue_name (str): Name of the column to use for the hue column.
 
+        offsets (np.ndarray | None):
+            Signal boundaries for ragged signals. If given, `original_signals`
+            and every array of `malformed_signals` are flat arrays of concatenated
+            signals and signal i is `signals[offsets[i]:offsets[i + 1]]`.
+
+        window (int | None):
+            If given, the MSE is computed over windows of `window` samples
+            of every signal, see `metrics.windowed.windowed_mse`, with one
+            row per signal and window. Signals must have shape
+            (n_levels * n_samples, n_times) and `offsets` must be None.
+
+        window_step (int | None):
+            Distance between the starts of consecutive windows.
+            If None, the windows do not overlap.
+
+        bands (dict[str, tuple] | None):
+            If given, mapping from band names to frequency bands (low, high).
+            The "mse" column then holds the error energy of every band,
+            see `metrics.spectral.band_mse`, with one row per signal and band.
+            Signals must have shape (n_levels * n_samples, n_times),
+            `offsets` and `window` must be None.
+
+        fs (float):
+            Sampling frequency in the units of `bands`.
+
     Returns:
         pd.DataFrame:
             DataFrame containing MSE statistics for each signal,
-            hue value, level, and run.
+            hue value, level, run and window.
     """
+    if window is not None and offsets is not None:
+        raise ValueError("Windowed MSE is not supported for ragged signals")
+    if bands is not None and (offsets is not None or window is not None):
+        raise ValueError("Band MSE is not supported with offsets or window")
     hue_values = np.asarray(hue_values)
     n_ratios = len(hue_values)
-    n_samples = len(original_signals) // n_ratios
-    rows = []
+    if offsets is None:
+        n_total = len(original_signals)
+    else:
+        offsets = np.asarray(offsets, dtype=np.int64)
+        n_total = len(offsets) - 1
+    n_samples = n_total // n_ratios
+    n_signals = n_ratios * n_samples
+    if offsets is None:
+        original_signals = np.asarray(original_signals)[:n_signals]
+    else:
+        offsets = offsets[: n_signals + 1]
+        original_signals = np.asarray(original_signals)[: offsets[-1]]
+
+    def compute_mse(signals):
+        if offsets is None:
+            return _planned_mse_rows(original_signals, np.asarray(signals)[:n_signals])
+        return segment_mse(
+            original_signals, np.asarray(signals)[: offsets[-1]], offsets
+        )
+
+    index = np.arange(n_signals)
+    if window is not None:
+        return _windowed_experiment(
+            original_signals,
+            malformed_signals,
+            hue_values[index // n_samples],
+            index % n_samples,
+            hue_name,
+            window,
+            window_step,
+        )
+    if bands is not None:
+        return _band_experiment(
+            original_signals,
+            malformed_signals,
+            hue_values[index // n_samples],
+            index % n_samples,
+            hue_name,
+            bands,
+            fs,
+        )
+    frames = []
+    for label, signals in malformed_signals.items():
+        frames.append(
+            pd.DataFrame(
+                {
+                    hue_name: hue_values[index // n_samples],
+                    "mse": compute_mse(signals),
+                    "label": label,
+                    "run": index % n_samples,
+                }
+            )
+        )
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def _planned_mse_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Row-wise MSE computed at once or in blocks of rows, whichever fits the memory budget.
+
+    Inputs that are not C-contiguous float64 arrays, e.g. float32 or
+    memory-mapped signals, are converted block by block.
+    """
+    n_rows = len(a)
+    row_size = a[0].size if n_rows else 0
+    converted = sum(
+        not (x.dtype == np.float64 and x.flags.c_contiguous) for x in (a, b)
+    )
+    plan = plan_execution(
+        "mse_experiment",
+        n_rows,
+        (converted * row_size + 1) * 8,
+        fixed_bytes=8 * min(backend.MSE_CHUNK_ELEMENTS, n_rows * row_size),
+    )
+    with track(plan):
+        if plan.strategy == "in_memory" or n_rows == 0:
+            return mse_rows(a, b)
+        rows = plan.chunk_rows
+        return np.concatenate(
+            [
+                mse_rows(a[start : start + rows], b[start : start + rows])
+                for start in range(0, n_rows, rows)
+            ]
+        )
+
+
+def _windowed_experiment(
+    original_signals: np.ndarray,
+    malformed_signals: dict[str, np.ndarray],
+    hues: np.ndarray,
+    runs: np.ndarray,
+    hue_name: str,
+    window: int,
+    window_step: int | None,
+) -> pd.DataFrame:
+    """
+    Build the tidy DataFrame of windowed MSE for every signal and window.
+    """
+    n_signals = len(hues)
+    starts = window_starts(original_signals.shape[1], window, window_step)
+    frames = []
+    for label, signals in malformed_signals.items():
+        values = windowed_mse(
+            original_signals, np.asarray(signals)[:n_signals], window, window_step
+        )
+        frames.append(
+            pd.DataFrame(
+                {
+                    hue_name: np.repeat(hues, len(starts)),
+                    "mse": values.ravel(),
+                    "label": label,
+                    "run": np.repeat(runs, len(starts)),
+                    "window": np.tile(starts, n_signals),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def _band_experiment(
+    original_signals: np.ndarray,
+    malformed_signals: dict[str, np.ndarray],
+    hues: np.ndarray,
+    runs: np.ndarray,
+    hue_name: str,
+    bands: dict[str, tuple],
+    fs: float,
+) -> pd.DataFrame:
+    """
+    Build the tidy DataFrame of band errors for every signal and band.
+
+    The spectra of the reference signals are computed once, the spectra of
+    the errors once per label.
+    """
+    n_signals = len(hues)
+    names = list(bands)
+    edges = [bands[name] for name in names]
+    reference = band_energy(original_signals, edges, fs)
+    frames = []
     for label, signals in malformed_signals.items():
-        for i, hue_value in enumerate(hue_values):
-            for run in range(n_samples):
-                idx = i * n_samples + run
-                rows.append(
-                    {
-                        hue_name: hue_value,
-                        "mse": mse(
-                            original_signals[idx],
-                            signals[idx],
-                        ),
-                        "label": label,
-                        "run": run,
-                    }
-                )
-
-    return pd.DataFrame(rows)
+        signals = np.asarray(signals)[:n_signals]
+        errors = band_mse(original_signals, signals, edges, fs)
+        frames.append(
+            pd.DataFrame(
+                {
+                    hue_name: np.repeat(hues, len(names)),
+                    "mse": errors.ravel(),
+                    "label": label,
+                    "run": np.repeat(runs, len(names)),
+                    "band": np.tile(names, n_signals),
+                    "spectral_snr": energy_ratio_db(reference, errors).ravel(),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
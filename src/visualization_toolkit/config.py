@@ -1,12 +1,66 @@
 """Global configuration for the project."""
 
-from typing import Any, Dict
+import functools
+import importlib.util
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Mapping
 
 from .localization import en, ru
 
+_language_override: ContextVar[str | None] = ContextVar("language", default=None)
+_translations_override: ContextVar[Mapping[str, Any] | None] = ContextVar(
+    "custom_translations", default=None
+)
+_pyplot_override: ContextVar[bool | None] = ContextVar("use_pyplot", default=None)
+
+
+_SIZE_UNITS = {
+    "B": 1,
+    "KB": 1000,
+    "MB": 1000**2,
+    "GB": 1000**3,
+    "TB": 1000**4,
+    "KIB": 1024,
+    "MIB": 1024**2,
+    "GIB": 1024**3,
+    "TIB": 1024**4,
+}
+
+
+def _parse_size(size: int | str) -> int:
+    """
+    Convert a size like 2**30, "512MB" or "2GiB" into bytes.
+    """
+    if isinstance(size, str):
+        match = re.fullmatch(r"(\d+(?:\.\d*)?)\s*([A-Za-z]*)", size.strip())
+        unit = (match.group(2).upper() or "B") if match else None
+        if unit not in _SIZE_UNITS:
+            raise ValueError(f"Cannot parse size '{size}'")
+        size = float(match.group(1)) * _SIZE_UNITS[unit]
+    size = int(size)
+    if size <= 0:
+        raise ValueError(f"Size must be positive, got {size}")
+    return size
+
+
+@functools.cache
+def _numba_available() -> bool:
+    """
+    Check once whether numba can be imported.
+    """
+    return importlib.util.find_spec("numba") is not None
+
 
 class LibraryConfig:
-    """Глобальная конфигурация библиотеки"""
+    """Глобальная конфигурация библиотеки
+
+    The language and custom translations set by `set_language` and
+    `set_custom_translations` are process-wide defaults. The `language`
+    context manager overrides them for the current thread or asyncio task
+    only, so that figures in different languages can be rendered concurrently.
+    """
 
     _instance = None
     _translations = {
@@ -15,12 +69,27 @@ class LibraryConfig:
     }
     _current_language = "en"
     _custom_translations: Dict[str, Any] = {}
+    _use_pyplot = True
+    _backends = ("auto", "numpy", "numba")
+    _backend = "numpy"
+    _memory_budget: int | None = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
+    @classmethod
+    def _check_language(cls, language: str) -> None:
+        """
+        Raise ValueError if the language is not supported.
+        """
+        if language not in cls._translations:
+            available = list(cls._translations.keys())
+            raise ValueError(
+                f"Language '{language}' not supported. Available: {available}"
+            )
+
     @classmethod
     def set_language(cls, language: str) -> None:
         """
@@ -31,13 +100,21 @@ class LibraryConfig:
         Returns:
            None
         """
-        if language not in cls._translations:
-            available = list(cls._translations.keys())
-            raise ValueError(
-                f"Language '{language}' not supported. Available: {available}"
-            )
+        cls._check_language(language)
         cls._current_language = language
 
+    @classmethod
+    def set_custom_translations(cls, translations: Mapping[str, Any]) -> None:
+        """
+        Set process-wide translations that take precedence over the built-in ones.
+
+        Parameters:
+           translations (Mapping[str, Any]): Mapping from keys to texts.
+        Returns:
+           None
+        """
+        cls._custom_translations = dict(translations)
+
     @classmethod
     def get_language(cls) -> str:
         """
@@ -46,8 +123,141 @@ class LibraryConfig:
         Returns:
           str: The current language code.
         """
+        override = _language_override.get()
+        if override is not None:
+            return override
         return cls._current_language
 
+    @classmethod
+    @contextmanager
+    def language(
+        cls, language: str, translations: Mapping[str, Any] | None = None
+    ) -> Iterator[None]:
+        """
+        Override the language in the current context.
+
+        The override is visible only to the current thread or asyncio task
+        and to the code called from it.
+
+        Parameters:
+           language (str): The language code. Supported languages are 'ru' and 'en'.
+           translations (Mapping[str, Any] | None): Optional custom translations
+               that take precedence over the built-in ones inside the block.
+        """
+        cls._check_language(language)
+        language_token = _language_override.set(language)
+        translations_token = None
+        if translations is not None:
+            translations_token = _translations_override.set(dict(translations))
+        try:
+            yield
+        finally:
+            if translations_token is not None:
+                _translations_override.reset(translations_token)
+            _language_override.reset(language_token)
+
+    @classmethod
+    def set_use_pyplot(cls, use_pyplot: bool) -> None:
+        """
+        Set whether new figures are created through pyplot.
+
+        If disabled, figures are built as `matplotlib.figure.Figure` objects
+        with an Agg canvas and are never registered with pyplot's figure
+        manager, so they are freed as soon as they are no longer referenced.
+
+        Parameters:
+           use_pyplot (bool): The process-wide default.
+        Returns:
+           None
+        """
+        cls._use_pyplot = bool(use_pyplot)
+
+    @classmethod
+    def get_use_pyplot(cls) -> bool:
+        """
+        Get whether new figures are created through pyplot.
+
+        Returns:
+          bool: True if pyplot is used in the current context.
+        """
+        override = _pyplot_override.get()
+        if override is not None:
+            return override
+        return cls._use_pyplot
+
+    @classmethod
+    @contextmanager
+    def pyplot_free(cls) -> Iterator[None]:
+        """
+        Create figures without pyplot in the current context.
+        """
+        token = _pyplot_override.set(False)
+        try:
+            yield
+        finally:
+            _pyplot_override.reset(token)
+
+    @classmethod
+    def set_backend(cls, backend: str) -> None:
+        """
+        Set the backend of the numerical kernels.
+
+        "numpy" (the default) uses plain NumPy/SciPy, "numba" uses parallel
+        compiled kernels and requires numba to be installed, and "auto" picks
+        numba when it is available.
+
+        Parameters:
+           backend (str): One of "auto", "numpy" and "numba".
+        Returns:
+           None
+        """
+        if backend not in cls._backends:
+            raise ValueError(
+                f"Backend '{backend}' not supported. Available: {list(cls._backends)}"
+            )
+        if backend == "numba" and not _numba_available():
+            raise ImportError("The numba backend requires numba to be installed")
+        cls._backend = backend
+
+    @classmethod
+    def get_backend(cls) -> str:
+        """
+        Get the backend of the numerical kernels.
+
+        Returns:
+          str: "numpy" or "numba", with "auto" resolved.
+        """
+        if cls._backend == "auto":
+            return "numba" if _numba_available() else "numpy"
+        return cls._backend
+
+    @classmethod
+    def set_memory_budget(cls, budget: int | str | None) -> None:
+        """
+        Set the memory budget of large operations.
+
+        Operations like `mse_experiment`, `aggregate` and `boxplot` estimate
+        their working set and switch to chunked or memmap-backed execution
+        if it exceeds the budget, see `core.planner`.
+
+        Parameters:
+           budget (int | str | None): Budget in bytes or a size like "2GB" or "512MiB".
+               None disables planning, everything is processed in memory.
+        Returns:
+           None
+        """
+        cls._memory_budget = None if budget is None else _parse_size(budget)
+
+    @classmethod
+    def get_memory_budget(cls) -> int | None:
+        """
+        Get the memory budget of large operations.
+
+        Returns:
+          int | None: The budget in bytes, None if not set.
+        """
+        return cls._memory_budget
+
     @classmethod
     def get_text(cls, key: str, **kwargs) -> str:
         """
@@ -58,10 +268,13 @@ class LibraryConfig:
         Returns:
           str: The translated text.
         """
-        if key in cls._custom_translations:
-            template = cls._custom_translations[key]
+        custom = _translations_override.get()
+        if custom is None:
+            custom = cls._custom_translations
+        if key in custom:
+            template = custom[key]
         else:
-            translations = cls._translations.get(cls._current_language, {})
+            translations = cls._translations.get(cls.get_language(), {})
             template = translations.get(key, key)
 
         if kwargs:
@@ -95,3 +308,82 @@ def get_text(key: str) -> str:
         str: The translated text.
     """
     return config.get_text(key)
+
+
+def language(language: str, translations: Mapping[str, Any] | None = None):
+    """Temporarily set the interface language in the current context
+
+    Parameters:
+        language (str): Language code
+        translations (Mapping[str, Any] | None): Optional custom translations
+
+    Usage example:
+    >>> from visualization_toolkit.config import language
+    >>> with language("ru"):
+    ...     ax = mseplot(df, x="snr", y="mse", hue="label")
+    """
+    return config.language(language, translations)
+
+
+def set_custom_translations(translations: Mapping[str, Any]) -> None:
+    """Setting custom translations that take precedence over the built-in ones
+
+    Parameters:
+        translations (Mapping[str, Any]): Mapping from keys to texts
+
+    Usage example:
+    >>> from visualization_toolkit.config import set_custom_translations
+    >>> set_custom_translations({"y_label_mse": "MSE, a.u."})
+    """
+    config.set_custom_translations(translations)
+
+
+def set_use_pyplot(use_pyplot: bool) -> None:
+    """Setting whether new figures are created through pyplot
+
+    Parameters:
+        use_pyplot (bool): If False, figures are not registered with pyplot
+
+    Usage example:
+    >>> from visualization_toolkit.config import set_use_pyplot
+    >>> set_use_pyplot(False)
+    """
+    config.set_use_pyplot(use_pyplot)
+
+
+def pyplot_free():
+    """Temporarily create figures without pyplot in the current context
+
+    Usage example:
+    >>> from visualization_toolkit.config import pyplot_free
+    >>> with pyplot_free():
+    ...     ax = mseplot(df, x="snr", y="mse", hue="label")
+    ...     ax.figure.savefig("mse.png")
+    """
+    return config.pyplot_free()
+
+
+def set_backend(backend: str) -> None:
+    """Setting the backend of the numerical kernels
+
+    Parameters:
+        backend (str): "auto", "numpy" (default) or "numba"
+
+    Usage example:
+    >>> from visualization_toolkit.config import set_backend
+    >>> set_backend("numba")
+    """
+    config.set_backend(backend)
+
+
+def set_memory_budget(budget: int | str | None) -> None:
+    """Setting the memory budget of large operations
+
+    Parameters:
+        budget (int | str | None): Budget in bytes or a size like "2GB", None for no limit
+
+    Usage example:
+    >>> from visualization_toolkit.config import set_memory_budget
+    >>> set_memory_budget("4GB")
+    """
+    config.set_memory_budget(budget)
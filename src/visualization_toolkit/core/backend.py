@@ -0,0 +1,375 @@
+"""Numerical kernels with NumPy and Numba backends
+
+Every kernel has a NumPy implementation and, if numba is installed,
+a parallel compiled one with the same results. NumPy is used unless the
+Numba backend is selected with `config.set_backend`; the Numba kernels are
+compiled on first use.
+
+The threading layer of Numba is left to the application. Some TBB builds
+hang at the interpreter exit if the layer is started outside the main
+thread, so code launching the kernels from worker threads, e.g. the
+rendering pipeline, calls `initialize` in the main thread first.
+"""
+
+import functools
+import math
+from types import SimpleNamespace
+
+import numpy as np
+
+from ..config import config
+
+MSE_CHUNK_ELEMENTS = 2**22
+
+
+def _numpy_mse_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Row-wise MSE computed in chunks of rows to bound the temporaries.
+    """
+    n_rows, n_cols = a.shape
+    out = np.empty(n_rows)
+    step = max(1, MSE_CHUNK_ELEMENTS // max(n_cols, 1))
+    for start in range(0, n_rows, step):
+        diff = a[start : start + step] - b[start : start + step]
+        out[start : start + step] = np.einsum("ij,ij->i", diff, diff) / n_cols
+    return out
+
+
+def _numpy_segment_mse(a: np.ndarray, b: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Segment MSE by `np.add.reduceat` over blocks of whole segments.
+    """
+    n_segments = len(offsets) - 1
+    out = np.full(n_segments, np.nan)
+    start = 0
+    while start < n_segments:
+        # The block ends at the last segment boundary within the chunk size.
+        limit = offsets[start] + MSE_CHUNK_ELEMENTS
+        stop = max(start + 1, int(np.searchsorted(offsets, limit, side="right")) - 1)
+        stop = min(stop, n_segments)
+        local = offsets[start : stop + 1] - offsets[start]
+        counts = np.diff(local)
+        nonempty = counts > 0
+        if nonempty.any():
+            diff = a[offsets[start] : offsets[stop]] - b[offsets[start] : offsets[stop]]
+            sums = np.add.reduceat(diff * diff, local[:-1][nonempty])
+            out[start:stop][nonempty] = sums / counts[nonempty]
+        start = stop
+    return out
+
+
+def lerp(low, high, fraction):
+    """
+    Linear interpolation in the same floating point form as `np.percentile`.
+
+    Parameters:
+        low (np.ndarray): Lower order statistics.
+        high (np.ndarray): Upper order statistics.
+        fraction (np.ndarray): Position between `low` and `high` in [0, 1].
+    Returns:
+        np.ndarray: The interpolated percentiles.
+    """
+    diff = high - low
+    return np.where(
+        fraction >= 0.5, high - diff * (1 - fraction), low + diff * fraction
+    )
+
+
+def _numpy_segment_percentiles(
+    values: np.ndarray, offsets: np.ndarray, q: np.ndarray
+) -> np.ndarray:
+    """
+    Percentiles of contiguous segments by one sort of all values.
+    """
+    n_segments = len(offsets) - 1
+    counts = np.diff(offsets)
+    segment_id = np.repeat(np.arange(n_segments), counts)
+    # NaN values are sorted to the end of their segments.
+    sorted_values = values[np.lexsort((values, segment_id))]
+    has_nan = np.zeros(n_segments, dtype=bool)
+    nonempty = counts > 0
+    has_nan[nonempty] = np.isnan(sorted_values[offsets[1:][nonempty] - 1])
+
+    position = q[None, :] / 100 * np.maximum(counts[:, None] - 1, 0)
+    low = np.floor(position).astype(np.int64)
+    fraction = position - low
+    last = np.maximum(offsets[1:, None] - 1, 0)
+    high = np.minimum(offsets[:-1, None] + low + 1, last)
+    low = np.minimum(offsets[:-1, None] + low, last)
+    if len(sorted_values):
+        result = lerp(sorted_values[low], sorted_values[high], fraction)
+    else:
+        result = np.full((n_segments, len(q)), np.nan)
+    result[has_nan | ~nonempty] = np.nan
+    return result
+
+
+def _numpy_mannwhitney_asymptotic(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """
+    Two-sided asymptotic Mann-Whitney U test of every row pair through SciPy.
+    """
+    from scipy.stats import mannwhitneyu
+
+    return mannwhitneyu(
+        first, second, axis=1, alternative="two-sided", method="asymptotic"
+    ).pvalue
+
+
+@functools.cache
+def _numba_kernels() -> SimpleNamespace:
+    """
+    Compile the Numba kernels.
+    """
+    import numba
+
+    @numba.njit(parallel=True, cache=True)
+    def mse_rows(a, b):
+        n_rows, n_cols = a.shape
+        out = np.empty(n_rows)
+        for i in numba.prange(n_rows):
+            total = 0.0
+            for j in range(n_cols):
+                diff = a[i, j] - b[i, j]
+                total += diff * diff
+            out[i] = total / n_cols
+        return out
+
+    @numba.njit(parallel=True, cache=True)
+    def segment_mse(a, b, offsets):
+        n_segments = len(offsets) - 1
+        out = np.empty(n_segments)
+        for s in numba.prange(n_segments):
+            total = 0.0
+            for i in range(offsets[s], offsets[s + 1]):
+                diff = a[i] - b[i]
+                total += diff * diff
+            count = offsets[s + 1] - offsets[s]
+            out[s] = total / count if count > 0 else np.nan
+        return out
+
+    @numba.njit(parallel=True, cache=True)
+    def segment_percentiles(values, offsets, q, n_blocks):
+        n_segments = len(offsets) - 1
+        out = np.empty((n_segments, len(q)))
+        max_count = 0
+        for s in range(n_segments):
+            max_count = max(max_count, offsets[s + 1] - offsets[s])
+        n_blocks = min(n_blocks, n_segments)
+        for b in numba.prange(n_blocks):
+            # The segments of a block are sorted in place in one buffer.
+            buffer = np.empty(max_count)
+            for s in range(
+                b * n_segments // n_blocks, (b + 1) * n_segments // n_blocks
+            ):
+                n = offsets[s + 1] - offsets[s]
+                segment = buffer[:n]
+                segment[:] = values[offsets[s] : offsets[s + 1]]
+                segment.sort()
+                for k in range(len(q)):
+                    if n == 0 or np.isnan(segment[n - 1]):
+                        out[s, k] = np.nan
+                        continue
+                    position = q[k] / 100 * (n - 1)
+                    low = int(math.floor(position))
+                    high = min(low + 1, n - 1)
+                    fraction = position - low
+                    diff = segment[high] - segment[low]
+                    if fraction >= 0.5:
+                        out[s, k] = segment[high] - diff * (1 - fraction)
+                    else:
+                        out[s, k] = segment[low] + diff * fraction
+        return out
+
+    @numba.njit(parallel=True, cache=True)
+    def mannwhitney_asymptotic(first, second, n_blocks):
+        n_rows, n1 = first.shape
+        n2 = second.shape[1]
+        n = n1 + n2
+        out = np.empty(n_rows)
+        n_blocks = min(n_blocks, n_rows)
+        for b in numba.prange(n_blocks):
+            # The rows of a block are ranked in buffers sorted in place.
+            combined = np.empty(n)
+            sorted_first = np.empty(n1)
+            for r in range(b * n_rows // n_blocks, (b + 1) * n_rows // n_blocks):
+                combined[:n1] = first[r]
+                combined[n1:] = second[r]
+                combined.sort()
+                if np.isnan(combined[n - 1]):
+                    # NaN values are propagated, as by SciPy.
+                    out[r] = np.nan
+                    continue
+                sorted_first[:] = first[r]
+                sorted_first.sort()
+                rank_sum = 0.0
+                tie_term = 0.0
+                i = 0
+                p = 0
+                while i < n:
+                    j = i
+                    while j + 1 < n and combined[j + 1] == combined[i]:
+                        j += 1
+                    midrank = (i + j) / 2 + 1
+                    # Values of the first sample in the run of ties.
+                    count = 0
+                    while p < n1 and sorted_first[p] == combined[i]:
+                        count += 1
+                        p += 1
+                    rank_sum += count * midrank
+                    ties = j - i + 1
+                    tie_term += ties**3 - ties
+                    i = j + 1
+                u1 = rank_sum - n1 * (n1 + 1) / 2
+                u = max(u1, n1 * n2 - u1)
+                sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+                # Continuity corrected normal approximation, as in SciPy.
+                z = (u - n1 * n2 / 2 - 0.5) / sigma
+                pvalue = math.erfc(z / math.sqrt(2))
+                out[r] = 1.0 if pvalue > 1.0 else pvalue
+        return out
+
+    return SimpleNamespace(
+        mse_rows=mse_rows,
+        segment_mse=segment_mse,
+        segment_percentiles=segment_percentiles,
+        mannwhitney_asymptotic=mannwhitney_asymptotic,
+        get_num_threads=numba.get_num_threads,
+    )
+
+
+def _use_numba(backend: str | None) -> bool:
+    """
+    Resolve the backend to use for a call.
+    """
+    if backend is None:
+        backend = config.get_backend()
+    if backend not in ("numpy", "numba"):
+        raise ValueError(f"Backend '{backend}' not supported")
+    return backend == "numba"
+
+
+def initialize(backend: str | None = None) -> None:
+    """
+    Start the kernels of a backend in the calling thread.
+
+    With the Numba backend a kernel is compiled and launched, which starts
+    the threading layer of Numba in the calling thread.
+
+    Parameters:
+        backend (str | None): "numpy" or "numba", by default the configured one.
+    """
+    if _use_numba(backend):
+        empty = np.zeros((1, 1))
+        _numba_kernels().mse_rows(empty, empty)
+
+
+def mse_rows(a: np.ndarray, b: np.ndarray, backend: str | None = None) -> np.ndarray:
+    """
+    Compute the mean squared error between corresponding rows of two arrays.
+
+    Parameters:
+        a (np.ndarray): Array with shape (n_rows, n_values).
+        b (np.ndarray): Array with the same shape as `a`.
+        backend (str | None): "numpy" or "numba", by default the configured one.
+    Returns:
+        np.ndarray: MSE of every row.
+    """
+    a = np.ascontiguousarray(a, dtype=float)
+    b = np.ascontiguousarray(b, dtype=float)
+    if a.shape != b.shape or a.ndim != 2:
+        raise ValueError(
+            f"Expected two 2D arrays of equal shape, got {a.shape}, {b.shape}"
+        )
+    if _use_numba(backend):
+        return _numba_kernels().mse_rows(a, b)
+    return _numpy_mse_rows(a, b)
+
+
+def segment_mse(
+    a: np.ndarray, b: np.ndarray, offsets: np.ndarray, backend: str | None = None
+) -> np.ndarray:
+    """
+    Compute the mean squared error of contiguous segments of two flat arrays.
+
+    Parameters:
+        a (np.ndarray): Flat array of concatenated signals.
+        b (np.ndarray): Flat array with the same layout as `a`.
+        offsets (np.ndarray): Segment boundaries, segment i is a[offsets[i]:offsets[i + 1]].
+        backend (str | None): "numpy" or "numba", by default the configured one.
+    Returns:
+        np.ndarray: MSE of every segment, NaN for empty segments.
+    """
+    a = np.ascontiguousarray(a, dtype=float)
+    b = np.ascontiguousarray(b, dtype=float)
+    offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+    if a.shape != b.shape or a.ndim != 1:
+        raise ValueError(
+            f"Expected two flat arrays of equal size, got {a.shape}, {b.shape}"
+        )
+    if len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(a):
+        raise ValueError(
+            "offsets must start with 0 and end with the length of the arrays"
+        )
+    if np.any(np.diff(offsets) < 0):
+        raise ValueError("offsets must be non-decreasing")
+    if _use_numba(backend):
+        return _numba_kernels().segment_mse(a, b, offsets)
+    return _numpy_segment_mse(a, b, offsets)
+
+
+def segment_percentiles(
+    values: np.ndarray,
+    offsets: np.ndarray,
+    q,
+    backend: str | None = None,
+) -> np.ndarray:
+    """
+    Compute percentiles of contiguous segments of values.
+
+    The results are equal to `np.percentile` with linear interpolation
+    applied to every segment; segments that are empty or contain NaN give NaN.
+
+    Parameters:
+        values (np.ndarray): Values grouped into contiguous segments, not necessarily sorted.
+        offsets (np.ndarray): Segment boundaries, segment i is values[offsets[i]:offsets[i + 1]].
+        q (array-like): Percentiles in [0, 100].
+        backend (str | None): "numpy" or "numba", by default the configured one.
+    Returns:
+        np.ndarray: Percentiles with shape (n_segments, len(q)).
+    """
+    values = np.ascontiguousarray(values, dtype=float)
+    offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+    q = np.atleast_1d(np.asarray(q, dtype=float))
+    if _use_numba(backend):
+        kernels = _numba_kernels()
+        # Every thread sorts its block of segments in one buffer.
+        return kernels.segment_percentiles(
+            values, offsets, q, kernels.get_num_threads()
+        )
+    return _numpy_segment_percentiles(values, offsets, q)
+
+
+def mannwhitney_asymptotic(
+    first: np.ndarray, second: np.ndarray, backend: str | None = None
+) -> np.ndarray:
+    """
+    Two-sided Mann-Whitney U tests of row pairs with the normal approximation.
+
+    The ranks are tie-corrected and the continuity correction is applied,
+    the same as `scipy.stats.mannwhitneyu(..., method="asymptotic")`.
+    The p-value of a test is NaN if one of its samples contains NaN.
+
+    Parameters:
+        first (np.ndarray): First samples with shape (n_tests, n1).
+        second (np.ndarray): Second samples with shape (n_tests, n2).
+        backend (str | None): "numpy" or "numba", by default the configured one.
+    Returns:
+        np.ndarray: p-value of every test.
+    """
+    first = np.ascontiguousarray(first, dtype=float)
+    second = np.ascontiguousarray(second, dtype=float)
+    if _use_numba(backend):
+        kernels = _numba_kernels()
+        # Every thread ranks its block of rows in one set of buffers.
+        return kernels.mannwhitney_asymptotic(first, second, kernels.get_num_threads())
+    return _numpy_mannwhitney_asymptotic(first, second)
@@ -0,0 +1,276 @@
+"""In-memory memoization of statistics"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 1024**2
+
+
+def fingerprint(data: pd.DataFrame, columns: Sequence[str]) -> str:
+    """
+    Compute a content fingerprint of the selected DataFrame columns.
+
+    The fingerprint depends on the column names, their dtypes and values,
+    but not on the index, so that equal data stored in differently indexed
+    frames share the same fingerprint.
+
+    Parameters:
+        data (pd.DataFrame): Input DataFrame.
+        columns (Sequence[str]): Names of the columns to take into account.
+
+    Returns:
+        str: Hexadecimal digest of the columns content.
+    """
+    columns = list(dict.fromkeys(columns))
+    subset = data[columns]
+    digest = hashlib.blake2b(digest_size=16)
+    for name, dtype in subset.dtypes.items():
+        digest.update(f"{name}:{dtype};".encode())
+    if len(subset):
+        hashes = pd.util.hash_pandas_object(subset, index=False)
+        digest.update(np.ascontiguousarray(hashes.values).tobytes())
+    return digest.hexdigest()
+
+
+def _nbytes(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _nbytes(key) + _nbytes(item) for key, item in value.items()
+        )
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + _nbytes(vars(value))
+    return sys.getsizeof(value)
+
+
+def _copy(value: Any) -> Any:
+    """
+    Copy a cached value so that callers can not modify the stored result.
+    """
+    if isinstance(value, (np.ndarray, pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy(item) for item in value)
+    return copy.deepcopy(value)
+
+
+class MemoCache:
+    """Least recently used cache bounded by the total size of its values."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Parameters:
+            max_bytes (int): Maximum total size of the stored results in bytes.
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> tuple[bool, Any]:
+        """
+        Look up a result by key.
+
+        Parameters:
+            key (tuple): The cache key.
+        Returns:
+            tuple[bool, Any]: Flag whether the key was found and the stored value.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            value, _ = self._entries[key]
+        return True, _copy(value)
+
+    def put(self, key: tuple, value: Any) -> None:
+        """
+        Store a result, evicting the least recently used ones if needed.
+
+        Values larger than `max_bytes` are not stored.
+
+        Parameters:
+            key (tuple): The cache key.
+            value (Any): The result to store.
+        """
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        value = _copy(value)
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def invalidate(self, func: Callable | None = None) -> None:
+        """
+        Drop stored results.
+
+        Parameters:
+            func (Callable | None): If given, only results of this memoized
+                function are dropped, otherwise the whole cache is cleared.
+        """
+        with self._lock:
+            if func is None:
+                self._entries.clear()
+                self._size = 0
+                return
+            name = (func.__module__, func.__qualname__)
+            for key in [key for key in self._entries if key[:2] == name]:
+                self._size -= self._entries.pop(key)[1]
+
+    def info(self) -> dict:
+        """
+        Get the cache statistics.
+
+        Returns:
+            dict: Numbers of hits, misses and entries, the current size
+            and the maximum size in bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "entries": len(self._entries),
+                "size": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_cache: MemoCache | None = None
+
+
+def enable_cache(max_bytes: int = DEFAULT_MAX_BYTES) -> MemoCache:
+    """
+    Enable memoization of aggregation and significance results.
+
+    Parameters:
+        max_bytes (int): Maximum total size of the stored results in bytes.
+    Returns:
+        MemoCache: The active cache.
+
+    Usage example:
+    >>> from visualization_toolkit.core.cache import enable_cache
+    >>> enable_cache(max_bytes=64 * 1024**2)
+    """
+    global _cache
+    _cache = MemoCache(max_bytes)
+    return _cache
+
+
+def disable_cache() -> None:
+    """
+    Disable memoization and drop all stored results.
+    """
+    global _cache
+    _cache = None
+
+
+def get_cache() -> MemoCache | None:
+    """
+    Get the active cache.
+
+    Returns:
+        MemoCache | None: The active cache, or None if memoization is disabled.
+    """
+    return _cache
+
+
+def clear_cache(func: Callable | None = None) -> None:
+    """
+    Drop stored results of all memoized functions or of one of them.
+
+    Parameters:
+        func (Callable | None): Memoized function whose results are dropped.
+    """
+    if _cache is not None:
+        _cache.invalidate(func)
+
+
+def cache_info() -> dict:
+    """
+    Get hit/miss statistics of the active cache.
+
+    Returns:
+        dict: Cache statistics, see `MemoCache.info`. Empty if memoization is disabled.
+    """
+    if _cache is None:
+        return {}
+    return _cache.info()
+
+
+def memoize(*columns: str) -> Callable:
+    """
+    Memoize a function of a DataFrame passed as the `data` argument.
+
+    The key consists of the function name, the fingerprint of the data
+    columns named by the `columns` arguments and the remaining arguments.
+    Memoization only takes place while the cache is enabled.
+
+    Parameters:
+        *columns (str): Names of the arguments holding column names
+            (or lists of column names) of `data`.
+    Returns:
+        Callable: The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = _cache
+            if cache is None:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            data = params.pop("data")
+            used = []
+            for name in columns:
+                value = params[name]
+                if isinstance(value, (list, tuple)):
+                    used.extend(value)
+                elif value is not None:
+                    used.append(value)
+            key = (
+                func.__module__,
+                func.__qualname__,
+                fingerprint(data, used),
+                repr(sorted(params.items())),
+            )
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            cache.put(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
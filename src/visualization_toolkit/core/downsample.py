@@ -0,0 +1,97 @@
+"""Downsampling of long traces for drawing"""
+
+import numpy as np
+
+
+def minmax(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select the indices of the minimum and maximum of every bucket.
+
+    The trace is split into `n_out // 2` buckets of equal length and the
+    positions of the extremes of every bucket are kept, so the drawn envelope
+    of the trace does not change. The first and the last points are always kept.
+
+    Parameters:
+        y (np.ndarray): Values of the trace.
+        n_out (int): Maximum number of kept points.
+    Returns:
+        np.ndarray: Sorted indices of the kept points.
+    """
+    y = np.asarray(y)
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    n_buckets = max(1, (n_out - 2) // 2)
+    bucket_size = -(-n // n_buckets)
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, bucket_size)
+    starts = np.arange(n_buckets) * bucket_size
+    valid = ~np.all(np.isnan(buckets), axis=1)
+    low = starts[valid] + np.nanargmin(buckets[valid], axis=1)
+    high = starts[valid] + np.nanargmax(buckets[valid], axis=1)
+    return np.unique(np.concatenate([[0, n - 1], low, high]))
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select points by the Largest-Triangle-Three-Buckets algorithm.
+
+    The trace is split into `n_out - 2` buckets and from every bucket the point
+    forming the largest triangle with the previously kept point and the mean
+    of the next bucket is kept. This keeps the visual shape of the trace
+    better than picking every k-th point.
+
+    Parameters:
+        x (np.ndarray): Positions of the points, increasing.
+        y (np.ndarray): Values of the points.
+        n_out (int): Number of kept points, at least 3.
+    Returns:
+        np.ndarray: Sorted indices of the kept points.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Means of all buckets are computed in one pass, the last "bucket" is the last point.
+    counts = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[1 : n - 1], edges[:-1] - 1) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[1 : n - 1], edges[:-1] - 1) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[previous] - mean_x[i + 1]) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (mean_y[i + 1] - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def decimate_extremes(values: np.ndarray, budget: int) -> np.ndarray:
+    """
+    Reduce values to a budget by deterministic, extreme-preserving sampling.
+
+    The values are sorted and evenly spaced order statistics are kept,
+    which always include the minimum and the maximum, so the drawn
+    range of the values does not change.
+
+    Parameters:
+        values (np.ndarray): Values to decimate.
+        budget (int): Maximum number of values to keep.
+    Returns:
+        np.ndarray: The kept values, sorted if decimation took place.
+    """
+    values = np.asarray(values)
+    if budget is None or len(values) <= budget:
+        return values
+    if budget < 2:
+        raise ValueError("budget must be at least 2 to keep both extremes")
+    index = np.round(np.linspace(0, len(values) - 1, budget)).astype(int)
+    return np.sort(values)[np.unique(index)]
@@ -0,0 +1,130 @@
+"""Grouping of values by categorical columns"""
+
+import numpy as np
+import pandas as pd
+
+from .planner import memmap_array, plan_execution, track
+
+# Working set per row of a block: the codes of the keys while the rows are
+# numbered, the sort order, positions and values while they are grouped.
+GROUP_ROW_BYTES = 56
+
+
+def get_x_levels(data: pd.DataFrame, x: str) -> list:
+    """
+    Get the unique values of a column as list.
+    """
+    if x is None:
+        return [None]
+    return np.sort(data[x].unique())
+
+
+def group_values(data: pd.DataFrame, x: str, y: str, hue: str | None) -> dict:
+    """
+    Split the values of a column by (x, hue) groups.
+
+    The rows are numbered by group and the values are then placed in their
+    groups, both in blocks of rows that fit the memory budget
+    (see `config.set_memory_budget`). If the grouped copy of the values does
+    not fit either, it is stored in a temporary file and the groups are
+    memory-mapped views of it.
+
+    Parameters:
+        data (pd.DataFrame): Input data.
+        x (str): Column name used as the categorical X-axis.
+        y (str): Column name with values.
+        hue (str | None): Column name for additional grouping, or None.
+    Returns:
+        dict: Mapping from (x value, hue value) to an array of values,
+              in the order of the first rows of the groups.
+              The hue value is None if `hue` is None.
+    """
+    n_rows = len(data)
+    code_dtype = np.int32 if n_rows < 2**31 else np.int64
+    # The group of every row and the grouped copy of the values are held
+    # for the whole operation.
+    plan = plan_execution(
+        "group_values",
+        n_rows,
+        GROUP_ROW_BYTES,
+        fixed_bytes=(np.dtype(code_dtype).itemsize + 8) * n_rows,
+        strategies=("in_memory", "chunked", "memmap"),
+        disk_bytes=8 * n_rows,
+    )
+    step = max(plan.chunk_rows, 1)
+    blocks = [(start, min(start + step, n_rows)) for start in range(0, n_rows, step)]
+    with track(plan):
+        codes = np.empty(n_rows, dtype=code_dtype)
+        groups = {}
+        for start, stop in blocks:
+            codes[start:stop] = _group_codes(data.iloc[start:stop], x, hue, groups)
+        # The rows with a missing key are counted first and left out.
+        counts = np.zeros(len(groups) + 1, dtype=np.int64)
+        for start, stop in blocks:
+            counts += np.bincount(codes[start:stop] + 1, minlength=len(counts))
+        offsets = np.concatenate([[0], np.cumsum(counts[1:])])
+        if plan.strategy == "memmap":
+            grouped = memmap_array((offsets[-1],))
+        else:
+            grouped = np.empty(offsets[-1], dtype=data[y].iloc[:0].to_numpy().dtype)
+        # Next free position of every group.
+        cursor = offsets[:-1].copy()
+        for start, stop in blocks:
+            block = codes[start:stop]
+            order = np.argsort(block, kind="stable")
+            order = order[np.count_nonzero(block < 0) :]
+            block = block[order]
+            block_counts = np.bincount(block, minlength=len(groups))
+            # Position of a row in its group: the rows of the group in
+            # earlier blocks, plus the rows before it in this block.
+            positions = (cursor - (np.cumsum(block_counts) - block_counts))[block]
+            positions += np.arange(len(block))
+            grouped[positions] = data[y].iloc[start:stop].to_numpy()[order]
+            cursor += block_counts
+    return {
+        key: grouped[offsets[number] : offsets[number + 1]]
+        for key, number in groups.items()
+    }
+
+
+def _group_codes(
+    data: pd.DataFrame, x: str, hue: str | None, groups: dict
+) -> np.ndarray:
+    """
+    Number the (x, hue) groups of some rows.
+
+    Groups not in `groups` yet get the next number, so blocks of rows
+    numbered in order give the groups in the order of their first rows.
+
+    Parameters:
+        data (pd.DataFrame): The rows.
+        x (str): Column name used as the categorical X-axis.
+        hue (str | None): Column name for additional grouping, or None.
+        groups (dict): Mapping from (x value, hue value) to the number of
+                       the group, updated in place.
+    Returns:
+        np.ndarray: The group of every row, -1 for rows with a missing key.
+    """
+    codes, x_values = pd.factorize(data[x])
+    # Python scalars as keys, like the ones of `DataFrame.groupby`.
+    x_values, hue_values = x_values.tolist(), [None]
+    if hue is not None:
+        hue_codes, hue_values = pd.factorize(data[hue])
+        hue_values = hue_values.tolist()
+        missing = (codes < 0) | (hue_codes < 0)
+        codes *= len(hue_values)
+        codes += hue_codes
+        codes[missing] = -1
+        del hue_codes, missing
+    codes, combined = pd.factorize(codes)
+    numbers = np.empty(len(combined), dtype=np.int64)
+    for i, code in enumerate(combined):
+        if code < 0:
+            numbers[i] = -1
+        else:
+            key = (
+                x_values[code // len(hue_values)],
+                hue_values[code % len(hue_values)],
+            )
+            numbers[i] = groups.setdefault(key, len(groups))
+    return numbers[codes]
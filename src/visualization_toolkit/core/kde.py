@@ -0,0 +1,83 @@
+"""Kernel Density Estimation"""
+
+import numpy as np
+
+
+def scott_bandwidth(values: list[np.ndarray]) -> np.ndarray:
+    """
+    Compute Scott's rule bandwidth for several groups at once.
+
+    Parameters:
+        values (list[np.ndarray]): Samples of every group.
+    Returns:
+        np.ndarray: Bandwidth of every group. Groups with less than two
+                    distinct values get a bandwidth of 0.
+    """
+    counts = np.array([len(v) for v in values])
+    group_id = np.repeat(np.arange(len(values)), counts)
+    flat = np.concatenate(values) if len(values) else np.empty(0)
+    n_groups = len(values)
+    sums = np.bincount(group_id, weights=flat, minlength=n_groups)
+    means = sums / np.maximum(counts, 1)
+    squares = np.bincount(
+        group_id, weights=(flat - means[group_id]) ** 2, minlength=n_groups
+    )
+    std = np.sqrt(squares / np.maximum(counts - 1, 1))
+    return std * np.maximum(counts, 1) ** (-1 / 5)
+
+
+def binned_kde(
+    values: list[np.ndarray],
+    grid: np.ndarray,
+    bandwidth: float | np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Gaussian kernel density estimates of several groups on a common grid.
+
+    The samples of all groups are linearly binned onto the uniform grid in
+    a single `np.bincount` pass and the binned counts are convolved with
+    the per-group Gaussian kernels by a batched FFT, which costs
+    O(n + grid log grid) per group instead of O(n * grid) for direct summation.
+
+    Parameters:
+        values (list[np.ndarray]): Samples of every group.
+        grid (np.ndarray): Uniformly spaced evaluation points covering the samples.
+        bandwidth (float | np.ndarray | None): Kernel standard deviation, either
+            one for all groups or one per group. If None, Scott's rule is used.
+    Returns:
+        np.ndarray: Densities with shape (n_groups, len(grid)).
+    """
+    grid = np.asarray(grid, dtype=float)
+    n_groups, n_grid = len(values), len(grid)
+    if n_groups == 0:
+        return np.empty((0, n_grid))
+    delta = (grid[-1] - grid[0]) / (n_grid - 1)
+    if bandwidth is None:
+        bandwidth = scott_bandwidth(values)
+    bandwidth = np.broadcast_to(np.asarray(bandwidth, dtype=float), (n_groups,))
+    # Degenerate groups are smoothed over one grid step.
+    bandwidth = np.maximum(bandwidth, delta)
+
+    counts = np.array([len(v) for v in values])
+    group_id = np.repeat(np.arange(n_groups), counts)
+    position = (np.concatenate(values) - grid[0]) / delta
+    position = np.clip(position, 0, n_grid - 1)
+    left = np.minimum(np.floor(position).astype(np.int64), n_grid - 2)
+    fraction = position - left
+    weights = 1.0 / np.maximum(counts, 1)[group_id]
+    base = group_id * n_grid + left
+    binned = np.bincount(
+        base, weights=weights * (1 - fraction), minlength=n_groups * n_grid
+    ) + np.bincount(base + 1, weights=weights * fraction, minlength=n_groups * n_grid)
+    binned = binned.reshape(n_groups, n_grid)
+
+    # Zero padding to twice the grid avoids wrap-around of the circular convolution.
+    size = 1 << int(np.ceil(np.log2(2 * n_grid)))
+    offsets = np.arange(size)
+    offsets = np.where(offsets < size // 2, offsets, offsets - size) * delta
+    kernels = np.exp(-0.5 * (offsets[None, :] / bandwidth[:, None]) ** 2)
+    kernels /= bandwidth[:, None] * np.sqrt(2 * np.pi)
+
+    spectrum = np.fft.rfft(binned, n=size, axis=1) * np.fft.rfft(kernels, axis=1)
+    density = np.fft.irfft(spectrum, n=size, axis=1)[:, :n_grid]
+    return np.maximum(density, 0)
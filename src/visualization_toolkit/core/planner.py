@@ -0,0 +1,198 @@
+"""Memory-budget-aware execution planning
+
+Operations on large inputs estimate their working set from the input shapes
+and dtypes and pick a strategy that fits the memory budget set with
+`config.set_memory_budget`:
+
+    - "in_memory": all rows are processed at once, the fastest strategy;
+    - "chunked": blocks of rows are processed one at a time;
+    - "memmap": large intermediate buffers are kept in a temporary file
+      and blocks of rows are processed one at a time.
+
+The chosen plan is logged at INFO level by the "visualization_toolkit.core.planner"
+logger. While INFO logging is enabled, the observed peak of the memory
+allocated during the operation is measured with `tracemalloc` and logged
+next to the estimate.
+"""
+
+import logging
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator
+
+import numpy as np
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("in_memory", "chunked", "memmap")
+
+
+def format_size(size: float) -> str:
+    """
+    Format a number of bytes for logs.
+    """
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+class Plan:
+    """
+    Execution strategy chosen for an operation.
+
+    Attributes:
+        operation (str): Name of the operation.
+        strategy (str): "in_memory", "chunked" or "memmap".
+        chunk_rows (int): Number of rows processed at once.
+        estimated_bytes (int): Estimated peak of the working set of the strategy.
+        budget (int | None): Memory budget the plan was made for.
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        strategy: str,
+        chunk_rows: int,
+        estimated_bytes: int,
+        budget: int | None,
+    ):
+        self.operation = operation
+        self.strategy = strategy
+        self.chunk_rows = chunk_rows
+        self.estimated_bytes = estimated_bytes
+        self.budget = budget
+
+    def __repr__(self) -> str:
+        return (
+            f"Plan({self.operation!r}, {self.strategy!r}, chunk_rows={self.chunk_rows}, "
+            f"estimated_bytes={self.estimated_bytes}, budget={self.budget})"
+        )
+
+
+def plan_execution(
+    operation: str,
+    n_rows: int,
+    row_bytes: float,
+    fixed_bytes: float = 0,
+    strategies: tuple = ("in_memory", "chunked"),
+    disk_bytes: float = 0,
+    budget: int | None = None,
+) -> Plan:
+    """
+    Choose the first strategy whose estimated working set fits the memory budget.
+
+    The working set is modelled as `fixed_bytes` held during the whole
+    operation plus `row_bytes` for every row processed at once. The memmap
+    strategy moves `disk_bytes` of the fixed part into a temporary file.
+    If no strategy fits, the one with the smallest estimate is chosen and
+    a warning is logged.
+
+    Parameters:
+        operation (str): Name of the operation for logs.
+        n_rows (int): Number of rows of the input.
+        row_bytes (float): Working set per row processed at once.
+        fixed_bytes (float): Working set independent of the block size.
+        strategies (tuple): Strategies supported by the operation, by preference.
+        disk_bytes (float): Part of `fixed_bytes` kept on disk by the memmap strategy.
+        budget (int | None): Memory budget in bytes, by default the configured one.
+    Returns:
+        Plan: The chosen plan.
+    """
+    if budget is None:
+        budget = config.get_memory_budget()
+    n_rows = max(int(n_rows), 1)
+    row_bytes = max(float(row_bytes), 1.0)
+
+    estimates = {}
+    for strategy in strategies:
+        resident = fixed_bytes - (disk_bytes if strategy == "memmap" else 0)
+        if strategy == "in_memory" or budget is None:
+            rows = n_rows
+        else:
+            rows = int(min(max((budget - resident) // row_bytes, 1), n_rows))
+        estimates[strategy] = (rows, int(resident + rows * row_bytes))
+
+    chosen = next(
+        (s for s in strategies if budget is None or estimates[s][1] <= budget),
+        None,
+    )
+    if chosen is None:
+        chosen = min(strategies, key=lambda s: estimates[s][1])
+        logger.warning(
+            "%s: no strategy fits the memory budget of %s, using %s with an estimate of %s",
+            operation,
+            format_size(budget),
+            chosen,
+            format_size(estimates[chosen][1]),
+        )
+    rows, estimated = estimates[chosen]
+    return Plan(operation, chosen, rows, estimated, budget)
+
+
+@contextmanager
+def track(plan: Plan) -> Iterator[Plan]:
+    """
+    Log a plan and the observed peak of memory allocated while it is executed.
+
+    The peak is measured with `tracemalloc` only while INFO logging of this
+    module is enabled; NumPy arrays are included in the measurement.
+    Nested measurements are not supported.
+
+    Parameters:
+        plan (Plan): The plan to execute.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        yield plan
+        return
+    logger.info(
+        "%s: %s strategy, %d rows at once, estimated peak %s, budget %s",
+        plan.operation,
+        plan.strategy,
+        plan.chunk_rows,
+        format_size(plan.estimated_bytes),
+        "none" if plan.budget is None else format_size(plan.budget),
+    )
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    else:
+        tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        yield plan
+    finally:
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        if started:
+            tracemalloc.stop()
+        logger.info(
+            "%s: observed peak %s, estimated %s",
+            plan.operation,
+            format_size(peak),
+            format_size(plan.estimated_bytes),
+        )
+
+
+def memmap_array(shape: tuple, dtype=float) -> np.memmap:
+    """
+    Create an array backed by an anonymous temporary file.
+
+    The file is removed by the operating system when the array is released.
+
+    Parameters:
+        shape (tuple): Shape of the array.
+        dtype: Data type of the array.
+    Returns:
+        np.memmap: The writable array.
+    """
+    with tempfile.TemporaryFile() as file:
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if size == 0:
+            return np.empty(shape, dtype=dtype)
+        file.truncate(size)
+        # The mapping keeps its own reference to the file after it is closed.
+        return np.memmap(file, dtype=dtype, mode="w+", shape=shape)
@@ -0,0 +1,370 @@
+"""Portable summaries of experiment results
+
+A summary keeps everything `mseplot` and `boxplot` need to draw a figure:
+the aggregated curves, the box statistics and the significance results.
+It is stored as a single NPZ file with a JSON header, without pickled
+objects, so figures can be restyled without the raw data.
+"""
+
+import json
+import os
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+from matplotlib import cbook
+
+from .aggregation import aggregate
+from .downsample import decimate_extremes
+from .grouping import get_x_levels, group_values
+
+SUMMARY_FORMAT = "visualization-toolkit-summary"
+SUMMARY_VERSION = 1
+
+_AGGREGATE_COLUMNS = (
+    "x",
+    "center",
+    "err_low",
+    "err_high",
+    "estimator",
+    "errorbar_type",
+    "p_low",
+    "p_high",
+)
+
+BOX_FIELDS = ("mean", "iqr", "cilo", "cihi", "whishi", "whislo", "q1", "med", "q3")
+
+
+def _to_array(values) -> np.ndarray:
+    """
+    Convert column values to an array that can be stored without pickling.
+    """
+    array = np.asarray(values)
+    if array.dtype == object:
+        if not all(isinstance(v, str) for v in array):
+            raise TypeError("Summary columns must contain numbers or strings only")
+        array = array.astype(str)
+    return array
+
+
+class Summary:
+    """
+    Aggregated results of an experiment for drawing without the raw data.
+
+    Create summaries with `summarize`, store them with `save` and read them
+    with `load_summary`. `mseplot` and `boxplot` accept a summary in place
+    of the data and draw the same figures as from the raw data.
+
+    Attributes:
+        x (str): Name of the x column of the summarized data.
+        y (str): Name of the y column of the summarized data.
+        hue (str | None): Name of the hue column of the summarized data.
+        tables (dict[str, pd.DataFrame]): The stored tables: "aggregates",
+            "boxes", "fliers", "x_levels", "hue_levels" and "significance/<name>".
+        whis (float): Whisker reach of the box statistics.
+    """
+
+    def __init__(
+        self,
+        x: str,
+        y: str,
+        hue: str | None,
+        tables: dict,
+        whis: float = 1.5,
+    ):
+        self.x = x
+        self.y = y
+        self.hue = hue
+        self.tables = tables
+        self.whis = whis
+
+    @property
+    def significance(self) -> dict:
+        """
+        Significance results by name.
+        """
+        prefix = "significance/"
+        return {
+            name[len(prefix) :]: table
+            for name, table in self.tables.items()
+            if name.startswith(prefix)
+        }
+
+    def significance_fn(self, name: str) -> Callable:
+        """
+        Get a significance function returning the stored results.
+
+        Parameters:
+            name (str): Name of the significance results.
+        Returns:
+            Callable: Function usable as the `significance_fn` of `boxplot`
+                      and `mseplot`, ignoring its argument.
+        """
+        significance = self.significance
+        if name not in significance:
+            raise ValueError(
+                f"No significance results '{name}' in the summary. "
+                f"Available: {list(significance)}"
+            )
+        return lambda _: significance[name]
+
+    @property
+    def x_levels(self) -> np.ndarray:
+        """
+        Sorted unique values of x, the same as `get_x_levels` of the data.
+        """
+        return self.tables["x_levels"]["value"].to_numpy()
+
+    @property
+    def hue_levels(self) -> list | np.ndarray:
+        """
+        Sorted unique values of hue, [None] without hue.
+
+        This is the order of the boxes of `boxplot`, not of the curves:
+        `curves` keeps the order of the first appearance in the data, as `mseplot`.
+        """
+        if self.hue is None:
+            return [None]
+        return self.tables["hue_levels"]["value"].to_numpy()
+
+    def check_columns(self, x: str, y: str, hue: str | None) -> None:
+        """
+        Raise ValueError if the columns differ from the summarized ones.
+        """
+        if (x, y, hue) != (self.x, self.y, self.hue):
+            raise ValueError(
+                f"The summary is computed for x={self.x!r}, y={self.y!r}, "
+                f"hue={self.hue!r}, got x={x!r}, y={y!r}, hue={hue!r}"
+            )
+
+    def curves(
+        self, estimator: str, errorbar_type: str, errorbar_data: tuple
+    ) -> list[tuple]:
+        """
+        Get the aggregated curves computed by `aggregate`.
+
+        Parameters:
+            estimator (str): Central value, "mean" or "median".
+            errorbar_type (str): Error bar type, "p".
+            errorbar_data (tuple): Lower and upper percentiles.
+        Returns:
+            list[tuple]: (hue value, x values, centers, 2×N errors) for every
+                         hue value in the order of the data.
+        """
+        table = self.tables["aggregates"]
+        mask = (
+            (table["estimator"] == estimator)
+            & (table["errorbar_type"] == errorbar_type)
+            & (table["p_low"] == errorbar_data[0])
+            & (table["p_high"] == errorbar_data[1])
+        )
+        if not mask.any():
+            available = table[
+                ["estimator", "errorbar_type", "p_low", "p_high"]
+            ].drop_duplicates()
+            raise ValueError(
+                f"No aggregates for estimator={estimator!r}, "
+                f"errorbar_type={errorbar_type!r}, errorbar_data={errorbar_data!r}. "
+                f"Available:\n{available.to_string(index=False)}"
+            )
+        table = table[mask]
+        if self.hue is None:
+            parts = [(None, table)]
+        else:
+            parts = table.groupby("hue", sort=False)
+        return [
+            (
+                hue_value,
+                part["x"].to_numpy(),
+                part["center"].to_numpy(),
+                part[["err_low", "err_high"]].to_numpy().T,
+            )
+            for hue_value, part in parts
+        ]
+
+    def box_stats(self) -> dict:
+        """
+        Get the box statistics in the format of `matplotlib.cbook.boxplot_stats`.
+
+        Returns:
+            dict: Mapping from (x value, hue value) to the statistics of the box.
+                  The hue value is None without hue.
+        """
+        boxes = self.tables["boxes"]
+        fliers = self.tables["fliers"]["value"].to_numpy()
+        offsets = np.concatenate([[0], np.cumsum(boxes["n_fliers"].to_numpy())])
+        hues = boxes["hue"] if self.hue is not None else [None] * len(boxes)
+        stats = {}
+        for i, (x_val, hue_val) in enumerate(zip(boxes["x"], hues)):
+            box = {field: boxes[field].iat[i] for field in BOX_FIELDS}
+            box["fliers"] = fliers[offsets[i] : offsets[i + 1]]
+            stats[(x_val, hue_val)] = box
+        return stats
+
+    def group_max(self) -> dict:
+        """
+        Maximum value of y for every x value, see `compute_group_max`.
+        """
+        boxes = self.tables["boxes"]
+        return boxes.groupby("x")["max"].max().to_dict()
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Save the summary into an NPZ file.
+
+        Parameters:
+            path (str | os.PathLike): Output file.
+        """
+        arrays = {}
+        tables = {}
+        for name, table in self.tables.items():
+            tables[name] = list(table.columns)
+            for column in table.columns:
+                arrays[f"{name}:{column}"] = _to_array(table[column])
+        header = {
+            "format": SUMMARY_FORMAT,
+            "version": SUMMARY_VERSION,
+            "x": self.x,
+            "y": self.y,
+            "hue": self.hue,
+            "whis": self.whis,
+            "tables": tables,
+        }
+        arrays["header"] = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+        with open(path, "wb") as file:
+            np.savez_compressed(file, **arrays)
+
+
+def load_summary(path: str | os.PathLike) -> Summary:
+    """
+    Load a summary saved by `Summary.save`.
+
+    Parameters:
+        path (str | os.PathLike): The NPZ file.
+    Returns:
+        Summary: The loaded summary.
+    """
+    with np.load(path, allow_pickle=False) as npz:
+        header = json.loads(npz["header"].tobytes().decode())
+        if header.get("format") != SUMMARY_FORMAT:
+            raise ValueError(f"{path} is not a summary file")
+        if header["version"] > SUMMARY_VERSION:
+            raise ValueError(
+                f"Summary version {header['version']} is not supported, "
+                f"update the library"
+            )
+        tables = {
+            name: pd.DataFrame({column: npz[f"{name}:{column}"] for column in columns})
+            for name, columns in header["tables"].items()
+        }
+    return Summary(header["x"], header["y"], header["hue"], tables, header["whis"])
+
+
+def summarize(
+    data: pd.DataFrame,
+    x: str,
+    y: str,
+    hue: str | None = None,
+    aggregates: Iterable[tuple] = (("median", "p", (5, 95)),),
+    whis: float = 1.5,
+    significance: dict[str, Callable] | None = None,
+    max_fliers: int | None = None,
+    boxes: bool = True,
+) -> Summary:
+    """
+    Compute a summary of experiment results for drawing without the raw data.
+
+    Parameters:
+        data (pd.DataFrame): Experiment results, e.g. from `mse_experiment`.
+        x (str): Column used as the x-axis.
+        y (str): Column with the metric.
+        hue (str | None): Column used to group the data into curves or boxes.
+        aggregates (Iterable[tuple]): (estimator, errorbar_type, errorbar_data)
+            combinations to precompute for `mseplot`.
+        whis (float): Whisker reach of the box statistics, see `Axes.boxplot`.
+        significance (dict[str, Callable] | None): Significance functions by name,
+            each called with `data` like the `significance_fn` of `boxplot`.
+        max_fliers (int | None): Maximum number of stored fliers per box, see
+            `decimate_extremes`. If None, all fliers are stored and the figures
+            are identical to the ones drawn from the data.
+        boxes (bool): If False, the box statistics are not computed and the
+            summary can be drawn by `mseplot` only.
+    Returns:
+        Summary: The summary.
+
+    Usage example:
+    >>> summary = summarize(df, "snr", "mse", "label", significance={
+    ...     "hue": lambda d: compare_hue_within_groups(d, "snr", "mse", "label")})
+    >>> summary.save("results.npz")
+    >>> fig, axes = boxplot(load_summary("results.npz"), "snr", "mse", "label",
+    ...                     significance_fn="hue", significance_levels=levels)
+    """
+    tables = {}
+    # One split of the data, in the order of the first appearance of every hue.
+    parts = (
+        [(None, data)]
+        if hue is None
+        else list(data.groupby(hue, sort=False, observed=True))
+    )
+    rows = []
+    for estimator, errorbar_type, errorbar_data in aggregates:
+        for hue_value, part in parts:
+            x_list, center, err = aggregate(
+                part,
+                x,
+                y,
+                estimator=estimator,
+                errorbar_type=errorbar_type,
+                errorbar_data=errorbar_data,
+            )
+            frame = pd.DataFrame(
+                {
+                    "x": x_list,
+                    "center": center,
+                    "err_low": err[0],
+                    "err_high": err[1],
+                }
+            )
+            if hue is not None:
+                frame.insert(0, "hue", hue_value)
+            frame["estimator"] = estimator
+            frame["errorbar_type"] = errorbar_type
+            frame["p_low"] = float(errorbar_data[0])
+            frame["p_high"] = float(errorbar_data[1])
+            rows.append(frame)
+    tables["aggregates"] = (
+        pd.concat(rows, ignore_index=True)
+        if rows
+        else pd.DataFrame(columns=_AGGREGATE_COLUMNS)
+    )
+
+    tables["x_levels"] = pd.DataFrame({"value": get_x_levels(data, x)})
+    if hue is not None:
+        tables["hue_levels"] = pd.DataFrame({"value": get_x_levels(data, hue)})
+    for name, significance_fn in (significance or {}).items():
+        tables[f"significance/{name}"] = significance_fn(data).reset_index(drop=True)
+    if not boxes:
+        return Summary(x, y, hue, tables, whis)
+
+    boxes = []
+    fliers = []
+    for (x_val, hue_val), values in group_values(data, x, y, hue).items():
+        if len(values) == 0:
+            continue
+        (stats,) = cbook.boxplot_stats(values, whis=whis)
+        box_fliers = np.asarray(stats["fliers"], dtype=float)
+        if max_fliers is not None:
+            box_fliers = decimate_extremes(box_fliers, max_fliers)
+        box = {"x": x_val, "hue": hue_val}
+        box.update({field: stats[field] for field in BOX_FIELDS})
+        box["max"] = np.nanmax(values) if np.isfinite(values).any() else np.nan
+        box["n_fliers"] = len(box_fliers)
+        boxes.append(box)
+        fliers.append(box_fliers)
+    tables["boxes"] = pd.DataFrame(boxes)
+    if hue is None:
+        tables["boxes"] = tables["boxes"].drop(columns="hue")
+    tables["fliers"] = pd.DataFrame(
+        {"value": np.concatenate(fliers) if fliers else np.empty(0)}
+    )
+    return Summary(x, y, hue, tables, whis)
@@ -3,9 +3,12 @@
 TRANSLATIONS = {
     # Axis labels
     "x_label_snr": "SNR, dB",
+    "x_label_time": "Time",
+    "y_label_error": "Squared error",
     "y_label_mse": "MSE",
     # Titles
     "title_mse_vs_snr": "MSE vs SNR",
+    "title_error_vs_time": "Error over time",
     # Units
     "unit_db": "dB",
     "unit_percent": "%",
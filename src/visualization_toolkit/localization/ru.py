@@ -3,9 +3,12 @@
 TRANSLATIONS = {
     # Axis labels
     "x_label_snr": "С/Ш, дБ",
+    "x_label_time": "Время",
+    "y_label_error": "Квадрат ошибки",
     "y_label_mse": "СКО",
     # Titles
     "title_mse_vs_snr": "Зависимость СКО от уровня шума",
+    "title_error_vs_time": "Ошибка во времени",
     # Units
     "unit_db": "дБ",
     "unit_percent": "%",
@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from ..core import backend
+
 
 def mse(a: np.ndarray, b: np.ndarray) -> float:
     """
@@ -20,3 +22,51 @@ def mse(a: np.ndarray, b: np.ndarray) -> float:
             Mean squared error between `a` and `b`.
     """
     return np.mean((a - b) ** 2)
+
+
+def mse_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Compute the mean squared error between corresponding rows of two arrays.
+
+    The computation uses the configured numerical backend, see `config.set_backend`.
+
+    Parameters:
+        a (np.ndarray):
+            Array of signals with shape (n_signals, ...).
+
+        b (np.ndarray):
+            Array of signals with the same shape as `a`.
+
+    Returns:
+        np.ndarray:
+            Mean squared error of every signal, shape (n_signals,).
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    return backend.mse_rows(a.reshape(len(a), -1), b.reshape(len(b), -1))
+
+
+def segment_mse(a: np.ndarray, b: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Compute the mean squared error of every signal of two ragged signal sets.
+
+    Signals of different lengths are stored CSR-style: concatenated into
+    one flat array with the boundaries in `offsets`. All signals are reduced
+    in one segmented pass, see `core.backend.segment_mse`.
+
+    Parameters:
+        a (np.ndarray):
+            Flat array of concatenated signals (e.g. reference signals).
+
+        b (np.ndarray):
+            Flat array of concatenated signals with the same layout as `a`.
+
+        offsets (np.ndarray):
+            Signal boundaries of length n_signals + 1, signal i is
+            `a[offsets[i]:offsets[i + 1]]`.
+
+    Returns:
+        np.ndarray:
+            Mean squared error of every signal, NaN for empty signals.
+    """
+    return backend.segment_mse(a, b, offsets)
@@ -0,0 +1,220 @@
+"""Spectral error metrics"""
+
+import numpy as np
+
+from ..core import backend
+
+
+def band_weights(n_samples: int, bands: list[tuple], fs: float = 1.0) -> np.ndarray:
+    """
+    Build the matrix mapping rfft powers to band mean squared errors.
+
+    A band (low, high) contains the frequencies low <= f < high, the Nyquist
+    frequency belongs to a band with high >= fs / 2. The weights follow
+    Parseval's theorem, so the band values of bands covering [0, fs / 2]
+    sum up to the time-domain MSE.
+
+    Parameters:
+        n_samples (int): Length of the signals.
+        bands (list[tuple]): Frequency bands (low, high).
+        fs (float): Sampling frequency.
+    Returns:
+        np.ndarray: Weights with shape (n_samples // 2 + 1, n_bands).
+    """
+    freqs = np.fft.rfftfreq(n_samples, d=1 / fs)
+    nyquist = fs / 2
+    # Every bin except DC and the Nyquist bin stands for two conjugate bins.
+    scale = np.full(len(freqs), 2.0)
+    scale[0] = 1.0
+    if n_samples % 2 == 0:
+        scale[-1] = 1.0
+    scale /= n_samples**2
+
+    weights = np.zeros((len(freqs), len(bands)))
+    for k, (low, high) in enumerate(bands):
+        inside = (freqs >= low) & (freqs < high)
+        if high >= nyquist:
+            inside |= freqs == nyquist
+        weights[inside, k] = scale[inside]
+    return weights
+
+
+def _band_energies(
+    signals: list[np.ndarray], weights: np.ndarray, dtype
+) -> list[np.ndarray]:
+    """
+    Band energies of several signal arrays computed in blocks of rows.
+    """
+    n_signals, n_samples = signals[0].shape
+    rows = max(1, backend.MSE_CHUNK_ELEMENTS // max(n_samples, 1))
+    weights = weights.astype(dtype)
+    results = [np.empty((n_signals, weights.shape[1])) for _ in signals]
+    for start in range(0, n_signals, rows):
+        for array, result in zip(signals, results):
+            block = np.asarray(array[start : start + rows], dtype=dtype)
+            spectrum = np.fft.rfft(block, axis=1)
+            power = spectrum.real**2 + spectrum.imag**2
+            result[start : start + rows] = power @ weights
+    return results
+
+
+def band_energy(
+    signals: np.ndarray,
+    bands: list[tuple],
+    fs: float = 1.0,
+    dtype=np.float32,
+) -> np.ndarray:
+    """
+    Compute the energy of every frequency band of every signal.
+
+    The energies are normalized like `band_mse`: for bands covering
+    [0, fs / 2] they sum up to the mean square of the signal.
+
+    Parameters:
+        signals (np.ndarray):
+            Array of signals with shape (n_signals, n_samples).
+
+        bands (list[tuple]):
+            Frequency bands (low, high), see `band_weights`.
+
+        fs (float):
+            Sampling frequency in the units of the bands.
+
+        dtype:
+            Floating point type of the transforms.
+
+    Returns:
+        np.ndarray:
+            Band energy with shape (n_signals, n_bands).
+    """
+    signals = np.asarray(signals)
+    if signals.ndim != 2:
+        raise ValueError(f"Expected a 2D array, got shape {signals.shape}")
+    weights = band_weights(signals.shape[1], bands, fs)
+    (energy,) = _band_energies([signals], weights, dtype)
+    return energy
+
+
+def energy_ratio_db(signal: np.ndarray, errors: np.ndarray) -> np.ndarray:
+    """
+    Signal-to-error ratio in decibels of band energies.
+
+    Parameters:
+        signal (np.ndarray): Band energies of the reference signals, see `band_energy`.
+        errors (np.ndarray): Band energies of the errors, see `band_mse`.
+    Returns:
+        np.ndarray: 10 * log10(signal / errors).
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 10 * np.log10(signal / errors)
+
+
+def band_mse(
+    a: np.ndarray,
+    b: np.ndarray,
+    bands: list[tuple],
+    fs: float = 1.0,
+    dtype=np.float32,
+) -> np.ndarray:
+    """
+    Compute the error energy of every frequency band of every signal.
+
+    The spectra of the errors `a - b` are computed by one batched
+    `np.fft.rfft` per block of signals, the blocks are bounded by
+    `core.backend.MSE_CHUNK_ELEMENTS`. The band values are normalized like
+    the MSE: for bands covering [0, fs / 2] they sum up to `mse(a, b)`.
+
+    Parameters:
+        a (np.ndarray):
+            Array of signals with shape (n_signals, n_samples)
+            (e.g. reference or ground-truth signals).
+
+        b (np.ndarray):
+            Array of signals with the same shape as `a`.
+
+        bands (list[tuple]):
+            Frequency bands (low, high), see `band_weights`.
+
+        fs (float):
+            Sampling frequency in the units of the bands.
+
+        dtype:
+            Floating point type of the transforms. float32 halves the memory
+            and time at a relative precision of about 1e-6.
+
+    Returns:
+        np.ndarray:
+            Error energy with shape (n_signals, n_bands).
+    """
+    a, b = _check_signals(a, b)
+    weights = band_weights(a.shape[1], bands, fs)
+    (errors,) = _band_energies([_Difference(a, b)], weights, dtype)
+    return errors
+
+
+def spectral_snr(
+    a: np.ndarray,
+    b: np.ndarray,
+    bands: list[tuple],
+    fs: float = 1.0,
+    dtype=np.float32,
+) -> np.ndarray:
+    """
+    Compute the signal-to-error ratio of every frequency band in decibels.
+
+    The ratio is 10 * log10 of the band energy of the reference signal `a`
+    to the band energy of the error `a - b`, computed as in `band_mse`.
+    To compare several signals with one reference, compute the reference
+    energies once with `band_energy` and use `energy_ratio_db`.
+
+    Parameters:
+        a (np.ndarray):
+            Array of reference signals with shape (n_signals, n_samples).
+
+        b (np.ndarray):
+            Array of signals with the same shape as `a`.
+
+        bands (list[tuple]):
+            Frequency bands (low, high), see `band_weights`.
+
+        fs (float):
+            Sampling frequency in the units of the bands.
+
+        dtype:
+            Floating point type of the transforms.
+
+    Returns:
+        np.ndarray:
+            Spectral SNR in dB with shape (n_signals, n_bands).
+    """
+    a, b = _check_signals(a, b)
+    weights = band_weights(a.shape[1], bands, fs)
+    signal, errors = _band_energies([a, _Difference(a, b)], weights, dtype)
+    return energy_ratio_db(signal, errors)
+
+
+def _check_signals(a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Check that the signals are two 2D arrays of equal shape.
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if a.shape != b.shape or a.ndim != 2:
+        raise ValueError(
+            f"Expected two 2D arrays of equal shape, got {a.shape}, {b.shape}"
+        )
+    return a, b
+
+
+class _Difference:
+    """
+    Lazy difference of two arrays, computed for one block of rows at a time.
+    """
+
+    def __init__(self, a: np.ndarray, b: np.ndarray):
+        self.a = a
+        self.b = b
+        self.shape = a.shape
+
+    def __getitem__(self, index):
+        return np.subtract(self.a[index], self.b[index], dtype=float)
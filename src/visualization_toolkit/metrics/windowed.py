@@ -0,0 +1,126 @@
+"""Windowed error metrics"""
+
+import numpy as np
+
+from ..core import backend
+
+
+def window_starts(n_samples: int, window: int, step: int | None = None) -> np.ndarray:
+    """
+    Compute the start positions of the windows within a signal.
+
+    Parameters:
+        n_samples (int): Length of the signal.
+        window (int): Length of a window.
+        step (int | None): Distance between the starts of consecutive windows.
+                           If None, the windows do not overlap (step = window).
+    Returns:
+        np.ndarray: Start positions of all windows that fit into the signal.
+    """
+    if window < 1:
+        raise ValueError(f"window must be positive, got {window}")
+    step = window if step is None else step
+    if step < 1:
+        raise ValueError(f"step must be positive, got {step}")
+    if n_samples < window:
+        return np.empty(0, dtype=np.int64)
+    return np.arange(0, n_samples - window + 1, step, dtype=np.int64)
+
+
+def windowed_mse(
+    a: np.ndarray,
+    b: np.ndarray,
+    window: int,
+    step: int | None = None,
+) -> np.ndarray:
+    """
+    Compute the mean squared error over sliding or fixed windows of every signal.
+
+    Non-overlapping windows are reduced separately. Overlapping windows are
+    differences of cumulative sums of the squared errors that restart every
+    `window` samples, so the cost does not depend on the window length and
+    the rounding error of a window is bounded by the errors of its
+    neighbours, not of the whole signal before it. The signals are processed
+    in blocks of rows to bound the temporaries, see
+    `core.backend.MSE_CHUNK_ELEMENTS`.
+
+    Parameters:
+        a (np.ndarray):
+            Array of signals with shape (n_signals, n_samples)
+            (e.g. reference or ground-truth signals).
+
+        b (np.ndarray):
+            Array of signals with the same shape as `a`.
+
+        window (int):
+            Length of a window in samples.
+
+        step (int | None):
+            Distance between the starts of consecutive windows.
+            If None, the windows do not overlap.
+
+    Returns:
+        np.ndarray:
+            MSE of every window with shape (n_signals, n_windows),
+            the windows start at `window_starts(n_samples, window, step)`.
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if a.shape != b.shape or a.ndim != 2:
+        raise ValueError(
+            f"Expected two 2D arrays of equal shape, got {a.shape}, {b.shape}"
+        )
+    n_signals, n_samples = a.shape
+    starts = window_starts(n_samples, window, step)
+    out = np.empty((n_signals, len(starts)))
+    if len(starts) == 0:
+        return out
+    # Only the samples covered by a window are needed.
+    n_used = starts[-1] + window
+    overlapping = len(starts) > 1 and starts[1] - starts[0] < window
+    if not overlapping:
+        # Every window is one segment of the reduction, the gaps between
+        # the windows are dropped.
+        bounds = np.ravel([starts, starts + window], order="F")[:-1]
+    rows = max(1, backend.MSE_CHUNK_ELEMENTS // (n_used + 1))
+    for start in range(0, n_signals, rows):
+        block = slice(start, start + rows)
+        diff = np.subtract(a[block, :n_used], b[block, :n_used], dtype=float)
+        np.square(diff, out=diff)
+        if overlapping:
+            sums = _overlapping_sums(diff, starts, window)
+        else:
+            sums = np.add.reduceat(diff, bounds, axis=1)[:, ::2]
+        out[block] = sums / window
+    return out
+
+
+def _overlapping_sums(
+    squared: np.ndarray, starts: np.ndarray, window: int
+) -> np.ndarray:
+    """
+    Sum overlapping windows of every row by cumulative sums restarted at
+    every multiple of `window`.
+
+    A window covers the end of one segment and the start of the next, so a
+    sum is the rest of one segment plus the beginning of the next.
+    """
+    n_rows, n_used = squared.shape
+    n_segments = -(-n_used // window)
+    padded = np.zeros((n_rows, n_segments * window))
+    padded[:, :n_used] = squared
+    # Sums of the first 0..window samples of every segment.
+    prefix = np.zeros((n_rows, n_segments, window + 1))
+    np.cumsum(padded.reshape(n_rows, n_segments, -1), axis=2, out=prefix[:, :, 1:])
+    prefix = prefix.reshape(n_rows, -1)
+
+    stride = window + 1
+    first, offset = np.divmod(starts, window)
+    last, last_offset = np.divmod(starts + window - 1, window)
+    spans = last > first
+    head_end = np.where(spans, window, last_offset + 1)
+    sums = prefix[:, first * stride + head_end] - prefix[:, first * stride + offset]
+    sums[:, spans] += prefix[:, last[spans] * stride + last_offset[spans] + 1]
+    # Rounding of the differences may give tiny negative values.
+    np.maximum(sums, 0, out=sums)
+    return sums
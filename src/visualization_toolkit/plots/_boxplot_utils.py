@@ -4,9 +4,15 @@ from typing import Sequence
 
 import matplotlib
 import matplotlib.pyplot as plt
-import pandas as pd
+import numpy as np
 from matplotlib.patches import Patch
 
+from ..config import config
+from ..core import backend
+from ..core.grouping import GROUP_ROW_BYTES, get_x_levels, group_values  # noqa: F401
+from ._figure import subplots
+from .templates import TemplatePool, layout_key
+
 
 def is_broken(y_limits: Sequence) -> bool:
     """
@@ -42,6 +48,7 @@ def create_axes(
     height_ratios: tuple,
     fig_size: tuple,
     ax: matplotlib.axes.Axes | None = None,
+    template_pool: TemplatePool | None = None,
 ):
     """
     Create the axes for the boxplot.
@@ -51,23 +58,42 @@ def create_axes(
         height_ratios (tuple): Height ratios for the axes.
         fig_size (tuple): Size of the figure.
         ax (matplotlib.axes.Axes | None): Ax to plot.
+        template_pool (TemplatePool | None): If given and `ax` is None, the figure
+            is taken from the pool and built only if the pool has no figure
+            with the same layout.
     Returns:
         fig, axes: Figure and axes.
     """
     check_y_limits(y_limits)
+    if ax is not None and not is_broken(y_limits):
+        if (y_limits is not None) and (len(y_limits) == 1):
+            ax.set_ylim(y_limits[0])
+        return ax.figure, (ax,)
+
+    def build():
+        return _build_axes(y_limits, height_ratios, fig_size)
+
+    if template_pool is None:
+        return build()
+    key = layout_key(
+        "boxplot", y_limits, height_ratios, fig_size, config.get_use_pyplot()
+    )
+    return template_pool.acquire(key, build)
+
+
+def _build_axes(y_limits: Sequence, height_ratios: tuple, fig_size: tuple):
+    """
+    Build a new figure with one axis or two axes with an axis break.
+    """
     if y_limits is None or len(y_limits) < 2:
-        if ax is None:
-            fig, ax_main = plt.subplots(figsize=fig_size)
-        else:
-            fig = ax.figure
-            ax_main = ax
+        fig, ax_main = subplots(figsize=fig_size)
         if (y_limits is not None) and (len(y_limits) == 1):
             ax_main.set_ylim(y_limits[0])
         return fig, (ax_main,)
     bottom_ylim, top_ylim = y_limits
     if bottom_ylim is None or top_ylim is None:
         raise ValueError("bottom_ylim and top_ylim required if broken=True")
-    fig, (ax_top, ax_bottom) = plt.subplots(
+    fig, (ax_top, ax_bottom) = subplots(
         2,
         1,
         sharex=True,
@@ -83,15 +109,67 @@ def create_axes(
     return fig, (ax_top, ax_bottom)
 
 
-def get_x_levels(data: pd.DataFrame, x: str) -> list:
+def auto_y_limits(
+    groups: dict,
+    logy: bool = True,
+    quantiles: tuple = (1, 99),
+    min_gap: float = 0.35,
+    min_ratio: float = 0.2,
+) -> tuple:
     """
-    Get the unique values of a column as list.
+    Choose the y-limits of a broken axis from the gaps between the groups.
+
+    The range between the given quantiles of every group is computed by a
+    single vectorized pass; the largest interval of the y-axis that is not
+    covered by any of these ranges is cut out if it is wide enough.
+
+    Parameters:
+        groups (dict): Values split by (x, hue), see `group_values`.
+        logy (bool): If True, the gaps are measured in log10 space and
+                     non-positive values are ignored.
+        quantiles (tuple): Lower and upper percentiles of the range of a group
+                           that must not be cut.
+        min_gap (float): Minimum size of the cut as a fraction of the whole range.
+        min_ratio (float): Minimum share of the figure height of each axis.
+    Returns:
+        tuple: (y_limits, height_ratios). y_limits is ((bottom), (top)) for a
+               broken axis or a single ((min, max),) pair with height_ratios None.
+               (None, None) if there are no values.
     """
-    if x is None:
-        return [None]
-    x_levels = data[x].unique()
-    x_levels.sort()
-    return x_levels
+    samples = []
+    for values in groups.values():
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if logy:
+            values = np.log10(values[values > 0])
+        if len(values):
+            samples.append(values)
+    if not samples:
+        return None, None
+
+    offsets = np.concatenate([[0], np.cumsum([len(v) for v in samples])])
+    values = np.concatenate(samples)
+    bounds = backend.segment_percentiles(values, offsets, quantiles)
+    low, high = values.min(), values.max()
+    span = max(high - low, 1e-12)
+    pad = 0.05 * span
+
+    def to_data(limits):
+        return tuple(float(10**v) if logy else float(v) for v in limits)
+
+    order = np.argsort(bounds[:, 0], kind="stable")
+    starts = bounds[order, 0]
+    covered = np.maximum.accumulate(bounds[order, 1])
+    gaps = starts[1:] - covered[:-1]
+    if len(gaps) == 0 or gaps.max() < min_gap * span:
+        return (to_data((low - pad, high + pad)),), None
+
+    i = int(np.argmax(gaps))
+    bottom = (low - pad, covered[i] + pad)
+    top = (starts[i + 1] - pad, high + pad)
+    top_share = (top[1] - top[0]) / (top[1] - top[0] + bottom[1] - bottom[0])
+    top_share = min(max(top_share, min_ratio), 1 - min_ratio)
+    return (to_data(bottom), to_data(top)), (top_share, 1 - top_share)
 
 
 def add_legend(
@@ -0,0 +1,44 @@
+"""Helper functions for creating figures."""
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from ..config import config
+
+
+def subplots(nrows: int = 1, ncols: int = 1, figsize: tuple | None = None, **kwargs):
+    """
+    Create a figure and a grid of subplots.
+
+    Depending on the configuration the figure is created through pyplot or
+    directly as a `Figure` with an Agg canvas, which is never registered with
+    pyplot's figure manager.
+
+    Parameters:
+        nrows (int): Number of rows of the grid.
+        ncols (int): Number of columns of the grid.
+        figsize (tuple | None): Size of the figure in inches.
+        **kwargs: Keyword arguments passed to `Figure.subplots`,
+                  e.g. sharex, squeeze or gridspec_kw.
+    Returns:
+        fig, axes: Figure and axes, same as `plt.subplots`.
+    """
+    if config.get_use_pyplot():
+        return plt.subplots(nrows, ncols, figsize=figsize, **kwargs)
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(nrows, ncols, **kwargs)
+
+
+def close(fig: Figure) -> None:
+    """
+    Release a figure that is no longer needed.
+
+    Figures created through pyplot are removed from its figure manager,
+    other figures are left to the garbage collector.
+
+    Parameters:
+        fig (Figure): The figure to release.
+    """
+    plt.close(fig)
@@ -0,0 +1,93 @@
+"""Helper functions for rasterizing heavy plot layers.
+
+A raster policy is a dictionary with the following keys:
+    - "rasterize" (bool, default True): rasterize heavy layers
+      (fliers, markers and error bars of dense curves) in vector outputs,
+      while axes, text and boxes stay vector.
+    - "max_fliers" (int or None, default None): maximum number of fliers
+      drawn per box, at least 2, see `decimate_extremes`. The fliers are
+      decimated before their artists are created.
+    - "min_points" (int, default 1000): number of points of a curve
+      above which its markers and error bars are rasterized.
+
+The resolution of rasterized layers follows the `dpi` argument of
+`Figure.savefig`; in PDF/SVG outputs it does not affect vector elements.
+"""
+
+import numpy as np
+
+from ..core.downsample import decimate_extremes
+
+DEFAULT_RASTER_POLICY = {
+    "rasterize": True,
+    "max_fliers": None,
+    "min_points": 1000,
+}
+
+
+def get_raster_policy(policy: dict | None) -> dict | None:
+    """
+    Complete a raster policy with default values.
+
+    Parameters:
+        policy (dict | None): User policy, possibly partial.
+    Returns:
+        dict | None: Full policy, or None if no policy is given.
+    """
+    if policy is None:
+        return None
+    unknown = set(policy) - set(DEFAULT_RASTER_POLICY)
+    if unknown:
+        raise ValueError(
+            f"Unknown raster policy keys: {sorted(unknown)}. "
+            f"Available: {list(DEFAULT_RASTER_POLICY)}"
+        )
+    policy = {**DEFAULT_RASTER_POLICY, **policy}
+    max_fliers = policy["max_fliers"]
+    if max_fliers is not None and max_fliers < 2:
+        raise ValueError(
+            f"max_fliers must be at least 2 to keep both extremes, got {max_fliers}"
+        )
+    return policy
+
+
+def apply_flier_policy(fliers: list, policy: dict | None) -> None:
+    """
+    Decimate and rasterize the flier artists returned by `ax.boxplot`.
+
+    Boxes drawn by `boxplot` have their fliers decimated before drawing;
+    the decimation here covers boxes drawn with all fliers.
+
+    Parameters:
+        fliers (list): Line2D artists of the fliers.
+        policy (dict | None): Raster policy.
+    """
+    policy = get_raster_policy(policy)
+    if policy is None:
+        return
+    for line in fliers:
+        x_data = np.asarray(line.get_xdata())
+        y_data = np.asarray(line.get_ydata())
+        if policy["max_fliers"] is not None and len(y_data) > policy["max_fliers"]:
+            y_data = decimate_extremes(y_data, policy["max_fliers"])
+            line.set_data(x_data[: len(y_data)], y_data)
+        if policy["rasterize"]:
+            line.set_rasterized(True)
+
+
+def apply_errorbar_policy(container, policy: dict | None) -> None:
+    """
+    Rasterize the markers and error bars of a dense errorbar curve.
+
+    Parameters:
+        container (ErrorbarContainer): Container returned by `ax.errorbar`.
+        policy (dict | None): Raster policy.
+    """
+    policy = get_raster_policy(policy)
+    if policy is None or not policy["rasterize"]:
+        return
+    data_line, caplines, barlinecols = container.lines
+    if len(data_line.get_xdata()) <= policy["min_points"]:
+        return
+    for artist in (data_line, *caplines, *barlinecols):
+        artist.set_rasterized(True)
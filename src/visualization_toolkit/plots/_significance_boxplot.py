@@ -6,9 +6,16 @@ import itertools
 
 import numpy as np
 import pandas as pd
-from scipy.stats import mannwhitneyu
+from scipy.stats import chi2, mannwhitneyu
 
-from visualization_toolkit.plots._boxplot_utils import get_x_levels
+from visualization_toolkit.core import backend
+from visualization_toolkit.core.cache import memoize
+from visualization_toolkit.core.grouping import get_x_levels
+
+# Default layout of the brackets as fractions of the maximum of the group:
+# the first bracket starts above the maximum and the next ones are stacked.
+BRACKET_BASE_OFFSET = 0.05
+BRACKET_STEP_OFFSET = 0.30
 
 
 def pvalue_to_symbol(p: float, levels: dict) -> str:
@@ -122,9 +129,10 @@ def add_significance(
     x_levels,
     base_positions,
     levels: dict[float, str],
-    base_offset: float = 0.05,  # насколько выше max значения начинать
-    step_offset: float = 0.30,  # расстояние между скобками
+    base_offset: float = BRACKET_BASE_OFFSET,  # насколько выше max значения начинать
+    step_offset: float = BRACKET_STEP_OFFSET,  # расстояние между скобками
     linewidth: float = 1.5,
+    group_max: dict | None = None,
 ) -> None:
     """
     Add significance brackets to a plot showing statistical comparisons.
@@ -148,12 +156,15 @@ def add_significance(
         step_offset (float): Relative vertical spacing between multiple brackets.
                              Expressed as fraction of max y-value. Default: 0.30.
         linewidth (float): Line width for drawing the brackets. Default: 1.5.
+        group_max (dict | None): Precomputed maximum y-value per x-level,
+                                 see `compute_group_max`. Computed from `data` if None.
 
     Returns:
         None: The function modifies the plot in-place by adding significance brackets.
     """
     sig_df = significance_fn(data)
-    group_max = compute_group_max(data, x, y, x_levels)
+    if group_max is None:
+        group_max = compute_group_max(data, x, y, x_levels)
     group_counts = {xv: 0 for xv in x_levels}
     for _, row in sig_df.iterrows():
         sym = pvalue_to_symbol(row["pvalue"], levels)
@@ -183,10 +194,261 @@ significance_levels_asterisk = {
 }
 
 
+def mannwhitney_pairs(
+    samples: list[np.ndarray],
+    pairs: list[tuple[int, int]],
+    max_elements: int = 2**24,
+) -> np.ndarray:
+    """
+    Two-sided Mann-Whitney U tests for many pairs of samples in batches.
+
+    Pairs with equal sample sizes are stacked and tested by one vectorized
+    call per batch, with the same choice between the exact and the asymptotic
+    method as for separate `mannwhitneyu` calls. The asymptotic tests use the
+    configured numerical backend, see `core.backend.mannwhitney_asymptotic`.
+
+    Parameters:
+        samples (list[np.ndarray]): Samples without NaN values.
+        pairs (list[tuple[int, int]]): Indices of the samples to compare.
+        max_elements (int): Maximum number of stacked values per batch.
+
+    Returns:
+        np.ndarray: p-value of every pair.
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    pvalues = np.full(len(pairs), np.nan)
+    sizes = np.array([len(sample) for sample in samples], dtype=np.int64)
+    n1, n2 = sizes[pairs[:, 0]], sizes[pairs[:, 1]]
+    for size1, size2 in set(zip(n1.tolist(), n2.tolist())):
+        rows = np.flatnonzero((n1 == size1) & (n2 == size2))
+        step = max(1, max_elements // (size1 + size2))
+        for start in range(0, len(rows), step):
+            batch = rows[start : start + step]
+            first = np.stack([samples[i] for i in pairs[batch, 0]])
+            second = np.stack([samples[i] for i in pairs[batch, 1]])
+            if size1 > 8 and size2 > 8:
+                asymptotic = np.ones(len(batch), dtype=bool)
+            else:
+                # Small samples are tested exactly unless they have ties
+                combined = np.sort(np.concatenate([first, second], axis=1), axis=1)
+                asymptotic = (np.diff(combined, axis=1) == 0).any(axis=1)
+            if asymptotic.any():
+                pvalues[batch[asymptotic]] = backend.mannwhitney_asymptotic(
+                    first[asymptotic], second[asymptotic]
+                )
+            exact = ~asymptotic
+            if exact.any():
+                pvalues[batch[exact]] = mannwhitneyu(
+                    first[exact],
+                    second[exact],
+                    axis=1,
+                    alternative="two-sided",
+                    method="exact",
+                ).pvalue
+    return pvalues
+
+
+def _ranks_within(
+    values: np.ndarray, strata: np.ndarray, n_strata: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Midranks of values within every stratum from one sort, and the tie terms
+    sum(t**3 - t) over the runs of tied values of every stratum.
+    """
+    order = np.lexsort((values, strata))
+    sorted_values = values[order]
+    sorted_strata = strata[order]
+    new_run = np.ones(len(order), dtype=bool)
+    new_run[1:] = (sorted_values[1:] != sorted_values[:-1]) | (
+        sorted_strata[1:] != sorted_strata[:-1]
+    )
+    run_starts = np.flatnonzero(new_run)
+    run_sizes = np.diff(np.append(run_starts, len(order))).astype(float)
+    stratum_starts = np.searchsorted(sorted_strata, sorted_strata[run_starts])
+    midranks = run_starts - stratum_starts + (run_sizes + 1) / 2
+    ranks = np.empty(len(order))
+    ranks[order] = np.repeat(midranks, run_sizes.astype(np.int64))
+    ties = np.bincount(
+        sorted_strata[run_starts],
+        weights=run_sizes**3 - run_sizes,
+        minlength=n_strata,
+    )
+    return ranks, ties
+
+
+def kruskal_strata(
+    values: np.ndarray,
+    strata: np.ndarray,
+    groups: np.ndarray,
+    n_strata: int,
+    n_groups: int,
+    min_n: int = 2,
+) -> np.ndarray:
+    """
+    Kruskal-Wallis H tests of independent groups within every stratum at once.
+
+    The values of all strata are ranked by one sort, the statistics are
+    tie-corrected as in `scipy.stats.kruskal`.
+
+    Parameters:
+        values (np.ndarray): Values, NaN values are ignored.
+        strata (np.ndarray): Stratum index of every value in [0, n_strata).
+        groups (np.ndarray): Group index of every value in [0, n_groups).
+        n_strata (int): Number of strata.
+        n_groups (int): Number of groups.
+        min_n (int): Groups with fewer values are left out of the test.
+
+    Returns:
+        np.ndarray: p-value of every stratum, NaN if it has less than two groups.
+    """
+    values = np.asarray(values, dtype=float)
+    cells = np.asarray(strata, dtype=np.int64) * n_groups + groups
+    valid = ~np.isnan(values)
+    sizes = np.bincount(cells[valid], minlength=n_strata * n_groups)
+    keep = valid & (sizes[cells] >= min_n)
+    values, cells = values[keep], cells[keep]
+    ranks, ties = _ranks_within(values, cells // n_groups, n_strata)
+
+    n = np.bincount(cells, minlength=n_strata * n_groups).reshape(n_strata, n_groups)
+    sums = np.bincount(cells, weights=ranks, minlength=n_strata * n_groups)
+    sums = sums.reshape(n_strata, n_groups)
+    total = n.sum(axis=1).astype(float)
+    k = (n > 0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ssbn = np.divide(sums**2, n, out=np.zeros_like(sums), where=n > 0).sum(axis=1)
+        h = 12 / (total * (total + 1)) * ssbn - 3 * (total + 1)
+        correction = 1 - ties / (total**3 - total)
+        pvalues = chi2.sf(h / correction, k - 1)
+    # All values of a stratum are tied, the statistic is undefined.
+    pvalues[(k < 2) | ~(correction > 0)] = np.nan
+    return pvalues
+
+
+def friedman_strata(
+    values: np.ndarray,
+    strata: np.ndarray,
+    groups: np.ndarray,
+    blocks: np.ndarray,
+    n_strata: int,
+    n_groups: int,
+) -> np.ndarray:
+    """
+    Friedman tests of paired groups within every stratum at once.
+
+    Every block (e.g. a run of an experiment) holds one value of every
+    group present in its stratum; incomplete blocks are left out. The values
+    are ranked within all blocks by one sort, the statistics are tie-corrected
+    as in `scipy.stats.friedmanchisquare`.
+
+    Parameters:
+        values (np.ndarray): Values, NaN values are ignored.
+        strata (np.ndarray): Stratum index of every value in [0, n_strata).
+        groups (np.ndarray): Group index of every value in [0, n_groups).
+        blocks (np.ndarray): Non-negative block index of every value.
+        n_strata (int): Number of strata.
+        n_groups (int): Number of groups.
+
+    Returns:
+        np.ndarray: p-value of every stratum, NaN if it has less than two groups
+                    or no complete block.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    values = values[valid]
+    strata = np.asarray(strata, dtype=np.int64)[valid]
+    groups = np.asarray(groups, dtype=np.int64)[valid]
+    blocks = np.asarray(blocks, dtype=np.int64)[valid]
+    pvalues = np.full(n_strata, np.nan)
+    if len(values) == 0:
+        return pvalues
+
+    present = np.bincount(strata * n_groups + groups, minlength=n_strata * n_groups)
+    k = (present.reshape(n_strata, n_groups) > 0).sum(axis=1)
+    n_blocks = int(blocks.max()) + 1
+    keys = strata * n_blocks + blocks
+    cells = keys * n_groups + groups
+    if len(np.unique(cells)) < len(cells):
+        raise ValueError("Friedman test needs one value per block and group")
+    sizes = np.bincount(keys, minlength=n_strata * n_blocks)
+    complete = sizes[keys] == k[strata]
+    values, strata, groups, keys = (
+        array[complete] for array in (values, strata, groups, keys)
+    )
+    ranks, ties = _ranks_within(values, keys, n_strata * n_blocks)
+    ties = ties.reshape(n_strata, n_blocks).sum(axis=1)
+
+    n = np.bincount(strata, minlength=n_strata) / np.maximum(k, 1)
+    sums = np.bincount(
+        strata * n_groups + groups, weights=ranks, minlength=n_strata * n_groups
+    )
+    ssbn = (sums.reshape(n_strata, n_groups) ** 2).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        statistic = 12 / (k * n * (k + 1)) * ssbn - 3 * n * (k + 1)
+        correction = 1 - ties / (k * (k * k - 1) * n)
+        pvalues = chi2.sf(statistic / correction, k - 1)
+    pvalues[(k < 2) | (n < 1) | ~(correction > 0)] = np.nan
+    return pvalues
+
+
+def omnibus_pvalues(
+    data: pd.DataFrame,
+    y: str,
+    strata: np.ndarray,
+    groups: np.ndarray,
+    n_strata: int,
+    n_groups: int,
+    omnibus: str,
+    block: str | None,
+    min_n: int = 2,
+) -> np.ndarray:
+    """
+    Run an omnibus test for every stratum of the rows of a DataFrame.
+
+    Parameters:
+        data (pd.DataFrame): Input data.
+        y (str): Column name for the numeric variable to analyze.
+        strata (np.ndarray): Stratum index of every row, -1 to leave a row out.
+        groups (np.ndarray): Group index of every row, -1 to leave a row out.
+        n_strata (int): Number of strata.
+        n_groups (int): Number of groups.
+        omnibus (str): "kruskal" for independent groups, "friedman" for
+                       paired groups with blocks in the `block` column.
+        block (str | None): Column name of the blocks, required for "friedman".
+        min_n (int): Minimum group size of the Kruskal-Wallis test.
+
+    Returns:
+        np.ndarray: p-value of every stratum.
+    """
+    if omnibus not in ("kruskal", "friedman"):
+        raise ValueError(f"Unknown omnibus test '{omnibus}'")
+    if omnibus == "friedman" and block is None:
+        raise ValueError("Friedman test needs a block column, e.g. block='run'")
+    used = (strata >= 0) & (groups >= 0)
+    values = data[y].to_numpy(dtype=float)[used]
+    if omnibus == "kruskal":
+        return kruskal_strata(
+            values, strata[used], groups[used], n_strata, n_groups, min_n
+        )
+    blocks, _ = pd.factorize(data[block])
+    values[blocks[used] < 0] = np.nan
+    return friedman_strata(
+        values,
+        strata[used],
+        groups[used],
+        np.maximum(blocks[used], 0),
+        n_strata,
+        n_groups,
+    )
+
+
+@memoize("x", "y", "block")
 def compare_all_pairs(
     data: pd.DataFrame,
     x: str,
     y: str,
+    omnibus: str | None = None,
+    omnibus_alpha: float = 0.05,
+    block: str | None = None,
 ) -> pd.DataFrame:
     """
     Perform pairwise statistical comparisons between all levels of x-variable.
@@ -195,54 +457,88 @@ def compare_all_pairs(
         data (pd.DataFrame): Input data containing the variables to analyze.
         x (str): Column name for the grouping variable to compare between groups.
         y (str): Column name for the numeric variable to analyze.
+        omnibus (str | None): Omnibus test run before the pairwise tests:
+                              "kruskal" (Kruskal-Wallis) for independent groups,
+                              "friedman" for paired groups, e.g. runs of
+                              `mse_experiment`. If None, no omnibus test is run.
+        omnibus_alpha (float): The pairwise tests run only if the omnibus
+                               p-value is below this level.
+        block (str | None): Column name of the blocks of a paired design,
+                            e.g. "run", required for "friedman".
 
     Returns:
         pd.DataFrame: DataFrame with columns:
                      - 'x1': First group in comparison
                      - 'x2': Second group in comparison
                      - 'pvalue': Mann-Whitney U test p-value for the pair
+                     - 'omnibus_pvalue': p-value of the omnibus test, only if `omnibus` is given
     """
-    rows = []
-
-    x_levels = data[x].unique()
-    x_levels.sort()
-
-    for x1, x2 in itertools.combinations(x_levels, 2):
-        v1 = data.loc[data[x] == x1, y].dropna()
-        v2 = data.loc[data[x] == x2, y].dropna()
-
-        if len(v1) < 2 or len(v2) < 2:
-            continue
-
-        _, p = mannwhitneyu(v1, v2, alternative="two-sided")
-
-        rows.append(
-            {
-                "x1": x1,
-                "x2": x2,
-                "pvalue": p,
-            }
+    x_levels = get_x_levels(data, x)
+    groups = {key: values.dropna().to_numpy() for key, values in data.groupby(x)[y]}
+    samples = [groups.get(level, np.empty(0)) for level in x_levels]
+
+    pairs = [
+        (i, j)
+        for i, j in itertools.combinations(range(len(x_levels)), 2)
+        if len(samples[i]) >= 2 and len(samples[j]) >= 2
+    ]
+    if omnibus is not None and pairs:
+        codes = pd.Index(x_levels).get_indexer(data[x])
+        (omnibus_pvalue,) = omnibus_pvalues(
+            data, y, np.zeros_like(codes), codes, 1, len(x_levels), omnibus, block
         )
-
-    return pd.DataFrame(rows)
-
-
+        if not omnibus_pvalue < omnibus_alpha:
+            pairs = []
+    if not pairs:
+        return pd.DataFrame()
+    index = np.array(pairs)
+    result = pd.DataFrame(
+        {
+            "x1": [x_levels[i] for i in index[:, 0]],
+            "x2": [x_levels[j] for j in index[:, 1]],
+            "pvalue": mannwhitney_pairs(samples, pairs),
+        }
+    )
+    if omnibus is not None:
+        result["omnibus_pvalue"] = omnibus_pvalue
+    return result
+
+
+@memoize("x", "y", "hue", "block")
 def compare_hue_within_groups(
     data: pd.DataFrame,
     x: str,
     y: str,
     hue: str,
     min_n: int = 2,
+    omnibus: str | None = None,
+    omnibus_alpha: float = 0.05,
+    block: str | None = None,
+    reference=None,
 ) -> pd.DataFrame:
     """
     Compare hue levels within each group of x-variable.
 
+    With an omnibus test, the hue levels of all x groups are tested at once
+    (see `kruskal_strata` and `friedman_strata`) and the pairwise tests run
+    only within the x groups where the omnibus test is significant.
+
     Parameters:
         data (pd.DataFrame): Input data containing the variables to analyze.
         x (str): Column name for the primary grouping variable.
         y (str): Column name for the numeric variable to analyze.
         hue (str): Column name for the secondary grouping variable (hue) to compare within x-groups.
         min_n (int): Minimum sample size required for comparison. Default: 2.
+        omnibus (str | None): Omnibus test run before the pairwise tests:
+                              "kruskal" (Kruskal-Wallis) for independent groups,
+                              "friedman" for paired groups, e.g. runs of
+                              `mse_experiment`. If None, no omnibus test is run.
+        omnibus_alpha (float): The pairwise tests of an x group run only if its
+                               omnibus p-value is below this level.
+        block (str | None): Column name of the blocks of a paired design,
+                            e.g. "run", required for "friedman".
+        reference: If given, only the pairs of this hue level with the other
+                   levels are tested, e.g. for the marks of `mseplot`.
 
     Returns:
         pd.DataFrame: DataFrame with columns:
@@ -250,30 +546,50 @@ def compare_hue_within_groups(
                      - 'hue1': First hue level in comparison
                      - 'hue2': Second hue level in comparison
                      - 'pvalue': Mann-Whitney U test p-value for the pair
+                     - 'omnibus_pvalue': p-value of the omnibus test of the x group,
+                       only if `omnibus` is given
     """
-    rows = []
-
     x_levels = get_x_levels(data, x)
     hue_levels = get_x_levels(data, hue)
+    groups = {
+        key: values.dropna().to_numpy() for key, values in data.groupby([x, hue])[y]
+    }
+    if omnibus is not None:
+        omnibus_pvalue = omnibus_pvalues(
+            data,
+            y,
+            pd.Index(x_levels).get_indexer(data[x]),
+            pd.Index(hue_levels).get_indexer(data[hue]),
+            len(x_levels),
+            len(hue_levels),
+            omnibus,
+            block,
+            min_n,
+        )
 
-    for x_val in x_levels:
-        df_x = data[data[x] == x_val]
-
-        for h1, h2 in itertools.combinations(hue_levels, 2):
-            v1 = df_x.loc[df_x[hue] == h1, y].dropna()
-            v2 = df_x.loc[df_x[hue] == h2, y].dropna()
-
-            if len(v1) < min_n or len(v2) < min_n:
+    samples = []
+    keys = []
+    pairs = []
+    for k, x_val in enumerate(x_levels):
+        offset = len(samples)
+        samples.extend(groups.get((x_val, h), np.empty(0)) for h in hue_levels)
+        if omnibus is not None and not omnibus_pvalue[k] < omnibus_alpha:
+            continue
+        for i, j in itertools.combinations(range(len(hue_levels)), 2):
+            if len(samples[offset + i]) < min_n or len(samples[offset + j]) < min_n:
                 continue
-
-            _, p = mannwhitneyu(v1, v2, alternative="two-sided")
-
-            rows.append(
-                {
-                    "x": x_val,
-                    "hue1": h1,
-                    "hue2": h2,
-                    "pvalue": p,
-                }
-            )
-    return pd.DataFrame(rows)
+            if reference is not None and reference not in (
+                hue_levels[i],
+                hue_levels[j],
+            ):
+                continue
+            keys.append((x_val, hue_levels[i], hue_levels[j]))
+            pairs.append((offset + i, offset + j))
+    if not pairs:
+        return pd.DataFrame()
+    result = pd.DataFrame(keys, columns=["x", "hue1", "hue2"])
+    result["pvalue"] = mannwhitney_pairs(samples, pairs)
+    if omnibus is not None:
+        x_index = pd.Index(x_levels).get_indexer(result["x"])
+        result["omnibus_pvalue"] = omnibus_pvalue[x_index]
+    return result
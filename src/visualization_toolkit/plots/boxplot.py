@@ -1,28 +1,40 @@
 "Boxplot plotting"
 
-from typing import Any, Callable, Sequence, Tuple
+import re
+from typing import Any, Callable, Iterator, Sequence, Tuple
 
 import matplotlib
 import numpy as np
 import pandas as pd
+from matplotlib import cbook
+from matplotlib.lines import Line2D
 
+from visualization_toolkit.core.downsample import decimate_extremes
+from visualization_toolkit.core.grouping import get_x_levels, group_values
+from visualization_toolkit.core.summary import Summary
 from visualization_toolkit.plots._boxplot_utils import (
     add_legend,
+    auto_y_limits,
     create_axes,
-    get_x_levels,
     is_broken,
 )
-from visualization_toolkit.plots._significance_boxplot import add_significance
+from visualization_toolkit.plots._raster import apply_flier_policy, get_raster_policy
+from visualization_toolkit.plots._significance_boxplot import (
+    BRACKET_BASE_OFFSET,
+    BRACKET_STEP_OFFSET,
+    add_significance,
+)
+from visualization_toolkit.plots.templates import TemplatePool
 
 
 def boxplot(
-    data: pd.DataFrame,
+    data: pd.DataFrame | Summary,
     x: str,
     y: str,
     hue: str | None = None,
     styles: dict | None = None,
-    y_limits: Sequence[Tuple[float, float]] | None = None,
-    significance_fn: Callable | None = None,
+    y_limits: Sequence[Tuple[float, float]] | str | None = None,
+    significance_fn: Callable | str | None = None,
     significance_levels: dict[float, str] | None = None,
     logy: bool = True,
     x_label: str | None = None,
@@ -33,6 +45,8 @@ def boxplot(
     title_fontsize: int = 22,
     fig_size: tuple = (12, 8),
     ax: matplotlib.axes.Axes | None = None,
+    raster_policy: dict | None = None,
+    template_pool: TemplatePool | None = None,
     **kwargs,
 ):
     """
@@ -47,16 +61,24 @@ def boxplot(
     - draw_significance
 
     Parameters:
-        data (pd.DataFrame): Input data containing experimental values.
+        data (pd.DataFrame | Summary): Input data containing experimental values.
                              Must include columns specified by x and y, and hue if used.
+                             A `Summary` of the data can be passed instead, the boxes
+                             are then drawn from the stored statistics with `ax.bxp`,
+                             see `core.summary.summarize`.
         x (str): Column name used as the categorical X-axis.
         y (str): Column name with values to plot as boxplots.
         hue (str | None, optional): Column name for additional grouping within X categories.
         styles (dict, optional): Dictionary of styles for different hue levels,
                                  passed to ax.boxplot.
-        y_limits (Sequence[Tuple[float, float]], optional): Y-axis limits for the boxplot.
+        y_limits (Sequence[Tuple[float, float]] | str, optional): Y-axis limits for the boxplot.
                             If one tuple is provided, it will be used for one plots;
                             two tuples for two plots with broken axis.
+                            If "auto", the axis is broken at the largest gap between
+                            the groups and `height_ratios` is chosen automatically,
+                            see `auto_y_limits`. A single axis is used if there is
+                            no such gap or if `ax` is given; with `significance_fn`
+                            the limits are chosen by autoscaling.
         x_label (str, optional): Label for the X-axis.
         y_label (str, optional): Label for the Y-axis.
         title (str, optional): Plot title.
@@ -65,6 +87,12 @@ def boxplot(
         title_fontsize (int, optional): Font size for the title.
         fig_size (tuple, optional): Figure size (width, height) in inches.
         ax (matplotlib.axes.Axes, optional): Existing axes to plot on. Creates new figure if None.
+        raster_policy (dict, optional): Rasterization and flier decimation policy
+                            for compact vector outputs, e.g. {"max_fliers": 200}.
+                            See `plots._raster` for the available keys.
+        template_pool (TemplatePool, optional): Pool of figure layouts. If given and `ax`
+                            is None, the figure with its axis break is reused from the pool;
+                            return it with `template_pool.release(fig)` instead of closing it.
 
     Returns:
         Tuple if broken=True, else single Axes.
@@ -74,18 +102,40 @@ def boxplot(
 
     if styles is None:
         styles = {}
+    box_stats = None
+    group_max = None
+    if isinstance(data, Summary):
+        data.check_columns(x, y, hue)
+        box_stats = data.box_stats()
+        group_max = data.group_max()
+        groups = _summary_groups(box_stats)
+        if isinstance(significance_fn, str):
+            significance_fn = data.significance_fn(significance_fn)
+    else:
+        groups = group_values(data, x, y, hue)
+    if isinstance(y_limits, str):
+        y_limits, height_ratios = _resolve_auto_limits(
+            y_limits, groups, logy, height_ratios, significance_fn, ax is None
+        )
     if (significance_fn is not None) and (is_broken(y_limits)):
         raise NotImplementedError(
             "Significance levels are not supported with broken axis"
         )
 
     fig, axes = create_axes(
-        y_limits=y_limits, height_ratios=height_ratios, fig_size=fig_size, ax=ax
+        y_limits=y_limits,
+        height_ratios=height_ratios,
+        fig_size=fig_size,
+        ax=ax,
+        template_pool=template_pool,
     )
     ax_top = axes[0]
     ax_main = axes[-1]
-    x_levels = get_x_levels(data, x)
-    hue_levels = get_x_levels(data, hue)
+    if box_stats is not None:
+        x_levels, hue_levels = data.x_levels, data.hue_levels
+    else:
+        x_levels = get_x_levels(data, x)
+        hue_levels = get_x_levels(data, hue)
     base_positions = np.arange(1, len(x_levels) + 1)
 
     for ax_ in axes:
@@ -99,6 +149,9 @@ def boxplot(
             x_levels,
             styles,
             ax_,
+            raster_policy=raster_policy,
+            groups=groups,
+            box_stats=box_stats,
             **kwargs,
         )
         if logy:
@@ -129,10 +182,140 @@ def boxplot(
         x_levels=x_levels,
         base_positions=base_positions,
         levels=significance_levels,
+        group_max=group_max,
     )
     return fig, axes
 
 
+def _summary_groups(box_stats: dict) -> dict:
+    """
+    Approximate the values of every box by its whiskers, quartiles and fliers.
+    """
+    return {
+        key: np.concatenate(
+            [
+                [stats["whislo"], stats["q1"], stats["med"], stats["q3"]],
+                [stats["whishi"]],
+                stats["fliers"],
+            ]
+        )
+        for key, stats in box_stats.items()
+    }
+
+
+def boxplot_to_bxp_kwargs(kwargs: dict, whis: float) -> dict:
+    """
+    Convert keyword arguments of `Axes.boxplot` to the ones of `Axes.bxp`.
+
+    The preprocessing follows `Axes.boxplot`, so that boxes drawn from
+    precomputed statistics look the same as boxes drawn from the values.
+
+    Parameters:
+        kwargs (dict): Keyword arguments of `Axes.boxplot`.
+        whis (float): Whisker reach the statistics were computed with.
+    Returns:
+        dict: Keyword arguments of `Axes.bxp`.
+    """
+    kwargs = dict(kwargs)
+    requested_whis = kwargs.pop("whis", None)
+    if requested_whis is None:
+        requested_whis = matplotlib.rcParams["boxplot.whiskers"]
+    if requested_whis != whis:
+        raise ValueError(
+            f"The statistics are computed with whis={whis}, got whis={requested_whis}"
+        )
+    for name in ("bootstrap", "usermedians", "conf_intervals", "autorange"):
+        if kwargs.pop(name, None):
+            raise ValueError(f"'{name}' is not supported with precomputed statistics")
+    if "notch" in kwargs:
+        kwargs["shownotches"] = kwargs.pop("notch")
+
+    for name in ("boxprops", "flierprops"):
+        kwargs[name] = dict(kwargs.get(name) or {})
+    patch_artist = kwargs.get("patch_artist")
+    if patch_artist is None:
+        patch_artist = matplotlib.rcParams["boxplot.patchartist"]
+    if patch_artist:
+        kwargs["boxprops"]["linestyle"] = "solid"
+        if "color" in kwargs["boxprops"]:
+            kwargs["boxprops"]["edgecolor"] = kwargs["boxprops"].pop("color")
+
+    sym = kwargs.pop("sym", None)
+    if sym == "":
+        kwargs["flierprops"] = dict(linestyle="none", marker="", color="none")
+        kwargs["showfliers"] = False
+    elif sym is not None:
+        marker, color = _parse_sym(sym)
+        if marker is not None:
+            kwargs["flierprops"]["marker"] = marker
+        if color is not None:
+            kwargs["flierprops"]["color"] = color
+            kwargs["flierprops"]["markerfacecolor"] = color
+            kwargs["flierprops"]["markeredgecolor"] = color
+    return kwargs
+
+
+def _parse_sym(sym: str) -> tuple:
+    """
+    Marker and color of a format string, e.g. the `sym` of `Axes.boxplot`.
+
+    The format is parsed in the same way as the format strings of `Axes.plot`.
+    """
+    if sym not in ("0", "1") and matplotlib.colors.is_color_like(sym):
+        return None, sym
+    marker = color = linestyle = None
+    i = 0
+    while i < len(sym):
+        char = sym[i]
+        if sym[i : i + 2] in Line2D.lineStyles:
+            linestyle = sym[i : i + 2]
+            i += 2
+        elif char in Line2D.lineStyles:
+            linestyle = char
+            i += 1
+        elif char in Line2D.markers:
+            marker = char
+            i += 1
+        elif char in matplotlib.colors.BASE_COLORS:
+            color = char
+            i += 1
+        elif cycle_color := re.match(r"C\d+", sym[i:]):
+            color = cycle_color.group()
+            i += len(color)
+        else:
+            raise ValueError(f"Unrecognized character {char!r} in format {sym!r}")
+    if linestyle is not None and marker is None:
+        # A format with a line style and without a marker draws no markers.
+        marker = "None"
+    return marker, color
+
+
+def _resolve_auto_limits(
+    y_limits: str,
+    groups: dict,
+    logy: bool,
+    height_ratios,
+    significance_fn: Callable | None,
+    allow_break: bool = True,
+) -> tuple:
+    """
+    Replace y_limits="auto" by the limits and height ratios chosen from the groups.
+
+    With significance brackets the limits are left to autoscaling,
+    which makes room for the brackets.
+    """
+    if y_limits != "auto":
+        raise ValueError(f"Unknown y_limits '{y_limits}', expected 'auto' or limits")
+    if significance_fn is not None:
+        return None, height_ratios
+    limits, ratios = auto_y_limits(groups, logy)
+    if limits is None:
+        return None, height_ratios
+    if not allow_break and len(limits) > 1:
+        return ((limits[0][0], limits[1][1]),), height_ratios
+    return limits, ratios if ratios is not None else height_ratios
+
+
 def plot_box_on_axis(
     data,
     x: str,
@@ -143,6 +326,9 @@ def plot_box_on_axis(
     x_levels: Any,
     styles: dict,
     ax: matplotlib.axes.Axes,
+    raster_policy: dict | None = None,
+    groups: dict | None = None,
+    box_stats: dict | None = None,
     **kwargs,
 ):
     """
@@ -158,25 +344,324 @@ def plot_box_on_axis(
         x_levels (array-like): Unique values of the X variable.
         styles (dict): Dictionary of styles for each hue value, passed to ax.boxplot.
         ax (matplotlib.axes.Axes): Axis object on which to draw the boxplots.
+        raster_policy (dict or None): Rasterization and flier decimation policy.
+        groups (dict or None): Values split by (x, hue), see `group_values`.
+                               Computed from `data` if None.
+        box_stats (dict or None): Precomputed statistics by (x, hue), see
+                               `Summary.box_stats`. If given, the boxes are drawn
+                               with `ax.bxp` and `data` and `groups` are not used.
     """
+    if box_stats is not None:
+        whis = data.whis if isinstance(data, Summary) else 1.5
+        _plot_box_stats_on_axis(
+            box_stats,
+            whis,
+            hue_levels,
+            base_positions,
+            x_levels,
+            styles,
+            ax,
+            raster_policy,
+            **kwargs,
+        )
+        return
+    if groups is None:
+        groups = group_values(data, x, y, hue)
+    policy = get_raster_policy(raster_policy)
+    max_fliers = policy["max_fliers"] if policy is not None else None
     n_hue = len(hue_levels)
     width = 0.8 / max(1, n_hue)
     for i, hue_val in enumerate(hue_levels):
         offset = (i - (n_hue - 1) / 2) * width
+        box_kwargs = {**kwargs, **(styles.get(hue_val, {}) if styles else {})}
+        decimate = max_fliers is not None and not any(
+            box_kwargs.get(name) is not None for name in _STATS_OPTIONS
+        )
 
         for j, x_val in enumerate(x_levels):
-            mask = data[x] == x_val
-            if hue is not None:
-                mask &= data[hue] == hue_val
+            values = groups.get((x_val, hue_val))
+            if values is None or len(values) == 0:
+                continue
+
+            position = base_positions[j] + offset
+            if decimate:
+                artists = _plot_decimated_box(
+                    ax, values, position, width * 0.9, max_fliers, box_kwargs
+                )
+            else:
+                artists = ax.boxplot(
+                    values,
+                    positions=[position],
+                    widths=width * 0.9,
+                    **box_kwargs,
+                )
+            apply_flier_policy(artists["fliers"], raster_policy)
+
 
-            values = data.loc[mask, y].values
-            if len(values) == 0:
+# Options of `Axes.boxplot` changing the statistics computed from the values.
+_STATS_OPTIONS = ("usermedians", "conf_intervals")
+
+
+def _plot_decimated_box(
+    ax: matplotlib.axes.Axes,
+    values: np.ndarray,
+    position: float,
+    width: float,
+    max_fliers: int,
+    kwargs: dict,
+) -> dict:
+    """
+    Draw a box with at most `max_fliers` fliers, decimated before drawing.
+
+    The statistics are computed as in `Axes.boxplot` and drawn with
+    `Axes.bxp`, so the box looks the same apart from the decimated fliers.
+    """
+    whis = kwargs.get("whis")
+    if whis is None:
+        whis = matplotlib.rcParams["boxplot.whiskers"]
+    (stats,) = cbook.boxplot_stats(
+        values,
+        whis=whis,
+        bootstrap=kwargs.get("bootstrap"),
+        autorange=kwargs.get("autorange") or False,
+    )
+    stats["fliers"] = decimate_extremes(stats["fliers"], max_fliers)
+    bxp_kwargs = boxplot_to_bxp_kwargs(
+        {**kwargs, "whis": whis, "bootstrap": None, "autorange": None}, whis
+    )
+    return ax.bxp([stats], positions=[position], widths=width, **bxp_kwargs)
+
+
+def _plot_box_stats_on_axis(
+    box_stats: dict,
+    whis: float,
+    hue_levels: list,
+    base_positions: Any,
+    x_levels: Any,
+    styles: dict,
+    ax: matplotlib.axes.Axes,
+    raster_policy: dict | None = None,
+    **kwargs,
+):
+    """
+    Plot boxes from precomputed statistics on a given axis, see `plot_box_on_axis`.
+    """
+    n_hue = len(hue_levels)
+    width = 0.8 / max(1, n_hue)
+    for i, hue_val in enumerate(hue_levels):
+        offset = (i - (n_hue - 1) / 2) * width
+        bxp_kwargs = boxplot_to_bxp_kwargs(
+            {**kwargs, **(styles.get(hue_val, {}) if styles else {})}, whis
+        )
+
+        for j, x_val in enumerate(x_levels):
+            stats = box_stats.get((x_val, hue_val))
+            if stats is None:
                 continue
 
-            ax.boxplot(
-                values,
+            artists = ax.bxp(
+                [stats],
                 positions=[base_positions[j] + offset],
                 widths=width * 0.9,
+                **bxp_kwargs,
+            )
+            apply_flier_policy(artists["fliers"], raster_policy)
+
+
+def _page_significance(sig_df: pd.DataFrame, hue: str | None, page_levels) -> Any:
+    """
+    Select the comparisons that can be drawn on a page.
+    """
+    if sig_df is None or sig_df.empty:
+        return sig_df
+    if hue is None:
+        mask = sig_df["x1"].isin(page_levels) & sig_df["x2"].isin(page_levels)
+    else:
+        mask = sig_df["x"].isin(page_levels)
+    return sig_df[mask]
+
+
+def _shared_y_limits(
+    groups: dict,
+    group_max: dict,
+    sig_df: pd.DataFrame | None,
+    hue: str | None,
+    levels: dict | None,
+    logy: bool,
+) -> tuple:
+    """
+    Compute y-limits covering all groups and significance brackets of all pages.
+
+    Returns None if no value can be drawn, e.g. only NaN values or, with
+    `logy`, no positive values; the default limits are used then.
+    """
+    values = np.concatenate([np.empty(0), *groups.values()])
+    values = values[np.isfinite(values)]
+    if logy:
+        values = values[values > 0]
+    if not len(values):
+        return None
+    low, high = values.min(), values.max()
+
+    if sig_df is not None and not sig_df.empty and levels:
+        threshold = max(levels)
+        significant = sig_df[sig_df["pvalue"] <= threshold]
+        if hue is None:
+            x_vals = [
+                x1 if group_max[x1] > group_max[x2] else x2
+                for x1, x2 in zip(significant["x1"], significant["x2"])
+            ]
+        else:
+            x_vals = significant["x"]
+        counts = pd.Series(x_vals, dtype=object).value_counts()
+        for x_val, count in counts.items():
+            # same layout as the default of add_significance
+            high = max(
+                high,
+                group_max[x_val]
+                * (1 + BRACKET_BASE_OFFSET + BRACKET_STEP_OFFSET * count),
+            )
+
+    if logy:
+        return (low / 1.2, high * 1.2)
+    margin = 0.05 * (high - low)
+    return (low - margin, high + margin)
+
+
+def boxplot_pages(
+    data: pd.DataFrame,
+    x: str,
+    y: str,
+    hue: str | None = None,
+    per_page: int = 20,
+    styles: dict | None = None,
+    y_limits: Sequence[Tuple[float, float]] | str | None = None,
+    significance_fn: Callable | None = None,
+    significance_levels: dict[float, str] | None = None,
+    logy: bool = True,
+    x_label: str | None = None,
+    y_label: str | None = None,
+    title: str | None = None,
+    height_ratios=(1, 2),
+    axes_fontsize: int = 20,
+    title_fontsize: int = 22,
+    fig_size: tuple = (12, 8),
+    raster_policy: dict | None = None,
+    **kwargs,
+) -> Iterator[tuple]:
+    """
+    Boxplot split into pages for data with many X levels.
+
+    The values are grouped by (x, hue) and the significance tests are
+    computed once for the whole data. The pages are then drawn one at a
+    time from the precomputed groups with the same y-limits and styles,
+    so the pages can be streamed to a report as they are produced.
+
+    Parameters:
+        data (pd.DataFrame): Input data containing experimental values.
+        x (str): Column name used as the categorical X-axis.
+        y (str): Column name with values to plot as boxplots.
+        hue (str | None, optional): Column name for additional grouping within X categories.
+        per_page (int, optional): Number of X levels per page.
+        styles (dict, optional): Dictionary of styles for different hue levels.
+        y_limits (Sequence[Tuple[float, float]] | str, optional): Y-axis limits used for
+                            every page. If None, limits covering all pages are computed.
+                            If "auto", a broken axis is chosen for all pages,
+                            see `boxplot`.
+        significance_fn (callable, optional): Function returning pairwise comparisons,
+                            called once with the whole data. Comparisons between
+                            X levels on different pages are not drawn.
+        significance_levels (dict, optional): Mapping of p-value thresholds to symbols.
+        logy (bool, optional): If True, use a logarithmic scale for the y-axis.
+        x_label (str, optional): Label for the X-axis.
+        y_label (str, optional): Label for the Y-axis.
+        title (str, optional): Title of every page, formatted with `page` and `pages`,
+                               e.g. "MSE ({page}/{pages})".
+        height_ratios (tuple, optional): Relative heights of top and bottom axes for broken axis.
+        axes_fontsize (int, optional): Font size for axis labels and ticks.
+        title_fontsize (int, optional): Font size for the title.
+        fig_size (tuple, optional): Figure size (width, height) in inches.
+        raster_policy (dict, optional): Rasterization and flier decimation policy.
+
+    Returns:
+        Iterator[tuple]: (fig, axes) for every page.
+
+    Usage example:
+    >>> pages = boxplot_pages(df, "condition", "mse", "label", per_page=25)
+    >>> write_report(pages, "conditions.pdf")
+    """
+    if styles is None:
+        styles = {}
+    groups = group_values(data, x, y, hue)
+    if isinstance(y_limits, str):
+        y_limits, height_ratios = _resolve_auto_limits(
+            y_limits, groups, logy, height_ratios, significance_fn
+        )
+    if (significance_fn is not None) and (is_broken(y_limits)):
+        raise NotImplementedError(
+            "Significance levels are not supported with broken axis"
+        )
+
+    x_levels = get_x_levels(data, x)
+    hue_levels = get_x_levels(data, hue)
+    group_max = data.groupby(x)[y].max().to_dict()
+    sig_df = significance_fn(data) if significance_fn is not None else None
+    if y_limits is None:
+        limits = _shared_y_limits(
+            groups, group_max, sig_df, hue, significance_levels, logy
+        )
+        y_limits = None if limits is None else (limits,)
+
+    n_pages = max(1, int(np.ceil(len(x_levels) / per_page)))
+    for page in range(n_pages):
+        page_levels = x_levels[page * per_page : (page + 1) * per_page]
+        fig, axes = create_axes(
+            y_limits=y_limits, height_ratios=height_ratios, fig_size=fig_size
+        )
+        base_positions = np.arange(1, len(page_levels) + 1)
+        for ax_ in axes:
+            plot_box_on_axis(
+                data,
+                x,
+                y,
+                hue,
+                hue_levels,
+                base_positions,
+                page_levels,
+                styles,
+                ax_,
+                raster_policy=raster_policy,
+                groups=groups,
                 **kwargs,
-                **(styles.get(hue_val, {}) if styles else {}),
             )
+            if logy:
+                ax_.set_yscale("log")
+            ax_.grid(True)
+            ax_.tick_params(axis="both", labelsize=axes_fontsize - 4)
+
+        axes[-1].set_xticks(base_positions)
+        axes[-1].set_xticklabels(page_levels)
+        axes[-1].set_xlabel(x_label, fontsize=axes_fontsize)
+        axes[-1].set_ylabel(y_label, fontsize=axes_fontsize)
+        if title is not None:
+            axes[0].set_title(
+                title.format(page=page + 1, pages=n_pages), fontsize=title_fontsize
+            )
+        if hue is not None:
+            add_legend(fig, styles, hue_levels, axes_fontsize - 4)
+        if sig_df is not None:
+            page_sig = _page_significance(sig_df, hue, page_levels)
+            add_significance(
+                ax=axes[0],
+                data=data,
+                significance_fn=lambda _: page_sig,
+                x=x,
+                y=y,
+                hue=hue,
+                hue_levels=hue_levels,
+                x_levels=page_levels,
+                base_positions=base_positions,
+                levels=significance_levels,
+                group_max=group_max,
+            )
+        yield fig, axes
@@ -0,0 +1,201 @@
+"""Per-sample error band plotting"""
+
+import matplotlib
+import numpy as np
+
+from ..config import get_text
+from ..core.backend import lerp
+from ..core.downsample import lttb, minmax
+from ._figure import subplots
+
+DEFAULT_CHUNK_BYTES = 64 * 1024**2
+
+
+def error_quantiles(
+    errors: np.ndarray,
+    estimator: str = "median",
+    errorbar_data: tuple = (5, 95),
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> np.ndarray:
+    """
+    Compute the central value and percentile band of errors over realizations.
+
+    The statistics are computed along the realization axis for blocks of
+    time samples, so that memory-mapped inputs are read one block at a time
+    and the temporaries stay below `chunk_bytes`. The percentiles are equal
+    to `np.percentile` with linear interpolation.
+
+    Parameters:
+        errors (np.ndarray): Errors with shape (n_realizations, n_samples),
+                             e.g. a `np.memmap`.
+        estimator (str): Central value, "median" or "mean".
+        errorbar_data (tuple): Lower and upper percentiles of the band.
+        chunk_bytes (int): Approximate size of one block in bytes.
+    Returns:
+        np.ndarray: Array with shape (3, n_samples): lower band, center, upper band.
+    """
+    if estimator not in ("median", "mean"):
+        raise NotImplementedError(estimator)
+    n_realizations, n_samples = errors.shape
+    p_low, p_high = errorbar_data
+    # Percentiles are taken from one sort along the realization axis,
+    # with the same interpolation as np.percentile.
+    q = np.array([p_low, 50, p_high]) / 100 * (n_realizations - 1)
+    low = np.floor(q).astype(np.int64)
+    high = np.minimum(low + 1, n_realizations - 1)
+    fraction = (q - low)[:, None]
+
+    result = np.empty((3, n_samples))
+    step = max(1, chunk_bytes // (8 * max(n_realizations, 1)))
+    for start in range(0, n_samples, step):
+        block = np.sort(
+            np.asarray(errors[:, start : start + step], dtype=float), axis=0
+        )
+        chunk = lerp(block[low], block[high], fraction)
+        chunk[:, np.isnan(block[-1])] = np.nan
+        if estimator == "mean":
+            chunk[1] = block.mean(axis=0)
+        result[:, start : start + step] = chunk
+    return result
+
+
+def downsample_band(
+    t: np.ndarray, band: np.ndarray, method: str | None, max_points: int
+) -> np.ndarray:
+    """
+    Select the points of a band to draw.
+
+    Parameters:
+        t (np.ndarray): Time of every sample.
+        band (np.ndarray): Lower band, center and upper band, shape (3, n_samples).
+        method (str | None): "minmax" keeps the extremes of the band edges and
+                             of the center, "lttb" keeps the shape of the center,
+                             None keeps all points.
+        max_points (int): Approximate maximum number of drawn points.
+    Returns:
+        np.ndarray: Sorted indices of the drawn samples.
+    """
+    n = band.shape[1]
+    if method is None or n <= max_points:
+        return np.arange(n)
+    if method == "minmax":
+        # The union of three selections stays within the budget.
+        budget = max(4, max_points // 3)
+        return np.unique(np.concatenate([minmax(row, budget) for row in band]))
+    if method == "lttb":
+        return lttb(t, band[1], max_points)
+    raise ValueError(f"Unknown downsampling method '{method}'")
+
+
+def errorbandplot(
+    errors: dict[str, np.ndarray],
+    t: np.ndarray | None = None,
+    estimator: str = "median",
+    errorbar_data: tuple = (5, 95),
+    styles: dict | None = None,
+    logy: bool = False,
+    downsample: str | None = "minmax",
+    max_points: int = 4000,
+    band_alpha: float = 0.25,
+    x_label: str | None = None,
+    y_label: str | None = None,
+    title: str | None = None,
+    axes_fontsize: int = 22,
+    title_fontsize: int = 24,
+    ax: matplotlib.axes.Axes | None = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    **kwargs,
+) -> matplotlib.axes.Axes:
+    """
+    Plot per-sample errors of many signal realizations as a center line with a band.
+
+    For every method the center (median or mean) and the percentile band of
+    the errors are computed over the realizations for every time sample,
+    see `error_quantiles`. Long traces are downsampled before drawing,
+    so that a million samples draw as fast as a few thousand.
+
+    Parameters:
+        errors(dict[str, np.ndarray]): Mapping from method labels to error arrays
+            with shape (n_realizations, n_samples), e.g. squared errors
+            `(original_signals - signals) ** 2`. Memory-mapped arrays are read in blocks.
+
+        t(np.ndarray or None, default=None): Time of every sample.
+            If None, the sample index is used.
+
+        estimator(str, default="median"): Central line, "median" or "mean".
+
+        errorbar_data(tuple, default=(5, 95)): Lower and upper percentiles of the band.
+
+        styles(dict or None, default=None): Optional mapping from labels to Matplotlib
+            line styles. The band is filled with the color of the line.
+
+        logy(bool, default=False): If True, use a logarithmic scale for the y-axis.
+
+        downsample(str or None, default="minmax"): Downsampling of long traces,
+            "minmax", "lttb" or None, see `downsample_band`.
+
+        max_points(int, default=4000): Approximate number of drawn points per trace.
+
+        band_alpha(float, default=0.25): Opacity of the bands.
+
+        x_label(str): Label for the x-axis. If None: the localized default value is used.
+            If "": the label is not displayed.
+
+        y_label(str): Label for the y-axis. If None: the localized default value is used.
+            If "": the label is not displayed.
+
+        title(str): Plot title. If None: the localized default value is used.
+            If "": the title is not displayed.
+
+        axes_fontsize(int, default=22): Font size for axis labels and legend.
+
+        title_fontsize(int, default=24): Font size for the plot title.
+
+        ax(matplotlib.axes.Axes or None, default=None): Existing Matplotlib axes to draw on.
+
+        chunk_bytes(int): Approximate size of the blocks read from the error arrays.
+
+        **kwargs: Keyword arguments passed to `ax.plot` of every center line.
+
+    Returns:
+        matplotlib.axes.Axes: The axes object containing the plot.
+
+    Usage example:
+    >>> errors = {label: (original_signals - s) ** 2 for label, s in signals.items()}
+    >>> ax = errorbandplot(errors, errorbar_data=(25, 75))
+    """
+    if ax is None:
+        _, ax = subplots(figsize=(12, 4))
+    if x_label is None:
+        x_label = get_text("x_label_time")
+    if y_label is None:
+        y_label = get_text("y_label_error")
+    if title is None:
+        title = get_text("title_error_vs_time")
+
+    for label, values in errors.items():
+        band = error_quantiles(values, estimator, errorbar_data, chunk_bytes)
+        time = np.arange(band.shape[1]) if t is None else np.asarray(t)
+        index = downsample_band(time, band, downsample, max_points)
+        style = styles.get(label, {}) if styles else {}
+        (line,) = ax.plot(time[index], band[1, index], label=label, **style, **kwargs)
+        ax.fill_between(
+            time[index],
+            band[0, index],
+            band[2, index],
+            color=line.get_color(),
+            alpha=band_alpha,
+            linewidth=0,
+        )
+
+    ax.legend(fontsize=axes_fontsize)
+    if logy:
+        ax.set_yscale("log")
+    if x_label != "":
+        ax.set_xlabel(x_label, fontsize=axes_fontsize)
+    if y_label != "":
+        ax.set_ylabel(y_label, fontsize=axes_fontsize)
+    if title != "":
+        ax.set_title(title, fontsize=title_fontsize)
+    ax.grid(True)
+    return ax
@@ -0,0 +1,180 @@
+"""Faceted MSE plotting"""
+
+import numpy as np
+import pandas as pd
+
+from ..config import get_text
+from ..core.aggregation import aggregate_groups
+from ._figure import subplots
+
+
+def _facet_title(row: str | None, col: str | None, key: dict) -> str:
+    """
+    Build the title of a panel from its facet values.
+    """
+    parts = [f"{name} = {key[name]}" for name in (row, col) if name is not None]
+    return " | ".join(parts)
+
+
+def mse_facetplot(
+    data: pd.DataFrame,
+    x: str,
+    y: str,
+    hue: str | None = None,
+    row: str | None = None,
+    col: str | None = None,
+    estimator: str = "median",
+    errorbar_type: str = "p",
+    errorbar_data: tuple = (5, 95),
+    styles: dict | None = None,
+    logy: bool = True,
+    y_lim: tuple | None = None,
+    x_label: str | None = None,
+    y_label: str | None = None,
+    sharex: bool = True,
+    sharey: bool = True,
+    axes_fontsize: int = 18,
+    title_fontsize: int = 20,
+    panel_size: tuple = (5, 4),
+    **kwargs,
+):
+    """
+    Plot a grid of MSE curves with one panel per combination of facet values.
+
+    The aggregation for all (row, col, hue, x) combinations is computed with
+    a single groupby, after which every panel is drawn from the precomputed
+    table. The panels share the axes and a single legend.
+
+    Parameters:
+        data(pandas.DataFrame): Input data containing experimental results.
+
+        x(str): Name of the column used as the independent variable
+            (e.g., signal-to-noise ratio).
+
+        y(str): Name of the column containing the error metric.
+
+        hue(str, default=None): Name of the column used to group the data
+            into separate curves within a panel.
+
+        row(str, default=None): Name of the column defining the panel rows.
+
+        col(str, default=None): Name of the column defining the panel columns.
+
+        estimator(str, default="median"): "mean" or "median".
+
+        errorbar_type(str, default="p"): Type of error bars, "p" for percentiles.
+
+        errorbar_data(tuple, default=(5, 95)): Lower and upper percentiles.
+
+        styles(dict or None, default=None): Mapping from hue values to Matplotlib styles.
+
+        logy(bool, default=True): If True, use a logarithmic scale for the y-axis.
+
+        y_lim(tuple or None, default=None): Optional limits for the y-axis.
+
+        x_label(str): Label for the x-axis of the bottom panels. Note:
+            If None: the localized default value is used.
+            If "": the label is not displayed.
+
+        y_label(str): Label for the y-axis of the left panels. Note:
+            If None: the localized default value is used.
+            If "": the label is not displayed.
+
+        sharex(bool, default=True): Share the x-axis between panels.
+
+        sharey(bool, default=True): Share the y-axis between panels.
+
+        axes_fontsize(int, default=18): Font size for axis labels and legend.
+
+        title_fontsize(int, default=20): Font size for the panel titles.
+
+        panel_size(tuple, default=(5, 4)): Size of a single panel in inches.
+
+        **kwargs: Keyword arguments passed to `ax.errorbar`.
+
+    Returns:
+        fig (matplotlib.figure.Figure): Figure object containing the grid.
+        axes (np.ndarray): 2-D array of axes with shape (n_rows, n_cols).
+    """
+    if styles is None:
+        styles = {}
+    if x_label is None:
+        x_label = get_text("x_label_snr")
+    if y_label is None:
+        y_label = get_text("y_label_mse")
+
+    facets = [name for name in (row, col) if name is not None]
+    by = list(dict.fromkeys(facets + ([hue] if hue is not None else []) + [x]))
+    table = aggregate_groups(
+        data,
+        by,
+        y,
+        estimator=estimator,
+        errorbar_type=errorbar_type,
+        errorbar_data=errorbar_data,
+    )
+
+    row_levels = np.sort(data[row].unique()) if row is not None else [None]
+    col_levels = np.sort(data[col].unique()) if col is not None else [None]
+    hue_levels = data[hue].unique() if hue is not None else [None]
+    n_rows, n_cols = len(row_levels), len(col_levels)
+    fig, axes = subplots(
+        n_rows,
+        n_cols,
+        sharex=sharex,
+        sharey=sharey,
+        squeeze=False,
+        figsize=(panel_size[0] * n_cols, panel_size[1] * n_rows),
+    )
+
+    panels = dict(iter(table.groupby(facets, sort=False))) if facets else {(): table}
+    handles = {}
+    for i, row_value in enumerate(row_levels):
+        for j, col_value in enumerate(col_levels):
+            ax = axes[i, j]
+            key = tuple(
+                value
+                for name, value in ((row, row_value), (col, col_value))
+                if name is not None
+            )
+            panel = panels.get(key)
+            if panel is not None:
+                curves = dict(iter(panel.groupby(hue, sort=False))) if hue else {}
+                for hue_value in hue_levels:
+                    curve = curves.get(hue_value) if hue else panel
+                    if curve is None:
+                        continue
+                    container = ax.errorbar(
+                        curve[x].to_numpy(),
+                        curve["center"].to_numpy(),
+                        yerr=curve[["err_low", "err_high"]].to_numpy().T,
+                        label=hue_value,
+                        **styles.get(hue_value, {}),
+                        **kwargs,
+                    )
+                    handles.setdefault(hue_value, container)
+
+            if logy:
+                ax.set_yscale("log")
+            if y_lim:
+                ax.set_ylim(y_lim)
+            if facets:
+                ax.set_title(
+                    _facet_title(row, col, {row: row_value, col: col_value}),
+                    fontsize=title_fontsize,
+                )
+            if i == n_rows - 1 and x_label != "":
+                ax.set_xlabel(x_label, fontsize=axes_fontsize)
+            if j == 0 and y_label != "":
+                ax.set_ylabel(y_label, fontsize=axes_fontsize)
+            ax.grid(True)
+
+    if hue is not None:
+        fig.legend(
+            handles=list(handles.values()),
+            labels=[str(value) for value in handles],
+            fontsize=axes_fontsize,
+            loc="lower center",
+            ncol=len(handles),
+        )
+    return fig, axes
@@ -0,0 +1,332 @@
+"""Live-updating MSE plotting"""
+
+import inspect
+
+import matplotlib
+import numpy as np
+import pandas as pd
+from matplotlib.container import ErrorbarContainer
+
+from .mse import _draw_curve, mseplot
+
+# Number of candidate values selected from directly by `_GroupStats.kth`.
+_SELECT_WINDOW = 4096
+
+
+class _GroupStats:
+    """
+    Values of one (hue, x) group as sorted chunks with a running sum.
+
+    New values are added as a sorted chunk. Chunks are merged when a chunk
+    is at least as large as the previous one, so there are O(log n) chunks
+    and every value takes part in O(log n) merges. Order statistics are
+    selected across the chunks by binary searches, without merging them.
+    """
+
+    def __init__(self):
+        self.chunks: list[np.ndarray] = []
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, values: np.ndarray) -> None:
+        """
+        Add new values as a sorted chunk and merge chunks of similar size.
+        """
+        if len(values) == 0:
+            return
+        self.chunks.append(np.sort(values))
+        self.count += len(values)
+        self.total += values.sum()
+        while len(self.chunks) > 1 and len(self.chunks[-2]) <= len(self.chunks[-1]):
+            last = self.chunks.pop()
+            previous = self.chunks.pop()
+            positions = np.searchsorted(previous, last)
+            self.chunks.append(np.insert(previous, positions, last))
+
+    def kth(self, k: int) -> float:
+        """
+        The k-th smallest value (0-based) of all chunks.
+        """
+        low = [0] * len(self.chunks)
+        high = [len(chunk) for chunk in self.chunks]
+        # The values before `low` are smaller and the values from `high` on are
+        # larger than the result; narrow the windows until they are small.
+        while sum(high) - sum(low) > _SELECT_WINDOW:
+            # Halve the largest window with its middle value as pivot.
+            i = max(range(len(self.chunks)), key=lambda j: high[j] - low[j])
+            pivot = self.chunks[i][(low[i] + high[i]) // 2]
+            less = [np.searchsorted(chunk, pivot, "left") for chunk in self.chunks]
+            not_greater = [
+                np.searchsorted(chunk, pivot, "right") for chunk in self.chunks
+            ]
+            if sum(less) <= k < sum(not_greater):
+                return pivot
+            if k < sum(less):
+                high = [min(h, n) for h, n in zip(high, less)]
+            else:
+                low = [max(lo, n) for lo, n in zip(low, not_greater)]
+        window = np.concatenate(
+            [chunk[lo:h] for chunk, lo, h in zip(self.chunks, low, high)]
+        )
+        return np.partition(window, k - sum(low))[k - sum(low)]
+
+    def percentile(self, q: float) -> float:
+        """
+        Percentile with linear interpolation, same as `np.percentile`.
+        """
+        position = q / 100 * (self.count - 1)
+        low = int(np.floor(position))
+        high = min(low + 1, self.count - 1)
+        fraction = position - low
+        low_value = self.kth(low)
+        if fraction == 0:
+            return low_value
+        return low_value + fraction * (self.kth(high) - low_value)
+
+    def summary(self, estimator: str, errorbar_data: tuple) -> tuple:
+        """
+        Compute the central value and the asymmetric errors.
+        """
+        if estimator == "median":
+            center = self.percentile(50)
+        elif estimator == "mean":
+            center = self.total / self.count
+        else:
+            raise NotImplementedError(estimator)
+        p_low, p_high = errorbar_data
+        return (
+            center,
+            center - self.percentile(p_low),
+            self.percentile(p_high) - center,
+        )
+
+
+class LiveMSEPlot:
+    """
+    MSE plot that is updated in place when new results arrive.
+
+    The initial figure is drawn with `mseplot`. Afterwards, `update` merges
+    appended rows into per-(hue, x) groups, recomputes the aggregates of the
+    affected groups only and moves the data of the existing curve artists,
+    so that the cost of a refresh grows with the new data, and only
+    logarithmically with the data received before.
+
+    Usage example:
+    >>> live = LiveMSEPlot(df, x="snr", y="mse", hue="label", styles=styles)
+    >>> artists = live.update(new_rows)
+    >>> live.redraw()
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        x: str,
+        y: str,
+        hue: str = None,
+        estimator: str = "median",
+        errorbar_type: str = "p",
+        errorbar_data: tuple = (5, 95),
+        styles: dict | None = None,
+        logy: bool = True,
+        axes_fontsize: int = 22,
+        ax: matplotlib.axes.Axes | None = None,
+        **kwargs,
+    ):
+        """
+        Parameters:
+            data (pandas.DataFrame): Initial experimental results.
+            x (str): Name of the column used as the independent variable.
+            y (str): Name of the column containing the error metric.
+            hue (str, default=None): Name of the column used to group the data into curves.
+            estimator (str, default="median"): "mean" or "median".
+            errorbar_type (str, default="p"): Only "p" (percentiles) is supported.
+            errorbar_data (tuple, default=(5, 95)): Lower and upper percentiles.
+            styles (dict or None, default=None): Mapping from hue values to Matplotlib styles.
+            logy (bool, default=True): If True, use a logarithmic scale for the y-axis.
+            axes_fontsize (int, default=22): Font size for axis labels and legend.
+            ax (matplotlib.axes.Axes or None, default=None): Existing axes to draw on.
+            **kwargs: Other arguments of `mseplot`, e.g. labels or `capsize`.
+        """
+        if errorbar_type != "p":
+            raise NotImplementedError(errorbar_type)
+        self.x = x
+        self.y = y
+        self.hue = hue
+        self.estimator = estimator
+        self.errorbar_data = errorbar_data
+        self.styles = styles if styles else {}
+        self.axes_fontsize = axes_fontsize
+        # Options of the curves drawn for new hue values, as in `mseplot`.
+        self._curve_options = (
+            kwargs.get("errorbar_style", "bars"),
+            kwargs.get("band_alpha", 0.25),
+            kwargs.get("max_markers"),
+            kwargs.get("raster_policy"),
+        )
+        mseplot_parameters = inspect.signature(mseplot).parameters
+        self._curve_kwargs = {
+            key: value for key, value in kwargs.items() if key not in mseplot_parameters
+        }
+        self._groups: dict[tuple, _GroupStats] = {}
+        self._stats: dict = {}
+        self._corners: dict = {}
+        # Artists of every curve by hue value, as drawn by `mseplot`.
+        self._curves: dict = {}
+
+        self.ax = mseplot(
+            data,
+            x,
+            y,
+            hue=hue,
+            estimator=estimator,
+            errorbar_type=errorbar_type,
+            errorbar_data=errorbar_data,
+            styles=styles,
+            logy=logy,
+            axes_fontsize=axes_fontsize,
+            ax=ax,
+            curve_artists=self._curves,
+            **kwargs,
+        )
+        self._merge(data)
+
+    @property
+    def artists(self) -> list:
+        """
+        All artists representing the data, e.g. for blitting.
+        """
+        artists = []
+        for curve in self._curves.values():
+            artists.extend(self._curve_artists(curve))
+        return artists
+
+    @staticmethod
+    def _curve_artists(curve) -> list:
+        """
+        Artists of a curve: the lines of an errorbar container or the line and band.
+        """
+        if isinstance(curve, ErrorbarContainer):
+            data_line, caplines, barlinecols = curve.lines
+            return [data_line, *caplines, *barlinecols]
+        return list(curve)
+
+    def _merge(self, rows: pd.DataFrame) -> set:
+        """
+        Merge rows into the groups and refresh aggregates of the affected groups.
+
+        Returns:
+            set: Affected hue values.
+        """
+        keys = [self.hue, self.x] if self.hue is not None else [self.x]
+        affected = set()
+        for key, values in rows.groupby(keys, sort=False)[self.y]:
+            hue_value, x_value = key if self.hue is not None else (None, key[0])
+            group = self._groups.setdefault((hue_value, x_value), _GroupStats())
+            group.add(values.to_numpy(dtype=float))
+            self._stats.setdefault(hue_value, {})[x_value] = group.summary(
+                self.estimator, self.errorbar_data
+            )
+            affected.add(hue_value)
+        return affected
+
+    def update(self, rows: pd.DataFrame) -> list:
+        """
+        Append result rows and update the artists of the affected curves.
+
+        Parameters:
+            rows (pandas.DataFrame): New rows with the same columns as the initial data.
+        Returns:
+            list: Artists whose data changed.
+        """
+        changed = []
+        for hue_value in self._merge(rows):
+            stats = self._stats[hue_value]
+            x_values = np.sort(np.array(list(stats.keys())))
+            center, err_low, err_high = np.array([stats[v] for v in x_values]).T
+            curve = self._curves.get(hue_value)
+            if curve is None:
+                curve = self._add_curve(hue_value, x_values, center, err_low, err_high)
+            else:
+                self._set_curve_data(curve, x_values, center, err_low, err_high)
+            changed.extend(self._curve_artists(curve))
+            self._corners.pop(hue_value, None)
+        return changed
+
+    def _add_curve(self, hue_value, x_values, center, err_low, err_high):
+        """
+        Draw a curve for a hue value that was not present before.
+        """
+        _, curve = _draw_curve(
+            self.ax,
+            x_values,
+            center,
+            np.vstack([err_low, err_high]),
+            {
+                "label": hue_value,
+                **self.styles.get(hue_value, {}),
+                **self._curve_kwargs,
+            },
+            *self._curve_options,
+        )
+        self._curves[hue_value] = curve
+        if self.hue is not None:
+            self.ax.legend(fontsize=self.axes_fontsize)
+        return curve
+
+    @staticmethod
+    def _set_curve_data(curve, x_values, center, err_low, err_high):
+        """
+        Move the data of the artists of a curve in place.
+        """
+        low = center - err_low
+        high = center + err_high
+        if not isinstance(curve, ErrorbarContainer):
+            line, band = curve
+            line.set_data(x_values, center)
+            band.set_data(x_values, low, high)
+            return
+        data_line, caplines, barlinecols = curve.lines
+        data_line.set_data(x_values, center)
+        if len(caplines) == 2:
+            caplines[0].set_data(x_values, high)
+            caplines[1].set_data(x_values, low)
+        segments = np.stack(
+            [np.column_stack([x_values, low]), np.column_stack([x_values, high])],
+            axis=1,
+        )
+        for collection in barlinecols:
+            collection.set_segments(segments)
+
+    def _corner_points(self, hue_value, stats: dict) -> np.ndarray:
+        """
+        Lower and upper error bar ends of a curve, cached until its next update.
+        """
+        if hue_value not in self._corners:
+            x_values = np.array(list(stats.keys()), dtype=float)
+            center, err_low, err_high = np.array(list(stats.values())).T
+            self._corners[hue_value] = np.concatenate(
+                [
+                    np.column_stack([x_values, center - err_low]),
+                    np.column_stack([x_values, center + err_high]),
+                ]
+            )
+        return self._corners[hue_value]
+
+    def redraw(self, autoscale: bool = True) -> None:
+        """
+        Request a redraw of the figure.
+
+        Parameters:
+            autoscale (bool, default=True): Recompute the axis limits from the
+                current aggregates. Disable it to keep the limits fixed, e.g. for blitting.
+        """
+        if autoscale:
+            # Only the corners of the curves changed since the last redraw are rebuilt.
+            corners = [
+                self._corner_points(hue_value, stats)
+                for hue_value, stats in self._stats.items()
+            ]
+            self.ax.relim()
+            self.ax.update_datalim(np.concatenate(corners))
+            self.ax.autoscale_view()
+        self.ax.figure.canvas.draw_idle()
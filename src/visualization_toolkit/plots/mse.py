@@ -1,15 +1,36 @@
 """MSE plotting"""
 
+from typing import Callable
+
 import matplotlib
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
-from ..config import get_text
+from ..config import config, get_text
 from ..core.aggregation import aggregate
+from ..core.summary import Summary
+from ._figure import subplots
+from ._raster import apply_errorbar_policy
+from ._significance_boxplot import significance_levels_asterisk
+from .templates import TemplatePool, layout_key
+
+
+def _aggregate(data, x, y, estimator, errorbar_type, errorbar_data) -> tuple:
+    """
+    Aggregate the data of one curve.
+    """
+    return aggregate(
+        data,
+        x,
+        y,
+        estimator=estimator,
+        errorbar_type=errorbar_type,
+        errorbar_data=errorbar_data,
+    )
 
 
 def mseplot(
-    data: pd.DataFrame,
+    data: pd.DataFrame | Summary,
     x: str,
     y: str,
     hue: str = None,
@@ -25,6 +46,16 @@ def mseplot(
     axes_fontsize: int = 22,
     title_fontsize: int = 24,
     ax: matplotlib.axes.Axes | None = None,
+    raster_policy: dict | None = None,
+    significance_fn: Callable | str | None = None,
+    significance_levels: dict[float, str] | None = None,
+    significance_reference=None,
+    significance_marker_size: float = 60,
+    template_pool: TemplatePool | None = None,
+    errorbar_style: str = "bars",
+    band_alpha: float = 0.25,
+    max_markers: int | None = None,
+    curve_artists: dict | None = None,
     **kwargs,
 ) -> matplotlib.axes.Axes:
     """
@@ -35,8 +66,11 @@ def mseplot(
     using Matplotlib error bar plots.
 
     Parameters:
-        data(pandas.DataFrame): Input data containing experimental results.
+        data(pandas.DataFrame or Summary): Input data containing experimental results.
             Must include columns specified by `x`, `y`, and `hue`.
+            A `Summary` of the data with the aggregates for `estimator`,
+            `errorbar_type` and `errorbar_data` can be passed instead,
+            see `core.summary.summarize`.
 
         x(str): Name of the column used as the independent variable
             (e.g., noise level or signal-to-noise ratio).
@@ -83,62 +117,143 @@ def mseplot(
         title_fontsize(int, default=24): Font size for the plot title.
 
         ax(matplotlib.axes.Axes or None, default=None): Existing Matplotlib axes to draw on.
-            If None, a new figure and axes are created.
+            If None, a new figure and axes are created (without pyplot if
+            `config.pyplot_free` is active). Only this axes is modified.
+
+        raster_policy(dict or None, default=None): Rasterization policy for compact
+            vector outputs: markers and error bars of curves with more than
+            `min_points` points are rasterized. See `plots._raster` for the available keys.
+
+        significance_fn(callable, str or None, default=None): Function returning pairwise
+            comparisons of the hue levels within every x value, called with `data`,
+            e.g. `lambda d: compare_hue_within_groups(d, x, y, hue, reference=ref)`.
+            For a `Summary` the name of the stored significance results. Points of
+            curves that differ significantly from the reference curve are marked by
+            open circles, all marks are drawn as a single scatter artist. Only the
+            comparisons with the reference are drawn, other pairs are ignored; pass
+            `reference` to `compare_hue_within_groups` to test only these pairs.
+
+        significance_levels(dict or None, default=None): Mapping of p-value thresholds
+            to symbols, the more significant levels get larger marks.
+            If None, `significance_levels_asterisk` is used.
+
+        significance_reference(default=None): Hue value of the reference curve.
+            If None, the first curve is used.
+
+        significance_marker_size(float, default=60): Marker area of the least
+            significant level in points^2.
+
+        template_pool(TemplatePool or None, default=None): Pool of figure layouts.
+            If given and `ax` is None, the figure is reused from the pool;
+            return it with `template_pool.release(ax.figure)` instead of closing it.
+
+        errorbar_style(str, default="bars"): "bars" draws error bars with `ax.errorbar`,
+            "band" draws every curve as one line and one filled band between the
+            error bar limits, which keeps the number of artists independent of
+            the number of x values.
+
+        band_alpha(float, default=0.25): Opacity of the bands for `errorbar_style="band"`.
+
+        max_markers(int or None, default=None): Maximum number of markers drawn per
+            curve for `errorbar_style="band"`, the markers are thinned evenly.
+
+        curve_artists(dict or None, default=None): If given, filled with the artists of
+            every drawn curve by hue value (None without hue): the `ErrorbarContainer`
+            for `errorbar_style="bars"`, the line and the band for "band".
+            Rows with a missing hue value are not drawn.
 
     Returns:
         matplotlib.axes.Axes: The axes object containing the plot.
+
+    Usage example:
+    >>> ax = mseplot(df, "snr", "mse", "label", significance_reference="N",
+    ...              significance_fn=lambda d: compare_hue_within_groups(
+    ...                  d, "snr", "mse", "label", reference="N"))
     """
-    if ax is None:
-        _, ax = plt.subplots(figsize=(6, 6))
+    if significance_fn is not None and hue is None:
+        raise ValueError("Significance marks require hue")
+    if ax is None and template_pool is not None:
+        key = layout_key("mseplot", (6, 6), config.get_use_pyplot())
+        _, ax = template_pool.acquire(key, lambda: subplots(figsize=(6, 6)))
+    elif ax is None:
+        _, ax = subplots(figsize=(6, 6))
     if x_label is None:
         x_label = get_text("x_label_snr")
     if y_label is None:
         y_label = get_text("y_label_mse")
     if title is None:
         title = get_text("title_mse_vs_snr")
+    if isinstance(data, Summary):
+        data.check_columns(x, y, hue)
+        curves = data.curves(estimator, errorbar_type, errorbar_data)
+        if isinstance(significance_fn, str):
+            significance_fn = data.significance_fn(significance_fn)
+    elif hue is None:
+        curves = [
+            (None, *_aggregate(data, x, y, estimator, errorbar_type, errorbar_data))
+        ]
+    else:
+        # One split of the data, in the order of the first appearance of every hue.
+        curves = [
+            (
+                hue_value,
+                *_aggregate(part, x, y, estimator, errorbar_type, errorbar_data),
+            )
+            for hue_value, part in data.groupby(hue, sort=False, observed=True)
+        ]
+
+    if errorbar_style not in ("bars", "band"):
+        raise ValueError(f"Unknown errorbar style '{errorbar_style}'")
     if hue is None:
-        x_list, mse_values, mse_err = aggregate(
-            data,
-            x,
-            y,
-            estimator=estimator,
-            errorbar_type=errorbar_type,
-            errorbar_data=errorbar_data,
-        )
+        _, x_list, mse_values, mse_err = curves[0]
         hue_value = list(styles.keys())[0]
         style = styles.get(hue_value, {}) if styles else {}
-        ax.errorbar(
+        _, artist = _draw_curve(
+            ax,
             x_list,
             mse_values,
-            yerr=mse_err,
-            **style,
-            **kwargs,
+            mse_err,
+            {**style, **kwargs},
+            errorbar_style,
+            band_alpha,
+            max_markers,
+            raster_policy,
         )
+        if curve_artists is not None:
+            curve_artists[None] = artist
 
     else:
-        for hue_value in data[hue].unique():
-            x_list, mse_values, mse_err = aggregate(
-                data[(data[hue] == hue_value)],
-                x,
-                y,
-                estimator=estimator,
-                errorbar_type=errorbar_type,
-                errorbar_data=errorbar_data,
-            )
+        colors = []
+        for hue_value, x_list, mse_values, mse_err in curves:
             style = styles.get(hue_value, {}) if styles else {}
-
-            ax.errorbar(
+            color, artist = _draw_curve(
+                ax,
                 x_list,
                 mse_values,
-                yerr=mse_err,
-                label=hue_value,
-                **style,
-                **kwargs,
+                mse_err,
+                {"label": hue_value, **style, **kwargs},
+                errorbar_style,
+                band_alpha,
+                max_markers,
+                raster_policy,
             )
+            colors.append(color)
+            if curve_artists is not None:
+                curve_artists[hue_value] = artist
         ax.legend(fontsize=axes_fontsize)
+        if significance_fn is not None:
+            add_curve_significance(
+                ax,
+                significance_fn(data),
+                curves,
+                colors,
+                significance_reference,
+                significance_levels or significance_levels_asterisk,
+                significance_marker_size,
+            )
 
     if logy:
-        plt.yscale("log")
+        ax.set_yscale("log")
     if y_lim:
         ax.set_ylim(y_lim)
     if x_label != "":
@@ -149,3 +264,132 @@ def mseplot(
         ax.set_title(title, fontsize=title_fontsize)
     ax.grid(True)
     return ax
+
+
+# Keyword arguments of `ax.errorbar` that `ax.plot` does not accept.
+_ERRORBAR_KWARGS = (
+    "ecolor",
+    "elinewidth",
+    "capsize",
+    "capthick",
+    "barsabove",
+    "lolims",
+    "uplims",
+    "xlolims",
+    "xuplims",
+    "errorevery",
+)
+
+
+def _draw_curve(
+    ax: matplotlib.axes.Axes,
+    x_list,
+    values,
+    errors,
+    kwargs: dict,
+    errorbar_style: str,
+    band_alpha: float,
+    max_markers: int | None,
+    raster_policy: dict | None,
+):
+    """
+    Draw one aggregated curve with error bars or an error band.
+
+    Returns:
+        tuple: The color of the curve and its artists, the `ErrorbarContainer`
+               for "bars" or a tuple of the line and the band for "band".
+    """
+    if errorbar_style == "bars":
+        container = ax.errorbar(x_list, values, yerr=errors, **kwargs)
+        apply_errorbar_policy(container, raster_policy)
+        return container.lines[0].get_color(), container
+
+    kwargs = {k: v for k, v in kwargs.items() if k not in _ERRORBAR_KWARGS}
+    fmt = kwargs.pop("fmt", "")
+    if max_markers is not None and len(x_list) > max_markers:
+        kwargs.setdefault("markevery", -(-len(x_list) // max_markers))
+    values = np.asarray(values, dtype=float)
+    errors = np.asarray(errors, dtype=float)
+    (line,) = ax.plot(x_list, values, fmt, **kwargs)
+    band = ax.fill_between(
+        x_list,
+        values - errors[0],
+        values + errors[1],
+        color=line.get_color(),
+        alpha=band_alpha,
+        linewidth=0,
+    )
+    return line.get_color(), (line, band)
+
+
+def add_curve_significance(
+    ax: matplotlib.axes.Axes,
+    sig_df: pd.DataFrame,
+    curves: list[tuple],
+    colors: list,
+    reference,
+    levels: dict[float, str],
+    marker_size: float = 60,
+):
+    """
+    Mark the points of curves that differ significantly from a reference curve.
+
+    The comparisons with the reference are matched to the curve points by one
+    merge and drawn as a single scatter artist, so hundreds of x values with
+    many curves are annotated at once. Comparisons between two other curves
+    are ignored.
+
+    Parameters:
+        ax (matplotlib.axes.Axes): The axes with the curves.
+        sig_df (pd.DataFrame): Comparisons with columns "x", "hue1", "hue2"
+                               and "pvalue", see `compare_hue_within_groups`.
+        curves (list[tuple]): (hue value, x values, centers, errors) of every curve.
+        colors (list): Color of every curve.
+        reference: Hue value of the reference curve, None for the first curve.
+        levels (dict): Mapping of p-value thresholds to symbols.
+        marker_size (float): Marker area of the least significant level.
+
+    Returns:
+        matplotlib.collections.PathCollection or None: The marks, None if no
+        point differs significantly.
+    """
+    if reference is None:
+        reference = curves[0][0]
+    if sig_df.empty:
+        return None
+    is_first = sig_df["hue1"] == reference
+    is_second = sig_df["hue2"] == reference
+    compared = pd.DataFrame(
+        {
+            "x": sig_df["x"],
+            "hue": sig_df["hue2"].where(is_first, sig_df["hue1"]),
+            "pvalue": sig_df["pvalue"].to_numpy(dtype=float),
+        }
+    )[(is_first | is_second).to_numpy()]
+
+    points = pd.concat(
+        [
+            pd.DataFrame(
+                {"x": x_list, "hue": hue_value, "center": centers, "curve": index}
+            )
+            for index, (hue_value, x_list, centers, _) in enumerate(curves)
+        ],
+        ignore_index=True,
+    )
+    marks = points.merge(compared, on=["x", "hue"])
+    thresholds = np.array(sorted(levels))
+    # Index of the first threshold not below p, len(thresholds) if not significant.
+    level = np.searchsorted(thresholds, marks["pvalue"].to_numpy(), side="left")
+    significant = level < len(thresholds)
+    if not significant.any():
+        return None
+    marks = marks[significant]
+    return ax.scatter(
+        marks["x"].to_numpy(),
+        marks["center"].to_numpy(),
+        s=marker_size * (len(thresholds) - level[significant]),
+        facecolors="none",
+        edgecolors=[colors[i] for i in marks["curve"]],
+        linewidths=1.5,
+        zorder=3,
+    )
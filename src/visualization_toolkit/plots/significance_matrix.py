@@ -0,0 +1,182 @@
+"""Pairwise significance matrix plotting"""
+
+import matplotlib
+import numpy as np
+import pandas as pd
+from matplotlib.colors import BoundaryNorm, ListedColormap
+
+from ._figure import subplots
+
+
+def pvalue_matrix(
+    sig_df: pd.DataFrame,
+    first: str,
+    second: str,
+    order: list | None = None,
+) -> tuple[list, np.ndarray]:
+    """
+    Build a symmetric matrix of p-values from pairwise comparison results.
+
+    Parameters:
+        sig_df (pd.DataFrame): Comparison results with a "pvalue" column.
+        first (str): Column of the first level of every pair, e.g. "x1" or "hue1".
+        second (str): Column of the second level of every pair, e.g. "x2" or "hue2".
+        order (list | None): Order of the levels. If None, the sorted union
+                             of the compared levels is used.
+    Returns:
+        tuple: The levels and the (n_levels, n_levels) matrix of p-values,
+               NaN for pairs without a comparison.
+    """
+    if order is None:
+        order = np.sort(pd.unique(sig_df[[first, second]].to_numpy().ravel()))
+    order = list(order)
+    rows = pd.Categorical(sig_df[first], categories=order).codes
+    cols = pd.Categorical(sig_df[second], categories=order).codes
+    known = (rows >= 0) & (cols >= 0)
+    rows, cols = rows[known], cols[known]
+    pvalues = sig_df["pvalue"].to_numpy(dtype=float)[known]
+
+    matrix = np.full((len(order), len(order)), np.nan)
+    matrix[rows, cols] = pvalues
+    matrix[cols, rows] = pvalues
+    return order, matrix
+
+
+def _draw_matrix(
+    ax: matplotlib.axes.Axes,
+    order: list,
+    matrix: np.ndarray,
+    cmap,
+    norm,
+    max_tick_labels: int,
+    axes_fontsize: int,
+):
+    """
+    Draw one matrix as a single image on a given axis.
+    """
+    image = ax.imshow(matrix, cmap=cmap, norm=norm, interpolation="nearest")
+    if len(order) <= max_tick_labels:
+        ticks = np.arange(len(order))
+        ax.set_xticks(ticks, [str(level) for level in order], rotation=90)
+        ax.set_yticks(ticks, [str(level) for level in order])
+        ax.tick_params(axis="both", labelsize=axes_fontsize - 4)
+    else:
+        ax.set_xticks([])
+        ax.set_yticks([])
+    return image
+
+
+def significance_heatmap(
+    sig_df: pd.DataFrame,
+    levels: dict | None = None,
+    order: list | None = None,
+    cmap: str = "viridis",
+    vmax: float | None = None,
+    title: str | None = None,
+    axes_fontsize: int = 14,
+    title_fontsize: int = 16,
+    panel_size: tuple = (6, 5),
+    ncols: int | None = None,
+    max_tick_labels: int = 50,
+):
+    """
+    Plot pairwise significance results as heatmaps of the p-value matrix.
+
+    Unlike the brackets of `add_significance`, every matrix is drawn as a
+    single image, so a comparison of hundreds of methods stays readable and
+    is drawn in a fraction of a second.
+
+    Parameters:
+        sig_df (pd.DataFrame): Output of `compare_hue_within_groups`
+                               (one panel per "x" value) or of
+                               `compare_all_pairs` (a single panel).
+        levels (dict | None): Dictionary mapping p-value thresholds to symbols,
+                              e.g. {0.001: '***', 0.01: '**', 0.05: '*'}.
+                              If given, the cells are colored by significance level,
+                              otherwise by -log10(p).
+        order (list | None): Order of the compared levels. If None, the sorted
+                             union of the compared levels is used.
+        cmap (str): Name of the colormap.
+        vmax (float | None): Upper limit of -log10(p) for the colormap,
+                             by default the largest value. Ignored if `levels` is given.
+        title (str | None): Title of the figure.
+        axes_fontsize (int): Font size of the tick labels and panel titles.
+        title_fontsize (int): Font size of the figure title.
+        panel_size (tuple): Size (width, height) in inches of every panel.
+        ncols (int | None): Number of panel columns. If None, the panels are
+                            placed in a single row.
+        max_tick_labels (int): Maximum number of levels for which tick labels
+                               are drawn.
+
+    Returns:
+        fig (matplotlib.figure.Figure): Figure object containing the plot.
+        axes (np.ndarray): Flat array of the axes of the panels.
+
+    Usage example:
+    >>> sig_df = compare_hue_within_groups(df, x="snr", y="mse", hue="method")
+    >>> fig, axes = significance_heatmap(sig_df, levels={0.001: "***", 0.01: "**", 0.05: "*"})
+    """
+    if sig_df.empty:
+        raise ValueError("No comparisons to plot")
+    if {"hue1", "hue2"}.issubset(sig_df.columns):
+        panels = [(x_val, group) for x_val, group in sig_df.groupby("x", sort=True)]
+        first, second = "hue1", "hue2"
+    else:
+        panels = [(None, sig_df)]
+        first, second = "x1", "x2"
+    if order is None:
+        order = np.sort(pd.unique(sig_df[[first, second]].to_numpy().ravel()))
+    matrices = [pvalue_matrix(group, first, second, order)[1] for _, group in panels]
+
+    if levels:
+        thresholds = np.array(sorted(levels))
+        labels = [levels[thr] for thr in thresholds] + ["ns"]
+        # Index of the first threshold not below p, len(thresholds) for "ns".
+        matrices = [
+            np.where(
+                np.isnan(matrix),
+                np.nan,
+                np.searchsorted(thresholds, np.nan_to_num(matrix), side="left"),
+            )
+            for matrix in matrices
+        ]
+        colors = matplotlib.colormaps[cmap](np.linspace(1, 0, len(labels)))
+        colormap = ListedColormap(colors)
+        norm = BoundaryNorm(np.arange(len(labels) + 1) - 0.5, len(labels))
+    else:
+        matrices = [-np.log10(matrix) for matrix in matrices]
+        if vmax is None:
+            finite = [m[np.isfinite(m)] for m in matrices]
+            vmax = max((m.max() for m in finite if m.size), default=1.0)
+        colormap = matplotlib.colormaps[cmap]
+        norm = matplotlib.colors.Normalize(vmin=0, vmax=vmax)
+
+    ncols = len(panels) if ncols is None else min(ncols, len(panels))
+    nrows = -(-len(panels) // ncols)
+    fig, axes = subplots(
+        nrows,
+        ncols,
+        figsize=(panel_size[0] * ncols, panel_size[1] * nrows),
+        squeeze=False,
+    )
+    fig.set_layout_engine("constrained")
+    axes = axes.ravel()
+    for ax, (x_val, _), matrix in zip(axes, panels, matrices):
+        image = _draw_matrix(
+            ax, list(order), matrix, colormap, norm, max_tick_labels, axes_fontsize
+        )
+        if x_val is not None:
+            ax.set_title(str(x_val), fontsize=axes_fontsize)
+    for ax in axes[len(panels) :]:
+        ax.set_visible(False)
+    axes = axes[: len(panels)]
+
+    colorbar = fig.colorbar(image, ax=list(axes))
+    if levels:
+        colorbar.set_ticks(np.arange(len(labels)), labels=labels)
+    else:
+        colorbar.set_label("-log10(p)", fontsize=axes_fontsize - 2)
+    colorbar.ax.tick_params(labelsize=axes_fontsize - 4)
+    if title is not None:
+        fig.suptitle(title, fontsize=title_fontsize)
+    return fig, axes
@@ -0,0 +1,157 @@
+"""Reusable figure templates for repeated same-layout renders"""
+
+import threading
+from collections import defaultdict
+from typing import Callable, Hashable
+
+import numpy as np
+from matplotlib.figure import Figure
+
+_AXES_ARTISTS = ("lines", "collections", "patches", "texts", "images", "tables")
+_FIGURE_ARTISTS = ("lines", "patches", "texts", "images", "legends", "artists")
+
+
+class _Template:
+    """
+    A figure with its axes and the state to restore before every reuse.
+    """
+
+    def __init__(self, key: Hashable, fig: Figure, axes):
+        self.key = key
+        self.fig = fig
+        self.axes = axes
+        # Artists created with the layout, e.g. the axis break markers, are kept.
+        self.fixed = {id(artist) for artist in self._artists()}
+        self.views = [
+            (
+                ax,
+                ax.get_xscale(),
+                ax.get_yscale(),
+                ax.get_autoscalex_on(),
+                ax.get_autoscaley_on(),
+                ax.get_xlim(),
+                ax.get_ylim(),
+            )
+            for ax in fig.axes
+        ]
+
+    def _artists(self):
+        for name in _FIGURE_ARTISTS:
+            yield from getattr(self.fig, name)
+        for ax in self.fig.axes:
+            for name in _AXES_ARTISTS:
+                yield from getattr(ax, name)
+            if ax.legend_ is not None:
+                yield ax.legend_
+
+    def reset(self) -> None:
+        """
+        Remove the data artists and restore the scales and view limits of the layout.
+        """
+        for ax in self.fig.axes:
+            for container in list(ax.containers):
+                container.remove()
+        for artist in list(self._artists()):
+            if id(artist) not in self.fixed:
+                artist.remove()
+        for ax, xscale, yscale, autoscalex, autoscaley, xlim, ylim in self.views:
+            # Data limits depend on the scale the artists are added with.
+            if ax.get_xscale() != xscale:
+                ax.set_xscale(xscale)
+            if ax.get_yscale() != yscale:
+                ax.set_yscale(yscale)
+            # Colors of the next render start from the beginning of the cycle.
+            ax.set_prop_cycle(None)
+            ax.set_title("")
+            ax.set_xlabel("")
+            ax.set_ylabel("")
+            # The data limits of the removed artists are forgotten on the next update.
+            ax.ignore_existing_data_limits = True
+            ax.set_autoscalex_on(autoscalex)
+            ax.set_autoscaley_on(autoscaley)
+            if not autoscalex:
+                ax.set_xlim(xlim)
+            if not autoscaley:
+                ax.set_ylim(ylim)
+
+
+class TemplatePool:
+    """
+    Pool of figure layouts reused for renders with the same layout.
+
+    A layout (figure, grid of axes, scales, axis break markers) is built once
+    per key by a factory. Releasing a figure removes only the artists added
+    after the layout was built, so the next render with the same key skips
+    the construction of the figure and its decorations. A released figure
+    must not be used anymore; release it instead of closing it.
+
+    Usage example:
+    >>> pool = TemplatePool()
+    >>> for chunk in chunks:
+    ...     fig, axes = boxplot(chunk, "snr", "mse", "label", y_limits=limits,
+    ...                         template_pool=pool)
+    ...     fig.savefig(...)
+    ...     pool.release(fig)
+    """
+
+    def __init__(self, max_per_key: int = 4):
+        """
+        Parameters:
+            max_per_key (int): Maximum number of idle figures kept for every layout.
+        """
+        self.max_per_key = max_per_key
+        self._idle = defaultdict(list)
+        self._in_use = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: Hashable, factory: Callable[[], tuple]) -> tuple:
+        """
+        Get a figure with the layout of a key.
+
+        Parameters:
+            key (Hashable): Description of the layout; equal keys must give
+                            equal layouts.
+            factory (Callable): Function building the layout, returns (fig, axes).
+        Returns:
+            tuple: (fig, axes) as returned by the factory.
+        """
+        with self._lock:
+            idle = self._idle[key]
+            template = idle.pop() if idle else None
+        if template is None:
+            template = _Template(key, *factory())
+        with self._lock:
+            self._in_use[id(template.fig)] = template
+        return template.fig, template.axes
+
+    def release(self, fig: Figure) -> None:
+        """
+        Return a figure to the pool after its data artists are removed.
+
+        Parameters:
+            fig (Figure): A figure returned by `acquire`.
+        """
+        with self._lock:
+            template = self._in_use.pop(id(fig))
+        template.reset()
+        with self._lock:
+            idle = self._idle[template.key]
+            if len(idle) < self.max_per_key:
+                idle.append(template)
+
+    def __len__(self) -> int:
+        """
+        Number of idle figures in the pool.
+        """
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+
+def layout_key(*parts) -> tuple:
+    """
+    Build a hashable layout key from nested sequences and scalars.
+    """
+    return tuple(
+        layout_key(*part) if isinstance(part, (list, tuple, np.ndarray)) else part
+        for part in parts
+    )
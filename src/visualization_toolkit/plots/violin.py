@@ -0,0 +1,221 @@
+"Violin plot plotting"
+
+from typing import Sequence, Tuple
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from visualization_toolkit.core.grouping import get_x_levels, group_values
+from visualization_toolkit.core.kde import binned_kde
+from visualization_toolkit.plots._boxplot_utils import add_legend, create_axes
+
+
+def compute_violins(
+    groups: dict,
+    keys: list,
+    logy: bool,
+    grid_size: int = 512,
+    bandwidth: float | None = None,
+) -> tuple[np.ndarray, dict]:
+    """
+    Compute the density curves of the violins for all groups at once.
+
+    Parameters:
+        groups (dict): Values split by (x, hue), see `group_values`.
+        keys (list): The (x, hue) keys to compute.
+        logy (bool): If True, densities are estimated for log10 of the values,
+                     non-positive values are ignored.
+        grid_size (int): Number of points of the common evaluation grid.
+        bandwidth (float | None): Kernel bandwidth (in log10 units if `logy`).
+                                  If None, Scott's rule is used per group.
+    Returns:
+        tuple: The grid in data units and a mapping from key to
+               (density, median) where density is normalized to a maximum of 1
+               and is zero outside the range of the group values.
+    """
+    samples = []
+    for key in keys:
+        values = np.asarray(groups.get(key, []), dtype=float)
+        values = values[np.isfinite(values)]
+        if logy:
+            values = np.log10(values[values > 0])
+        samples.append(values)
+    keys = [key for key, values in zip(keys, samples) if len(values)]
+    samples = [values for values in samples if len(values)]
+    if not samples:
+        return np.empty(0), {}
+
+    low = min(values.min() for values in samples)
+    high = max(values.max() for values in samples)
+    if high == low:
+        low, high = low - 0.5, high + 0.5
+    grid = np.linspace(low, high, grid_size)
+    densities = binned_kde(samples, grid, bandwidth)
+
+    violins = {}
+    for key, values, density in zip(keys, samples, densities):
+        density = np.where((grid >= values.min()) & (grid <= values.max()), density, 0)
+        peak = density.max()
+        if peak > 0:
+            density = density / peak
+        median = np.median(values)
+        violins[key] = (density, 10**median if logy else median)
+    return (10**grid if logy else grid), violins
+
+
+def draw_violins(
+    ax: matplotlib.axes.Axes,
+    grid: np.ndarray,
+    violins: dict,
+    x_levels,
+    hue_levels: list,
+    base_positions,
+    styles: dict,
+    show_median: bool = True,
+    **kwargs,
+) -> None:
+    """
+    Draw precomputed violins on a given axis.
+
+    Parameters:
+        ax (matplotlib.axes.Axes): Axis object on which to draw the violins.
+        grid (np.ndarray): Grid of the densities in data units.
+        violins (dict): Mapping from (x, hue) to (density, median), see `compute_violins`.
+        x_levels (array-like): Unique values of the X variable.
+        hue_levels (list): Unique values of the hue variable.
+        base_positions (array-like): Positions for each X category on the X-axis.
+        styles (dict): Dictionary of styles for each hue value. The "boxprops"
+                       entry of boxplot styles defines the face, edge and hatch.
+        show_median (bool): Draw a line at the median of every violin.
+        **kwargs: Keyword arguments passed to `ax.fill_betweenx`.
+    """
+    n_hue = len(hue_levels)
+    width = 0.8 / max(1, n_hue)
+    medians = ([], [], [])
+    for i, hue_val in enumerate(hue_levels):
+        offset = (i - (n_hue - 1) / 2) * width
+        boxprops = styles.get(hue_val, {}).get("boxprops", {})
+        fill_kwargs = {
+            "facecolor": boxprops.get("facecolor", "lightgray"),
+            "edgecolor": boxprops.get("edgecolor", "black"),
+            "hatch": boxprops.get("hatch", None),
+            "linewidth": boxprops.get("linewidth", 1.5),
+            **kwargs,
+        }
+        for j, x_val in enumerate(x_levels):
+            if (x_val, hue_val) not in violins:
+                continue
+            density, median = violins[(x_val, hue_val)]
+            inside = density > 0
+            half_width = density[inside] * width * 0.45
+            center = base_positions[j] + offset
+            ax.fill_betweenx(
+                grid[inside], center - half_width, center + half_width, **fill_kwargs
+            )
+            if show_median:
+                median_width = np.interp(median, grid, density) * width * 0.45
+                medians[0].append(median)
+                medians[1].append(center - median_width)
+                medians[2].append(center + median_width)
+    if show_median and medians[0]:
+        ax.hlines(*medians, colors="black", linewidth=2)
+
+
+def violinplot(
+    data: pd.DataFrame,
+    x: str,
+    y: str,
+    hue: str | None = None,
+    styles: dict | None = None,
+    y_limits: Sequence[Tuple[float, float]] | None = None,
+    logy: bool = True,
+    x_label: str | None = None,
+    y_label: str | None = None,
+    title: str | None = None,
+    height_ratios=(1, 2),
+    axes_fontsize: int = 20,
+    title_fontsize: int = 22,
+    fig_size: tuple = (12, 8),
+    ax: matplotlib.axes.Axes | None = None,
+    grid_size: int = 512,
+    bandwidth: float | None = None,
+    show_median: bool = True,
+    **kwargs,
+):
+    """
+    Violin plot with optional broken Y axis, a companion of `boxplot`.
+
+    The densities of all (x, hue) groups are estimated at once on a common
+    grid by linear binning and FFT convolution, see `core.kde.binned_kde`,
+    so that millions of samples per group are handled quickly.
+
+    Parameters:
+        data (pd.DataFrame): Input data containing experimental values.
+                             Must include columns specified by x and y, and hue if used.
+        x (str): Column name used as the categorical X-axis.
+        y (str): Column name with values to plot as violins.
+        hue (str | None, optional): Column name for additional grouping within X categories.
+        styles (dict, optional): Dictionary of styles for different hue levels,
+                                 the same as for `boxplot`.
+        y_limits (Sequence[Tuple[float, float]], optional): Y-axis limits.
+                            If one tuple is provided, it will be used for one plots;
+                            two tuples for two plots with broken axis.
+        logy (bool, optional): If True, the densities are estimated in log10 space
+                               and the y-axis is logarithmic.
+        x_label (str, optional): Label for the X-axis.
+        y_label (str, optional): Label for the Y-axis.
+        title (str, optional): Plot title.
+        height_ratios (tuple, optional): Relative heights of top and bottom axes for broken axis.
+        axes_fontsize (int, optional): Font size for axis labels and ticks.
+        title_fontsize (int, optional): Font size for the title.
+        fig_size (tuple, optional): Figure size (width, height) in inches.
+        ax (matplotlib.axes.Axes, optional): Existing axes to plot on. Creates new figure if None.
+        grid_size (int, optional): Number of points of the density grid.
+        bandwidth (float, optional): Kernel bandwidth, in log10 units if `logy`.
+                                     If None, Scott's rule is used per group.
+        show_median (bool, optional): Draw a line at the median of every violin.
+
+    Returns:
+        fig (matplotlib.figure.Figure): Figure object containing the plot.
+        ax (tuple of Axes): Axes object(s).
+    """
+    if styles is None:
+        styles = {}
+
+    fig, axes = create_axes(
+        y_limits=y_limits, height_ratios=height_ratios, fig_size=fig_size, ax=ax
+    )
+    x_levels = get_x_levels(data, x)
+    hue_levels = get_x_levels(data, hue)
+    base_positions = np.arange(1, len(x_levels) + 1)
+    groups = group_values(data, x, y, hue)
+    keys = [(x_val, hue_val) for hue_val in hue_levels for x_val in x_levels]
+    grid, violins = compute_violins(groups, keys, logy, grid_size, bandwidth)
+
+    for ax_ in axes:
+        draw_violins(
+            ax_,
+            grid,
+            violins,
+            x_levels,
+            hue_levels,
+            base_positions,
+            styles,
+            show_median=show_median,
+            **kwargs,
+        )
+        if logy:
+            ax_.set_yscale("log")
+        ax_.grid(True)
+        ax_.tick_params(axis="both", labelsize=axes_fontsize - 4)
+
+    axes[-1].set_xticks(base_positions)
+    axes[-1].set_xticklabels(x_levels)
+    axes[-1].set_xlabel(x_label, fontsize=axes_fontsize)
+    axes[-1].set_ylabel(y_label, fontsize=axes_fontsize)
+    axes[0].set_title(title, fontsize=title_fontsize)
+
+    if hue is not None:
+        add_legend(fig, styles, hue_levels, axes_fontsize - 4)
+    return fig, axes
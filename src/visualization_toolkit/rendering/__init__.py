@@ -0,0 +1,5 @@
+"""Rendering helpers of the visualization toolkit.
+This package contains utilities that turn plot calls into image files,
+such as caching of rendered outputs, so that batch reports can be built
+from the plotting functions without repeating unchanged work.
+"""
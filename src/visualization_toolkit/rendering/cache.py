@@ -0,0 +1,391 @@
+"""Content-addressed cache of rendered figures"""
+
+import functools
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import types
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from ..config import config
+from ..core.cache import fingerprint
+from ..plots._figure import close
+from .spec import figure_of
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "visualization_toolkit" / "render"
+DEFAULT_MAX_BYTES = 1024**3
+
+_SCALAR_TYPES = (bool, int, float, complex, str, bytes, np.generic, os.PathLike)
+
+
+def library_version() -> str:
+    """
+    Get the installed version of the library.
+
+    Returns:
+        str: The version string, or "unknown" if the package is not installed.
+    """
+    try:
+        return version("visualization-toolkit")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def stable_token(obj: Any) -> str:
+    """
+    Build a representation of an object that is stable between processes.
+
+    Dictionaries are sorted by key, arrays and DataFrames are represented by
+    their content and functions by their code, defaults, closure values and
+    the values of the module globals they read. Functions of this library
+    are represented by their name, its version is part of the cache keys.
+    Other objects are represented only if they are scalars or paths; the
+    representation of an arbitrary object may contain its memory address.
+
+    Parameters:
+        obj (Any): The object to represent.
+    Returns:
+        str: The representation.
+    Raises:
+        TypeError: If the object has no stable representation.
+    """
+    if isinstance(obj, dict):
+        items = sorted((repr(k), stable_token(v)) for k, v in obj.items())
+        return "{" + ",".join(f"{k}:{v}" for k, v in items) + "}"
+    if isinstance(obj, (list, tuple)):
+        return type(obj).__name__ + "(" + ",".join(map(stable_token, obj)) + ")"
+    if isinstance(obj, np.ndarray):
+        digest = hashlib.blake2b(np.ascontiguousarray(obj).tobytes(), digest_size=16)
+        return f"ndarray({obj.dtype},{obj.shape},{digest.hexdigest()})"
+    if isinstance(obj, pd.DataFrame):
+        return f"DataFrame({fingerprint(obj, obj.columns)})"
+    if isinstance(obj, functools.partial):
+        return (
+            f"partial({stable_token(obj.func)},{stable_token(obj.args)},"
+            f"{stable_token(obj.keywords)})"
+        )
+    if isinstance(obj, types.CodeType):
+        return (
+            f"code({obj.co_code.hex()},{stable_token(obj.co_consts)},"
+            f"{stable_token(obj.co_names)})"
+        )
+    if isinstance(obj, types.FunctionType) and not _is_library(obj):
+        return f"function({_function_token(obj)},{_globals_token(obj)})"
+    if callable(obj) and hasattr(obj, "__qualname__"):
+        return f"{obj.__module__}.{obj.__qualname__}"
+    if obj is None or isinstance(obj, _SCALAR_TYPES):
+        return f"{type(obj).__name__}({obj!r})"
+    raise TypeError(f"No stable representation of {type(obj).__name__} objects")
+
+
+def _is_library(function: types.FunctionType) -> bool:
+    """
+    Check whether a function belongs to this library.
+    """
+    return function.__module__.split(".")[0] == __name__.split(".")[0]
+
+
+def _function_token(function: types.FunctionType) -> str:
+    """
+    Represent a function by its code, defaults and closure values.
+    """
+    closure = [cell.cell_contents for cell in function.__closure__ or ()]
+    return (
+        f"{function.__module__}.{function.__qualname__},"
+        f"{stable_token(function.__code__)},{stable_token(function.__defaults__)},"
+        f"{stable_token(closure)}"
+    )
+
+
+def _code_names(code: types.CodeType) -> set:
+    """
+    Get the global and attribute names used by code and its nested code.
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _globals_token(function: types.FunctionType) -> str:
+    """
+    Represent the module globals a function reads.
+
+    Functions of the same module are followed, modules are represented by
+    their name and callables of other modules by their qualified name.
+    """
+    namespace = function.__globals__
+    values = {}
+    pending = [function.__code__]
+    while pending:
+        for name in _code_names(pending.pop()):
+            if name in values or name not in namespace:
+                continue
+            value = namespace[name]
+            if isinstance(value, types.ModuleType):
+                values[name] = f"module({value.__name__})"
+            elif (
+                isinstance(value, types.FunctionType) and value.__globals__ is namespace
+            ):
+                values[name] = _function_token(value)
+                pending.append(value.__code__)
+            elif callable(value) and hasattr(value, "__qualname__"):
+                values[name] = f"{value.__module__}.{value.__qualname__}"
+            else:
+                values[name] = stable_token(value)
+    return stable_token(values)
+
+
+class RenderCache:
+    """Directory of rendered files addressed by the hash of their inputs."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Parameters:
+            directory (str | os.PathLike | None): Cache directory.
+                If None, `~/.cache/visualization_toolkit/render` is used.
+            max_bytes (int): Maximum total size of the cached files in bytes.
+        """
+        self.directory = Path(directory) if directory is not None else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        # Size of every cached file from the least to the most recently used,
+        # read from the directory once and then kept up to date.
+        self._entries: OrderedDict | None = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def key(
+        self,
+        plot_fn: Callable,
+        data: pd.DataFrame,
+        columns: list,
+        kwargs: dict,
+        savefig_kwargs: dict,
+    ) -> str:
+        """
+        Compute the cache key of a render.
+
+        Parameters:
+            plot_fn (Callable): Plotting function.
+            data (pd.DataFrame): Input data.
+            columns (list): Columns of `data` used by the plot.
+            kwargs (dict): Keyword arguments of the plotting function.
+            savefig_kwargs (dict): Keyword arguments of `Figure.savefig`.
+        Returns:
+            str: Hexadecimal digest of all inputs.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        for part in (
+            library_version(),
+            config.get_language(),
+            stable_token(plot_fn),
+            fingerprint(data, columns),
+            stable_token(kwargs),
+            stable_token(savefig_kwargs),
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def path(self, key: str, suffix: str) -> Path:
+        """
+        Get the location of a cached file.
+        """
+        return self.directory / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str) -> Path | None:
+        """
+        Look up a cached file and mark it as recently used.
+
+        Returns:
+            Path | None: The cached file, or None if it is missing.
+        """
+        path = self.path(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if str(path) in self._index():
+                self._entries.move_to_end(str(path))
+        return path
+
+    def put(self, key: str, suffix: str, source: str | os.PathLike) -> Path:
+        """
+        Move a rendered file into the cache and evict old entries.
+
+        Parameters:
+            key (str): The cache key.
+            suffix (str): File suffix, e.g. ".png".
+            source (str | os.PathLike): Rendered file, located in the cache directory.
+        Returns:
+            Path: The cached file.
+        """
+        path = self.path(key, suffix)
+        size = os.stat(source).st_size
+        os.replace(source, path)
+        with self._lock:
+            entries = self._index()
+            self._size += size - entries.pop(str(path), 0)
+            entries[str(path)] = size
+            self._evict()
+        return path
+
+    def evict(self) -> None:
+        """
+        Remove least recently used files until the cache fits `max_bytes`.
+        """
+        with self._lock:
+            self._index()
+            self._evict()
+
+    def _index(self) -> OrderedDict:
+        """
+        Get the cached files, scanning the directory on first use.
+        The lock must be held.
+        """
+        if self._entries is None:
+            entries = []
+            if self.directory.exists():
+                for entry in os.scandir(self.directory):
+                    if entry.is_file() and not entry.name.startswith("."):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, entry.path, stat.st_size))
+            self._entries = OrderedDict(
+                (path, size) for _, path, size in sorted(entries)
+            )
+            self._size = sum(self._entries.values())
+        return self._entries
+
+    def _evict(self) -> None:
+        """
+        Remove least recently used files of the index, the lock must be held.
+        """
+        while self._size > self.max_bytes and self._entries:
+            path, size = self._entries.popitem(last=False)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+
+    def clear(self) -> None:
+        """
+        Remove all cached files.
+        """
+        with self._lock:
+            if self.directory.exists():
+                shutil.rmtree(self.directory)
+            self._entries = None
+
+
+def used_columns(data: pd.DataFrame, kwargs: dict) -> list:
+    """
+    Get the columns of the data a plot may read, given its keyword arguments.
+
+    Parameters:
+        data (pd.DataFrame): Input data.
+        kwargs (dict): Keyword arguments of the plotting function.
+    Returns:
+        list: Columns named by the arguments, or all columns if an argument
+              is a function that may read any of them.
+    """
+    values = list(kwargs.values())
+    if any(callable(value) for value in values):
+        return list(data.columns)
+    columns = []
+    for value in values:
+        for name in value if isinstance(value, (list, tuple)) else [value]:
+            if isinstance(name, str) and name in data.columns and name not in columns:
+                columns.append(name)
+    return columns
+
+
+def render_to_file(
+    plot_fn: Callable,
+    path: str | os.PathLike,
+    data: pd.DataFrame,
+    cache: RenderCache | None = None,
+    savefig_kwargs: dict | None = None,
+    **kwargs,
+) -> bool:
+    """
+    Render a plot into a file, reusing a cached file when the inputs did not change.
+
+    The cache key includes the data columns named by the keyword arguments
+    (all columns if a keyword argument is a function, e.g. `significance_fn`),
+    the keyword arguments (including styles), the library version and the
+    current language. On a cache hit matplotlib is not invoked at all.
+    Arguments without a stable representation (see `stable_token`) bypass
+    the cache: the plot is rendered and nothing is stored.
+
+    Parameters:
+        plot_fn (Callable): Plotting function, e.g. `mseplot` or `boxplot`.
+        path (str | os.PathLike): Output file. The format follows its suffix.
+        data (pd.DataFrame): Input data passed to `plot_fn`.
+        cache (RenderCache | None): Render cache. If None, the default cache is used.
+        savefig_kwargs (dict | None): Keyword arguments for `Figure.savefig`.
+        **kwargs: Keyword arguments passed to `plot_fn`.
+
+    Returns:
+        bool: True if the file was taken from the cache.
+
+    Usage example:
+    >>> from visualization_toolkit.plots.mse import mseplot
+    >>> from visualization_toolkit.rendering.cache import render_to_file
+    >>> render_to_file(mseplot, "mse.png", df, x="snr", y="mse", hue="label")
+    """
+    if "ax" in kwargs:
+        raise ValueError("render_to_file creates its own figure, `ax` is not supported")
+    if cache is None:
+        cache = RenderCache()
+    if savefig_kwargs is None:
+        savefig_kwargs = {}
+    path = Path(path)
+    suffix = path.suffix.lower()
+    try:
+        key = cache.key(
+            plot_fn, data, used_columns(data, kwargs), kwargs, savefig_kwargs
+        )
+    except TypeError:
+        key = None
+
+    if key is not None:
+        cached = cache.get(key, suffix)
+        if cached is not None:
+            shutil.copyfile(cached, path)
+            return True
+
+    result = plot_fn(data=data, **kwargs)
+    fig = figure_of(result)
+    if key is None:
+        try:
+            fig.savefig(path, **savefig_kwargs)
+        finally:
+            close(fig)
+        return False
+    cache.directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=suffix, prefix=".", dir=cache.directory)
+    os.close(fd)
+    try:
+        fig.savefig(tmp_path, **savefig_kwargs)
+        shutil.copyfile(tmp_path, path)
+        cache.put(key, suffix, tmp_path)
+    finally:
+        close(fig)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return False
@@ -0,0 +1,277 @@
+"""Pipelined asynchronous rendering"""
+
+import asyncio
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator
+
+from ..core import backend
+from .spec import PlotSpec, draw, encode, prepare
+
+
+def _draw_stage(spec: PlotSpec) -> tuple:
+    """
+    Draw the spec and keep it together with the figure for the encode stage.
+    """
+    return spec, draw(spec)
+
+
+def _encode_stage(job: tuple) -> bytes:
+    """
+    Encode the figure drawn for the spec.
+    """
+    spec, fig = job
+    return encode(fig, spec.format, spec.savefig_kwargs)
+
+
+class RenderPipeline:
+    """
+    Render plot specs with the compute, draw and encode stages on separate executors.
+
+    Each stage has its own thread pool, so the statistics of one
+    figure, the drawing of another and the encoding of a third run at the
+    same time. The number of figures in flight is bounded by `max_in_flight`;
+    new submissions wait until a slot is free, which bounds the memory used
+    by drawn but not yet encoded figures.
+
+    Figures are drawn without pyplot, see `config.pyplot_free`. The context
+    of the submitting code (e.g. the `language` override) is kept for all stages.
+
+    Usage example:
+    >>> pipeline = RenderPipeline(max_in_flight=8)
+    >>> png = await pipeline.render_async(PlotSpec("mseplot", df, x="snr", y="mse"))
+    >>> for png in pipeline.map(specs):
+    ...     ...
+    """
+
+    def __init__(
+        self,
+        compute_workers: int = 2,
+        draw_workers: int = 2,
+        encode_workers: int = 2,
+        max_in_flight: int = 8,
+    ):
+        """
+        Parameters:
+            compute_workers (int): Threads computing statistics, see `spec.prepare`.
+            draw_workers (int): Threads drawing figures.
+            encode_workers (int): Threads encoding figures into bytes.
+            max_in_flight (int): Maximum number of figures being processed at once.
+        """
+        self.max_in_flight = max_in_flight
+        # The kernels are launched by the workers, start them in this thread.
+        backend.initialize()
+        self._stages = (
+            (ThreadPoolExecutor(compute_workers, "vt-compute"), prepare),
+            (ThreadPoolExecutor(draw_workers, "vt-draw"), _draw_stage),
+            (ThreadPoolExecutor(encode_workers, "vt-encode"), _encode_stage),
+        )
+        # One bound for synchronous and asynchronous callers, not tied to an
+        # event loop: threads wait on the condition, coroutines on futures of
+        # their loop that are woken when a slot is freed.
+        self._free_slots = max_in_flight
+        self._slot_freed = threading.Condition()
+        self._slot_waiters = deque()
+
+    def submit(self, spec: PlotSpec) -> Future:
+        """
+        Submit a spec for rendering, waiting while `max_in_flight` figures are processed.
+
+        Parameters:
+            spec (PlotSpec): The spec to render.
+        Returns:
+            Future: Future resolving to the encoded image bytes.
+        """
+        with self._slot_freed:
+            self._slot_freed.wait_for(lambda: self._free_slots > 0)
+            self._free_slots -= 1
+        return self._start(spec, contextvars.copy_context())
+
+    def _acquire_or_wait(self, loop: asyncio.AbstractEventLoop):
+        """
+        Take a slot, or return a future of `loop` woken when a slot is freed.
+        """
+        with self._slot_freed:
+            if self._free_slots > 0:
+                self._free_slots -= 1
+                return None
+            waiter = loop.create_future()
+            self._slot_waiters.append((loop, waiter))
+            return waiter
+
+    def _wake_waiter(self) -> None:
+        """
+        Wake the coroutine waiting longest for a slot, the lock must be held.
+        """
+        while self._slot_waiters:
+            loop, waiter = self._slot_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+                return
+            except RuntimeError:
+                # The loop of the waiter is closed.
+                continue
+
+    def _release(self) -> None:
+        """
+        Free a slot and wake one waiting thread and one waiting coroutine.
+        """
+        with self._slot_freed:
+            self._free_slots += 1
+            self._slot_freed.notify()
+            self._wake_waiter()
+
+    def _start(self, spec: PlotSpec, context: contextvars.Context) -> Future:
+        """
+        Run the stages for a spec that holds a slot.
+
+        The slot is released when the last stage finishes or a stage fails.
+        If the returned future is cancelled, the running stage is finished
+        and the later stages are skipped.
+        """
+        result = Future()
+
+        def finish(value, error=None):
+            self._release()
+            # Marks the result as running, unless it was cancelled.
+            if not result.set_running_or_notify_cancel():
+                return
+            if error is not None:
+                result.set_exception(error)
+            else:
+                result.set_result(value)
+
+        def advance(value, index):
+            if index == len(self._stages) or result.cancelled():
+                finish(value)
+                return
+            executor, stage = self._stages[index]
+            try:
+                future = executor.submit(context.run, stage, value)
+            except RuntimeError as error:
+                # The pipeline was shut down.
+                finish(None, error)
+                return
+
+            def done(future):
+                error = future.exception()
+                if error is not None:
+                    finish(None, error)
+                else:
+                    advance(future.result(), index + 1)
+
+            future.add_done_callback(done)
+
+        advance(spec, 0)
+        return result
+
+    def map(self, specs: Iterable[PlotSpec]) -> Iterator[bytes]:
+        """
+        Render specs and yield the images in order.
+
+        Specs are taken from the iterable lazily, at most `max_in_flight`
+        results are kept before they are consumed.
+
+        Parameters:
+            specs (Iterable[PlotSpec]): The specs to render.
+        Returns:
+            Iterator[bytes]: Encoded images.
+        """
+        pending = deque()
+        for spec in specs:
+            if len(pending) >= self.max_in_flight:
+                yield pending.popleft().result()
+            pending.append(self.submit(spec))
+        while pending:
+            yield pending.popleft().result()
+
+    async def render_async(self, spec: PlotSpec) -> bytes:
+        """
+        Render a spec without blocking the event loop.
+
+        Parameters:
+            spec (PlotSpec): The spec to render.
+        Returns:
+            bytes: The encoded image.
+        """
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        while (waiter := self._acquire_or_wait(loop)) is not None:
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._slot_freed:
+                    if (loop, waiter) in self._slot_waiters:
+                        self._slot_waiters.remove((loop, waiter))
+                    else:
+                        # Pass the wake-up on to the next waiting coroutine.
+                        self._wake_waiter()
+                raise
+        return await asyncio.wrap_future(self._start(spec, context))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the stage executors.
+        """
+        for executor, _ in self._stages:
+            executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    """
+    Wake a coroutine waiting for a slot, unless it was cancelled.
+    """
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+_default_pipeline: RenderPipeline | None = None
+_default_lock = threading.Lock()
+
+
+def get_pipeline() -> RenderPipeline:
+    """
+    Get the shared pipeline used by `render_async` and `render_many`.
+    """
+    global _default_pipeline
+    with _default_lock:
+        if _default_pipeline is None:
+            _default_pipeline = RenderPipeline()
+        return _default_pipeline
+
+
+async def render_async(spec: PlotSpec) -> bytes:
+    """
+    Render a spec on the shared pipeline without blocking the event loop.
+
+    Parameters:
+        spec (PlotSpec): The spec to render.
+    Returns:
+        bytes: The encoded image.
+
+    Usage example:
+    >>> from visualization_toolkit.rendering.pipeline import render_async
+    >>> from visualization_toolkit.rendering.spec import PlotSpec
+    >>> png = await render_async(PlotSpec("boxplot", df, x="snr", y="mse"))
+    """
+    return await get_pipeline().render_async(spec)
+
+
+def render_many(specs: Iterable[PlotSpec]) -> Iterator[bytes]:
+    """
+    Render specs on the shared pipeline and yield the images in order.
+
+    Parameters:
+        specs (Iterable[PlotSpec]): The specs to render.
+    Returns:
+        Iterator[bytes]: Encoded images.
+    """
+    return get_pipeline().map(specs)
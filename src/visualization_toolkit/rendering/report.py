@@ -0,0 +1,223 @@
+"""Streaming report writers"""
+
+import html
+import os
+from pathlib import Path
+from typing import Iterable
+
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from ..plots._figure import close
+from .spec import PlotSpec, draw, figure_of, prepare
+
+
+def _as_figure(
+    item: PlotSpec | Figure | tuple, format: str, savefig_kwargs: dict
+) -> tuple[Figure, str, dict]:
+    """
+    Draw a spec, or get the figure of a drawn plot, with its output settings.
+
+    The format and `savefig` arguments of a spec take precedence over the
+    defaults of the report.
+    """
+    if isinstance(item, PlotSpec):
+        return (
+            draw(prepare(item)),
+            item.format or format,
+            {**savefig_kwargs, **item.savefig_kwargs},
+        )
+    if isinstance(item, Figure):
+        return item, format, savefig_kwargs
+    return figure_of(item), format, savefig_kwargs
+
+
+class PdfReportWriter:
+    """
+    Write figures into a single multipage PDF one at a time.
+
+    Every figure is closed right after its page is written, so the peak
+    memory stays at one figure regardless of the number of pages.
+
+    Usage example:
+    >>> with PdfReportWriter("appendix.pdf") as report:
+    ...     report.write(PlotSpec("boxplot", chunk, x="snr", y="mse") for chunk in chunks)
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        metadata: dict | None = None,
+        savefig_kwargs: dict | None = None,
+    ):
+        """
+        Parameters:
+            path (str | os.PathLike): Output PDF file.
+            metadata (dict | None): PDF metadata, e.g. {"Title": "Appendix"}.
+            savefig_kwargs (dict | None): Keyword arguments for `Figure.savefig`,
+                the ones of a spec take precedence.
+        """
+        self.path = Path(path)
+        self.savefig_kwargs = savefig_kwargs if savefig_kwargs else {}
+        self.pages = 0
+        self._pdf = PdfPages(self.path, metadata=metadata)
+
+    def add(self, item: PlotSpec | Figure) -> None:
+        """
+        Write a page and release its figure.
+
+        Parameters:
+            item (PlotSpec | Figure | tuple): Spec to draw, an already drawn figure
+                or a (fig, axes) tuple returned by a plotting function.
+                The format of a spec must be None or "pdf".
+        """
+        fig, format, savefig_kwargs = _as_figure(item, "pdf", self.savefig_kwargs)
+        try:
+            if format != "pdf":
+                raise ValueError(f"A PDF report cannot contain a {format} page")
+            self._pdf.savefig(fig, **savefig_kwargs)
+        finally:
+            close(fig)
+        self.pages += 1
+
+    def write(self, items: Iterable[PlotSpec | Figure]) -> int:
+        """
+        Write pages from an iterable, consuming it lazily.
+
+        Parameters:
+            items (Iterable[PlotSpec | Figure]): Specs or figures.
+        Returns:
+            int: Total number of pages written so far.
+        """
+        for item in items:
+            self.add(item)
+        return self.pages
+
+    def close(self) -> None:
+        """
+        Finish the PDF file.
+        """
+        self._pdf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class HtmlReportWriter:
+    """
+    Write figures as image files into a directory with an HTML index.
+
+    Every figure is closed right after its file is written, so the peak
+    memory stays at one figure regardless of the number of figures.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        format: str = "png",
+        title: str = "Report",
+        savefig_kwargs: dict | None = None,
+    ):
+        """
+        Parameters:
+            directory (str | os.PathLike): Output directory, created if missing.
+            format (str): Image format of the figures, e.g. "png" or "svg".
+            title (str): Title of the HTML index.
+            savefig_kwargs (dict | None): Keyword arguments for `Figure.savefig`.
+        The format and `savefig_kwargs` of a spec take precedence over these defaults.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        self.title = title
+        self.savefig_kwargs = savefig_kwargs if savefig_kwargs else {}
+        self.pages = 0
+        self._entries: list[tuple[str, str, str]] = []
+
+    def add(self, item: PlotSpec | Figure, caption: str | None = None) -> None:
+        """
+        Write a figure file and release the figure.
+
+        Parameters:
+            item (PlotSpec | Figure | tuple): Spec to draw, an already drawn figure
+                or a (fig, axes) tuple returned by a plotting function.
+            caption (str | None): Caption shown under the figure in the index.
+        """
+        fig, format, savefig_kwargs = _as_figure(item, self.format, self.savefig_kwargs)
+        name = f"figure_{self.pages:05d}.{format}"
+        try:
+            fig.savefig(self.directory / name, format=format, **savefig_kwargs)
+        finally:
+            close(fig)
+        self._entries.append((name, format, caption or ""))
+        self.pages += 1
+
+    def write(self, items: Iterable[PlotSpec | Figure]) -> int:
+        """
+        Write figures from an iterable, consuming it lazily.
+
+        Parameters:
+            items (Iterable[PlotSpec | Figure]): Specs or figures.
+        Returns:
+            int: Total number of figures written so far.
+        """
+        for item in items:
+            self.add(item)
+        return self.pages
+
+    def close(self) -> None:
+        """
+        Write the HTML index.
+        """
+        figures = []
+        for name, format, caption in self._entries:
+            tag = "embed" if format == "pdf" else "img"
+            figures.append(
+                f'<figure><{tag} src="{html.escape(name)}">'
+                f"<figcaption>{html.escape(caption)}</figcaption></figure>"
+            )
+        figures = "\n".join(figures)
+        title = html.escape(self.title)
+        (self.directory / "index.html").write_text(
+            "<!DOCTYPE html>\n"
+            f'<html><head><meta charset="utf-8"><title>{title}</title></head>\n'
+            f"<body><h1>{title}</h1>\n{figures}\n</body></html>\n",
+            encoding="utf-8",
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_report(
+    items: Iterable[PlotSpec | Figure], path: str | os.PathLike, **kwargs
+) -> int:
+    """
+    Stream specs or figures into a report.
+
+    If `path` ends with ".pdf", a multipage PDF is written,
+    otherwise `path` is a directory for image files and an HTML index.
+
+    Parameters:
+        items (Iterable[PlotSpec | Figure]): Specs or figures, consumed lazily.
+        path (str | os.PathLike): Output PDF file or directory.
+        **kwargs: Keyword arguments of `PdfReportWriter` or `HtmlReportWriter`.
+    Returns:
+        int: Number of written pages.
+
+    Usage example:
+    >>> from visualization_toolkit.rendering.report import write_report
+    >>> write_report((PlotSpec("mseplot", df, x="snr", y="mse") for df in chunks), "out.pdf")
+    """
+    if str(path).lower().endswith(".pdf"):
+        writer = PdfReportWriter(path, **kwargs)
+    else:
+        writer = HtmlReportWriter(path, **kwargs)
+    with writer:
+        return writer.write(items)
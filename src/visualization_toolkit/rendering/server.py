@@ -0,0 +1,521 @@
+"""Persistent local render server
+
+The server keeps the libraries, the font cache and the compiled kernels
+loaded in one long-running process and renders plot specs sent over
+localhost HTTP or a Unix socket, so a report job pays only for its figures
+and not for the interpreter startup.
+
+Requests are POSTed to `/render` as JSON:
+
+    {"plot": "mseplot", "data_path": "results.csv", "format": "png",
+     "savefig_kwargs": {"dpi": 100}, "kwargs": {"x": "snr", "y": "mse", "hue": "label"}}
+
+The data is given by `data_path` (CSV, Parquet, Feather/Arrow or a summary NPZ),
+by inline `data` columns, or as an Arrow IPC stream in the request body with
+the JSON spec in the `X-Plot-Spec` header. The response is the image.
+
+Usage example:
+    python -m visualization_toolkit.rendering.server --port 8765
+    python -m visualization_toolkit.rendering.server --socket /tmp/vt.sock
+"""
+
+import argparse
+import functools
+import http.client
+import json
+import os
+import socket
+import socketserver
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..core.cache import MemoCache
+from ..core.summary import Summary, load_summary
+from ..plots._significance_boxplot import compare_all_pairs, compare_hue_within_groups
+from .pipeline import RenderPipeline
+from .spec import PlotSpec
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# Largest accepted request body.
+MAX_REQUEST_BYTES = 256 * 1024**2
+
+# Total size of the data files kept in memory between requests.
+FILE_CACHE_BYTES = 512 * 1024**2
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+}
+
+# Options of the significance tests accepted in the request kwargs.
+_TEST_KWARGS = ("omnibus", "omnibus_alpha", "block")
+
+SIGNIFICANCE_TESTS = {
+    "compare_hue_within_groups": lambda data, kw: compare_hue_within_groups(
+        data,
+        kw["x"],
+        kw["y"],
+        kw["hue"],
+        **kw["test_kwargs"],
+    ),
+    "compare_all_pairs": lambda data, kw: compare_all_pairs(
+        data,
+        kw["x"],
+        kw["y"],
+        **kw["test_kwargs"],
+    ),
+}
+
+
+# Status codes of the errors caused by a request, other errors are server errors.
+_CLIENT_ERRORS = (
+    (PermissionError, 403),
+    (FileNotFoundError, 404),
+    ((ValueError, KeyError, TypeError, NotImplementedError), 400),
+)
+
+_file_cache = MemoCache(FILE_CACHE_BYTES)
+
+
+def _read_file(path: str) -> pd.DataFrame | Summary:
+    """
+    Read a data file by its suffix.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return pd.read_csv(path)
+    if suffix == ".parquet":
+        return pd.read_parquet(path)
+    if suffix in (".feather", ".arrow"):
+        return pd.read_feather(path)
+    if suffix == ".npz":
+        return load_summary(path)
+    raise ValueError(f"Unsupported data file '{path}'")
+
+
+def read_data(path: str | os.PathLike, data_root: str | os.PathLike | None = None):
+    """
+    Read the data of a spec from a file.
+
+    The files are cached by path, modification time and size, so repeated
+    requests for the same results do not parse the file again. The cache
+    holds at most `FILE_CACHE_BYTES` of data.
+
+    Parameters:
+        path (str | os.PathLike): CSV, Parquet, Feather/Arrow or summary NPZ file.
+        data_root (str | os.PathLike | None): If given, only files inside
+                                             this directory can be read and
+                                             relative paths start from it.
+    Returns:
+        pd.DataFrame | Summary: The data.
+    """
+    if data_root is None:
+        path = Path(path).resolve()
+    else:
+        root = Path(data_root).resolve()
+        path = (root / path).resolve()
+        if not path.is_relative_to(root):
+            raise PermissionError(f"'{path}' is outside of the data root")
+    stat = path.stat()
+    key = (__name__, "read_data", str(path), stat.st_mtime_ns, stat.st_size)
+    found, data = _file_cache.get(key)
+    if not found:
+        data = _read_file(str(path))
+        _file_cache.put(key, data)
+    return data
+
+
+def read_arrow_stream(payload: bytes) -> pd.DataFrame:
+    """
+    Read a DataFrame from an Arrow IPC stream.
+    """
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError("Arrow payloads require pyarrow to be installed") from error
+    return pyarrow.ipc.open_stream(payload).read_pandas()
+
+
+def build_spec(
+    request: dict,
+    payload: bytes | None = None,
+    data_root: str | os.PathLike | None = None,
+) -> PlotSpec:
+    """
+    Build a plot spec from a JSON request.
+
+    Parameters:
+        request (dict): Request with "plot", one of "data_path" or "data",
+            and optional "format", "savefig_kwargs" and "kwargs". A string
+            `significance_fn` in the kwargs names a test of `SIGNIFICANCE_TESTS`,
+            or stored significance results for summary data. The kwargs
+            "omnibus", "omnibus_alpha" and "block" are passed to the test.
+        payload (bytes | None): Arrow IPC stream with the data.
+        data_root (str | os.PathLike | None): Directory restricting "data_path".
+    Returns:
+        PlotSpec: The spec.
+    """
+    if payload is not None:
+        data = read_arrow_stream(payload)
+    elif "data_path" in request:
+        data = read_data(request["data_path"], data_root)
+    elif "data" in request:
+        data = pd.DataFrame(request["data"])
+    else:
+        raise ValueError("The request has no data")
+    kwargs = dict(request.get("kwargs", {}))
+    significance_fn = kwargs.get("significance_fn")
+    if isinstance(significance_fn, str) and not isinstance(data, Summary):
+        if significance_fn not in SIGNIFICANCE_TESTS:
+            raise ValueError(
+                f"Significance test '{significance_fn}' not supported. "
+                f"Available: {list(SIGNIFICANCE_TESTS)}"
+            )
+        test = SIGNIFICANCE_TESTS[significance_fn]
+        # The options of the test are not arguments of the plot.
+        options = {name: kwargs.pop(name) for name in _TEST_KWARGS if name in kwargs}
+        kwargs["significance_fn"] = functools.partial(
+            test, kw={**kwargs, "test_kwargs": options}
+        )
+    if "significance_levels" in kwargs:
+        # JSON object keys are strings.
+        kwargs["significance_levels"] = {
+            float(thr): sym for thr, sym in kwargs["significance_levels"].items()
+        }
+    return PlotSpec(
+        request["plot"],
+        data,
+        format=request.get("format", "png"),
+        savefig_kwargs=request.get("savefig_kwargs"),
+        **kwargs,
+    )
+
+
+def _warm_up(pipeline: RenderPipeline) -> None:
+    """
+    Render small figures to load the fonts, caches and compiled kernels.
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10], 20),
+            "mse": rng.lognormal(size=40),
+            "label": np.tile(["a", "b"], 20),
+        }
+    )
+    specs = [
+        PlotSpec(
+            "mseplot",
+            data,
+            x="snr",
+            y="mse",
+            hue="label",
+            significance_fn=lambda d: compare_hue_within_groups(
+                d, "snr", "mse", "label"
+            ),
+        ),
+        PlotSpec("boxplot", data, x="snr", y="mse", hue="label"),
+    ]
+    for _ in pipeline.map(specs):
+        pass
+
+
+class _RenderHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler of the render server.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address.
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format, *args) -> None:
+        if self.server.render_server.verbose:
+            super().log_message(format, *args)
+
+    def log_error(self, format, *args) -> None:
+        # Errors are logged also without `verbose`.
+        super().log_message(format, *args)
+
+    def _send(
+        self, status: int, content_type: str, body: bytes, close: bool = False
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if close:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, close: bool = False) -> None:
+        body = json.dumps({"error": message}).encode()
+        self._send(status, "application/json", body, close)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(200, "text/plain", b"ok")
+        else:
+            self._send_error(404, f"Unknown path '{self.path}'")
+
+    def do_POST(self) -> None:
+        server = self.server.render_server
+        # Without reading the body the connection can not be reused.
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self._send_error(400, "Invalid Content-Length", close=True)
+            return
+        if length < 0:
+            self._send_error(400, "Invalid Content-Length", close=True)
+            return
+        if length > server.max_request_bytes:
+            message = (
+                f"Request body of {length} bytes exceeds the limit "
+                f"of {server.max_request_bytes} bytes"
+            )
+            self._send_error(413, message, close=True)
+            return
+        body = self.rfile.read(length)
+        if self.path != "/render":
+            self._send_error(404, f"Unknown path '{self.path}'")
+            return
+        try:
+            if self.headers.get("Content-Type") == ARROW_STREAM:
+                request = json.loads(self.headers.get("X-Plot-Spec", "{}"))
+                spec = build_spec(request, body, server.data_root)
+            else:
+                spec = build_spec(json.loads(body), None, server.data_root)
+            image = server.pipeline.submit(spec).result()
+        except Exception as error:  # reported to the client
+            status = _error_status(error)
+            if status >= 500:
+                self.log_error("%s", "".join(traceback.format_exception(error)))
+            self._send_error(status, f"{type(error).__name__}: {error}")
+            return
+        self._send(
+            200, CONTENT_TYPES.get(spec.format, "application/octet-stream"), image
+        )
+
+
+def _error_status(error: Exception) -> int:
+    """
+    HTTP status of an error raised while handling a request.
+    """
+    for types, status in _CLIENT_ERRORS:
+        if isinstance(error, types):
+            return status
+    return 500
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    """
+    HTTP server listening on a Unix socket.
+    """
+
+    daemon_threads = True
+
+
+class RenderServer:
+    """
+    Long-running render server with a warm rendering pipeline.
+
+    The server renders specs with a `RenderPipeline`; after the warm-up
+    a request costs only its data loading, drawing and encoding.
+
+    Usage example:
+    >>> with RenderServer(port=0) as server:
+    ...     png = render_remote({"plot": "boxplot", "data_path": "results.csv",
+    ...                          "kwargs": {"x": "snr", "y": "mse"}}, server.address)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        socket_path: str | os.PathLike | None = None,
+        pipeline: RenderPipeline | None = None,
+        data_root: str | os.PathLike | None = None,
+        max_request_bytes: int = MAX_REQUEST_BYTES,
+        warm: bool = True,
+        verbose: bool = False,
+    ):
+        """
+        Parameters:
+            host (str): Host to listen on, the server is meant for local clients only.
+            port (int): TCP port, 0 selects a free port.
+            socket_path (str | os.PathLike | None): If given, listen on this
+                                                    Unix socket instead of TCP.
+            pipeline (RenderPipeline | None): Pipeline rendering the specs.
+                                              If None, a new one is created.
+            data_root (str | os.PathLike | None): Only data files inside this
+                                                 directory can be read. If None,
+                                                 the current working directory.
+            max_request_bytes (int): Largest accepted request body, larger
+                                     requests are answered with status 413.
+            warm (bool): Render small figures before serving.
+            verbose (bool): Log every request to stderr.
+        """
+        self.pipeline = pipeline if pipeline is not None else RenderPipeline()
+        self.data_root = Path.cwd() if data_root is None else Path(data_root)
+        self.max_request_bytes = max_request_bytes
+        self.verbose = verbose
+        if warm:
+            _warm_up(self.pipeline)
+        if socket_path is not None:
+            socket_path = str(socket_path)
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self._server = _UnixHTTPServer(socket_path, _RenderHandler)
+            self.address = socket_path
+        else:
+            self._server = ThreadingHTTPServer((host, port), _RenderHandler)
+            self.address = self._server.server_address[:2]
+        self._server.render_server = self
+        self._thread = None
+
+    def serve_forever(self) -> None:
+        """
+        Serve requests in the calling thread until `shutdown` is called.
+        """
+        self._server.serve_forever()
+
+    def start(self) -> "RenderServer":
+        """
+        Serve requests in a background thread.
+        """
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="vt-render-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        """
+        Stop serving and release the socket and the pipeline.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+        self.pipeline.shutdown()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a Unix socket.
+    """
+
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def render_remote(
+    request: dict,
+    address: tuple | str | os.PathLike = ("127.0.0.1", 8765),
+    payload: bytes | None = None,
+    timeout: float = 60,
+) -> bytes:
+    """
+    Render a spec on a running render server.
+
+    Parameters:
+        request (dict): The JSON spec, see `build_spec`.
+        address (tuple | str | os.PathLike): (host, port) of a TCP server
+                                             or the path of a Unix socket.
+        payload (bytes | None): Arrow IPC stream with the data.
+        timeout (float): Timeout of the request in seconds.
+    Returns:
+        bytes: The encoded image.
+    """
+    if isinstance(address, tuple):
+        connection = http.client.HTTPConnection(*address, timeout=timeout)
+    else:
+        connection = _UnixHTTPConnection(str(address), timeout)
+    if payload is None:
+        body = json.dumps(request).encode()
+        headers = {"Content-Type": "application/json"}
+    else:
+        body = payload
+        headers = {"Content-Type": ARROW_STREAM, "X-Plot-Spec": json.dumps(request)}
+    try:
+        connection.request("POST", "/render", body=body, headers=headers)
+        response = connection.getresponse()
+        content = response.read()
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RuntimeError(json.loads(content).get("error", content.decode()))
+    return content
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run the render server from the command line.
+    """
+    parser = argparse.ArgumentParser(
+        description="Render server of visualization_toolkit"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument(
+        "--data-root",
+        help="Only serve data files inside this directory, "
+        "by default the current working directory",
+    )
+    parser.add_argument("--max-request-bytes", type=int, default=MAX_REQUEST_BYTES)
+    parser.add_argument("--draw-workers", type=int, default=2)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    pipeline = RenderPipeline(
+        draw_workers=args.draw_workers, max_in_flight=args.max_in_flight
+    )
+    server = RenderServer(
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket,
+        pipeline=pipeline,
+        data_root=args.data_root,
+        max_request_bytes=args.max_request_bytes,
+        verbose=args.verbose,
+    )
+    print(f"Serving on {server.address}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
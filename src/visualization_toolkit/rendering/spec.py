@@ -0,0 +1,233 @@
+"""Plot specifications and rendering stages"""
+
+import inspect
+import io
+from typing import Any, Callable
+
+import matplotlib
+import pandas as pd
+from matplotlib.figure import Figure
+
+from ..config import config
+from ..core.summary import summarize
+from ..plots._figure import close
+from ..plots.boxplot import boxplot
+from ..plots.facet import mse_facetplot
+from ..plots.mse import mseplot
+
+PLOTS = {
+    "mseplot": mseplot,
+    "boxplot": boxplot,
+    "mse_facetplot": mse_facetplot,
+}
+
+
+DEFAULT_FORMAT = "png"
+
+# Name of the significance results computed by `prepare` in a summary.
+_PREPARED_SIGNIFICANCE = "prepared"
+
+# Options of `Axes.boxplot` that need the values of the boxes.
+_RAW_BOX_OPTIONS = ("bootstrap", "usermedians", "conf_intervals", "autorange")
+
+
+class PlotSpec:
+    """Description of a single figure: plotting function, data and options."""
+
+    def __init__(
+        self,
+        plot: str | Callable,
+        data: Any,
+        format: str | None = None,
+        savefig_kwargs: dict | None = None,
+        **kwargs,
+    ):
+        """
+        Parameters:
+            plot (str | Callable): Plotting function or its name in `PLOTS`.
+            data (Any): Data passed to the plotting function, usually a DataFrame.
+            format (str | None): Output image format, e.g. "png", "pdf" or "svg".
+                If None, the format of the report the spec is written to,
+                or `DEFAULT_FORMAT`.
+            savefig_kwargs (dict | None): Keyword arguments for `Figure.savefig`.
+            **kwargs: Keyword arguments passed to the plotting function.
+        """
+        if isinstance(plot, str):
+            if plot not in PLOTS:
+                raise ValueError(
+                    f"Plot '{plot}' not supported. Available: {list(PLOTS)}"
+                )
+            plot = PLOTS[plot]
+        self.plot = plot
+        self.data = data
+        self.format = format
+        self.savefig_kwargs = savefig_kwargs if savefig_kwargs else {}
+        self.kwargs = kwargs
+
+    def replace(self, **changes) -> "PlotSpec":
+        """
+        Return a copy of the spec with some plotting arguments replaced.
+        """
+        return PlotSpec(
+            self.plot,
+            self.data,
+            format=self.format,
+            savefig_kwargs=self.savefig_kwargs,
+            **{**self.kwargs, **changes},
+        )
+
+
+class _Precomputed:
+    """Significance function returning a result computed in advance."""
+
+    def __init__(self, result: pd.DataFrame):
+        self.result = result
+
+    def __call__(self, data) -> pd.DataFrame:
+        return self.result
+
+
+def figure_of(result: Any) -> Figure:
+    """
+    Get the figure from the value returned by a plotting function.
+
+    Parameters:
+        result (Any): Either a (fig, axes) tuple or an Axes.
+    Returns:
+        Figure: The figure.
+    """
+    if isinstance(result, tuple):
+        return result[0]
+    return result.figure
+
+
+def prepare(spec: PlotSpec) -> PlotSpec:
+    """
+    Compute stage: evaluate the statistics of the spec in advance.
+
+    For `mseplot` and `boxplot` the DataFrame is replaced by a `Summary` with
+    the aggregated curves or the box statistics and the significance results,
+    so the draw stage only draws. For other plots, and for box plots whose
+    options need the raw values (e.g. `y_limits="auto"`), only the
+    significance tests are evaluated. Significance results referenced by
+    name are stored in a summary and are left as they are.
+
+    Parameters:
+        spec (PlotSpec): The spec to prepare.
+    Returns:
+        PlotSpec: Spec with the precomputed statistics.
+    """
+    if isinstance(spec.data, pd.DataFrame):
+        if spec.plot is mseplot:
+            return _summarized(spec, boxes=False)
+        if spec.plot is boxplot and _boxes_summarizable(spec.kwargs):
+            return _summarized(spec, boxes=True)
+    significance_fn = spec.kwargs.get("significance_fn")
+    if significance_fn is None or isinstance(significance_fn, (_Precomputed, str)):
+        return spec
+    return spec.replace(significance_fn=_Precomputed(significance_fn(spec.data)))
+
+
+def _summarized(spec: PlotSpec, boxes: bool) -> PlotSpec:
+    """
+    Replace the data of an `mseplot` or `boxplot` spec by its summary.
+    """
+    params = {
+        name: parameter.default
+        for name, parameter in inspect.signature(spec.plot).parameters.items()
+        if parameter.default is not inspect.Parameter.empty
+    }
+    params.update(spec.kwargs)
+    significance_fn = params["significance_fn"]
+    significance = None
+    changes = {}
+    if significance_fn is not None and not isinstance(significance_fn, str):
+        significance = {_PREPARED_SIGNIFICANCE: significance_fn}
+        changes["significance_fn"] = _PREPARED_SIGNIFICANCE
+    summary = summarize(
+        spec.data,
+        params["x"],
+        params["y"],
+        params["hue"],
+        aggregates=(
+            ()
+            if boxes
+            else (
+                (
+                    params["estimator"],
+                    params["errorbar_type"],
+                    tuple(params["errorbar_data"]),
+                ),
+            )
+        ),
+        whis=spec.kwargs.get("whis", matplotlib.rcParams["boxplot.whiskers"]),
+        significance=significance,
+        boxes=boxes,
+    )
+    return PlotSpec(
+        spec.plot,
+        summary,
+        format=spec.format,
+        savefig_kwargs=spec.savefig_kwargs,
+        **{**spec.kwargs, **changes},
+    )
+
+
+def _boxes_summarizable(kwargs: dict) -> bool:
+    """
+    Check that a box plot drawn from a summary looks the same as from the data.
+    """
+    if isinstance(kwargs.get("y_limits"), str):
+        return False
+    styles = list((kwargs.get("styles") or {}).values())
+    # Summaries hold the statistics for one whisker reach.
+    if any("whis" in style for style in styles):
+        return False
+    return not any(
+        option.get(name) for option in [kwargs, *styles] for name in _RAW_BOX_OPTIONS
+    )
+
+
+def draw(spec: PlotSpec) -> Figure:
+    """
+    Draw stage: build the figure of the spec without pyplot.
+
+    Parameters:
+        spec (PlotSpec): The spec to draw.
+    Returns:
+        Figure: The drawn figure.
+    """
+    with config.pyplot_free():
+        return figure_of(spec.plot(spec.data, **spec.kwargs))
+
+
+def encode(fig: Figure, format: str | None = None, savefig_kwargs: dict | None = None):
+    """
+    Encode stage: save the figure into bytes and release it.
+
+    Parameters:
+        fig (Figure): The figure to encode.
+        format (str | None): Output image format, `DEFAULT_FORMAT` if None.
+        savefig_kwargs (dict | None): Keyword arguments for `Figure.savefig`.
+    Returns:
+        bytes: The encoded image.
+    """
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=format or DEFAULT_FORMAT, **(savefig_kwargs or {}))
+    finally:
+        close(fig)
+    return buffer.getvalue()
+
+
+def render(spec: PlotSpec) -> bytes:
+    """
+    Run all stages for a spec in the calling thread.
+
+    Parameters:
+        spec (PlotSpec): The spec to render.
+    Returns:
+        bytes: The encoded image.
+    """
+    spec = prepare(spec)
+    return encode(draw(spec), spec.format, spec.savefig_kwargs)
@@ -0,0 +1,129 @@
+"""Test the equivalence of the numerical backends."""
+
+import importlib.util
+
+import numpy as np
+import pytest
+from scipy.stats import mannwhitneyu
+
+from visualization_toolkit.config import config
+from visualization_toolkit.core import backend
+
+BACKENDS = [
+    "numpy",
+    pytest.param(
+        "numba",
+        marks=pytest.mark.skipif(
+            importlib.util.find_spec("numba") is None,
+            reason="numba is not installed",
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_mse_rows(name):
+    """
+    Test the row-wise MSE against NumPy.
+    """
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=(2, 50, 300))
+
+    result = backend.mse_rows(a, b, backend=name)
+
+    np.testing.assert_allclose(result, np.mean((a - b) ** 2, axis=1), rtol=1e-12)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("chunk", [backend.MSE_CHUNK_ELEMENTS, 50])
+def test_segment_mse(name, chunk, monkeypatch):
+    """
+    Test the segment MSE against per-signal NumPy, including empty segments.
+    """
+    monkeypatch.setattr(backend, "MSE_CHUNK_ELEMENTS", chunk)
+    rng = np.random.default_rng(0)
+    counts = [3, 0, 1, 120, 7, 0, 64]
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    a, b = rng.normal(size=(2, offsets[-1]))
+
+    result = backend.segment_mse(a, b, offsets, backend=name)
+
+    for i, (start, stop) in enumerate(zip(offsets[:-1], offsets[1:])):
+        expected = (
+            np.mean((a[start:stop] - b[start:stop]) ** 2) if stop > start else np.nan
+        )
+        np.testing.assert_allclose(result[i], expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_segment_percentiles(name):
+    """
+    Test the segment percentiles against np.percentile, including empty and NaN segments.
+    """
+    rng = np.random.default_rng(0)
+    counts = [0, 1, 2, 7, 100, 10]
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    values = rng.normal(size=offsets[-1])
+    values[offsets[5] + 3] = np.nan
+    q = [0, 5, 33.3, 50, 95, 100]
+
+    result = backend.segment_percentiles(values, offsets, q, backend=name)
+
+    for i, (start, stop) in enumerate(zip(offsets[:-1], offsets[1:])):
+        segment = values[start:stop]
+        expected = np.percentile(segment, q) if len(segment) else np.nan
+        np.testing.assert_array_equal(result[i], expected)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_mannwhitney_asymptotic(name):
+    """
+    Test the asymptotic Mann-Whitney U test against SciPy, with and without ties.
+    """
+    rng = np.random.default_rng(0)
+    first = rng.normal(size=(20, 12))
+    second = rng.normal(0.5, 1, size=(20, 15))
+    first[10:] = np.round(first[10:])
+    second[10:] = np.round(second[10:])
+
+    result = backend.mannwhitney_asymptotic(first, second, backend=name)
+
+    expected = mannwhitneyu(
+        first, second, axis=1, alternative="two-sided", method="asymptotic"
+    ).pvalue
+    np.testing.assert_allclose(result, expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_mannwhitney_asymptotic_nan(name):
+    """
+    Test that tests with NaN in either sample give NaN, as in SciPy.
+    """
+    rng = np.random.default_rng(0)
+    first = rng.normal(size=(3, 12))
+    second = rng.normal(0.5, 1, size=(3, 15))
+    first[0, 4] = np.nan
+    second[1, 0] = np.nan
+
+    result = backend.mannwhitney_asymptotic(first, second, backend=name)
+
+    expected = mannwhitneyu(
+        first, second, axis=1, alternative="two-sided", method="asymptotic"
+    ).pvalue
+    np.testing.assert_array_equal(np.isnan(result), [True, True, False])
+    np.testing.assert_allclose(result, expected, rtol=1e-10)
+
+
+def test_default_backend():
+    """
+    Test that the NumPy backend is used unless another one is selected.
+    """
+    assert config.get_backend() == "numpy"
+
+
+def test_set_backend_validates():
+    """
+    Test that unknown backends are rejected.
+    """
+    with pytest.raises(ValueError):
+        config.set_backend("cuda")
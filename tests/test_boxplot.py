@@ -0,0 +1,105 @@
+"""Test the boxplot."""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib import cbook
+from matplotlib.colors import to_rgba
+
+from visualization_toolkit.plots._figure import subplots
+from visualization_toolkit.plots._significance_boxplot import (
+    compare_hue_within_groups,
+    significance_levels_asterisk,
+)
+from visualization_toolkit.plots.boxplot import boxplot_pages, boxplot_to_bxp_kwargs
+
+
+def test_boxplot_pages_share_y_limits():
+    """
+    Test that every page gets the same y-limits, covering all boxes and
+    significance brackets.
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        {
+            "snr": np.repeat(np.arange(5), 40),
+            "label": np.tile(np.repeat(["A", "B"], 20), 5),
+            "mse": rng.gamma(2.0, size=200) * np.repeat(1.0 + np.arange(5), 40),
+        }
+    )
+    data.loc[(data["snr"] == 4) & (data["label"] == "B"), "mse"] *= 10
+
+    pages = list(
+        boxplot_pages(
+            data,
+            "snr",
+            "mse",
+            "label",
+            per_page=2,
+            significance_fn=lambda d: compare_hue_within_groups(
+                d, "snr", "mse", "label"
+            ),
+            significance_levels=significance_levels_asterisk,
+        )
+    )
+
+    assert len(pages) == 3
+    limits = {axes[0].get_ylim() for _, axes in pages}
+    assert len(limits) == 1
+    ((low, high),) = limits
+    assert low < data["mse"].min() and data["mse"].max() < high
+    brackets = [
+        line.get_ydata()
+        for _, axes in pages
+        for line in axes[0].get_lines()
+        if len(line.get_ydata()) == 4
+    ]
+    assert brackets
+    assert max(bracket.max() for bracket in brackets) < high
+    for fig, _ in pages:
+        plt.close(fig)
+
+
+@pytest.mark.filterwarnings("ignore:Data has no positive values")
+@pytest.mark.parametrize(
+    "values, logy", [(np.nan, True), (np.nan, False), (-1.0, True), (0.0, True)]
+)
+def test_boxplot_pages_without_drawable_values(values, logy):
+    """
+    Test that pages without finite (or, with `logy`, positive) values get the
+    default y-limits.
+    """
+    data = pd.DataFrame(
+        {
+            "snr": np.repeat(np.arange(4), 5),
+            "label": np.tile(["A", "B", "A", "B", "A"], 4),
+            "mse": np.full(20, values),
+        }
+    )
+
+    pages = list(boxplot_pages(data, "snr", "mse", "label", per_page=2, logy=logy))
+
+    assert len(pages) == 2
+    for fig, axes in pages:
+        assert np.isfinite(axes[0].get_ylim()).all()
+        plt.close(fig)
+
+
+@pytest.mark.parametrize("sym", ["gD", "r+", "--r", "C1o", "0.5", ""])
+def test_bxp_kwargs_flier_style(sym):
+    """
+    Test that boxes drawn from statistics get the fliers style of `sym`.
+    """
+    values = np.concatenate([np.arange(10.0), [100.0]])
+    fig, (ax, bxp_ax) = subplots(1, 2)
+    expected = ax.boxplot(values, sym=sym)["fliers"]
+    stats = cbook.boxplot_stats(values)
+    fliers = bxp_ax.bxp(stats, **boxplot_to_bxp_kwargs({"sym": sym}, 1.5))["fliers"]
+
+    assert len(fliers) == len(expected)
+    for flier, expected_flier in zip(fliers, expected):
+        assert flier.get_marker() == expected_flier.get_marker()
+        assert to_rgba(flier.get_color()) == to_rgba(expected_flier.get_color())
+        assert len(flier.get_ydata()) == len(expected_flier.get_ydata())
+    plt.close(fig)
@@ -0,0 +1,49 @@
+"""Test automatic broken axis limits."""
+
+import numpy as np
+
+from visualization_toolkit.core import grouping
+from visualization_toolkit.plots import _boxplot_utils
+from visualization_toolkit.plots._boxplot_utils import auto_y_limits
+
+
+def test_auto_y_limits_breaks_at_gap():
+    """
+    Test that the axis is broken between two clusters of groups.
+    """
+    rng = np.random.default_rng(0)
+    groups = {
+        ("a", None): rng.lognormal(-6, 0.5, 200),
+        ("b", None): rng.lognormal(-5.5, 0.5, 200),
+        ("c", None): rng.lognormal(2, 0.3, 200),
+    }
+
+    (bottom, top), height_ratios = auto_y_limits(groups, logy=True)
+
+    assert bottom[0] < groups[("a", None)].min()
+    assert np.percentile(groups[("b", None)], 99) < bottom[1] < top[0]
+    assert top[0] < np.percentile(groups[("c", None)], 1)
+    assert top[1] > groups[("c", None)].max()
+    assert np.isclose(sum(height_ratios), 1)
+
+
+def test_auto_y_limits_single_axis_without_gap():
+    """
+    Test that a single axis is used if the groups overlap.
+    """
+    rng = np.random.default_rng(0)
+    groups = {(i, None): rng.normal(i, 1, 100) for i in range(3)}
+
+    y_limits, height_ratios = auto_y_limits(groups, logy=False)
+
+    assert len(y_limits) == 1
+    assert height_ratios is None
+
+
+def test_grouping_helpers_importable_from_old_location():
+    """
+    Test that the grouping helpers moved to `core.grouping` are still
+    importable from `_boxplot_utils`.
+    """
+    assert _boxplot_utils.get_x_levels is grouping.get_x_levels
+    assert _boxplot_utils.group_values is grouping.group_values
@@ -0,0 +1,71 @@
+"""Test memoization of statistics."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from visualization_toolkit.core import cache
+from visualization_toolkit.core.aggregation import aggregate
+from visualization_toolkit.plots._significance_boxplot import compare_hue_within_groups
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10, 20], 40),
+            "label": np.tile(np.repeat(["A", "B"], 20), 3),
+            "mse": rng.random(120),
+            "run": np.tile(np.arange(20), 6),
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def memo_cache():
+    yield cache.enable_cache()
+    cache.disable_cache()
+
+
+def test_aggregate_hits_cache(data):
+    """
+    Test that repeated aggregation is served from the cache.
+    """
+    first = aggregate(data, "snr", "mse", estimator="median")
+    second = aggregate(data.copy(), "snr", "mse", estimator="median")
+    for a, b in zip(first, second):
+        np.testing.assert_array_equal(a, b)
+    assert cache.cache_info()["hits"] == 1
+    assert cache.cache_info()["misses"] == 1
+
+    aggregate(data, "snr", "mse", estimator="mean")
+    assert cache.cache_info()["misses"] == 2
+
+
+def test_unrelated_columns_do_not_invalidate(data):
+    """
+    Test that the key depends only on the columns used by the computation.
+    """
+    compare_hue_within_groups(data, "snr", "mse", "label")
+    data["run"] = 0
+    compare_hue_within_groups(data, "snr", "mse", "label")
+    assert cache.cache_info()["hits"] == 1
+
+    data.loc[0, "mse"] = 10.0
+    compare_hue_within_groups(data, "snr", "mse", "label")
+    assert cache.cache_info()["misses"] == 2
+
+
+def test_invalidation_and_eviction(data):
+    """
+    Test explicit invalidation and size-bounded eviction.
+    """
+    aggregate(data, "snr", "mse")
+    compare_hue_within_groups(data, "snr", "mse", "label")
+    cache.clear_cache(aggregate)
+    assert cache.cache_info()["entries"] == 1
+
+    cache.enable_cache(max_bytes=1)
+    aggregate(data, "snr", "mse")
+    assert cache.cache_info()["entries"] == 0
@@ -0,0 +1,94 @@
+"""Test context-local language configuration."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from visualization_toolkit.config import get_text, language, pyplot_free
+from visualization_toolkit.localization import en, ru
+from visualization_toolkit.plots.boxplot import boxplot
+from visualization_toolkit.plots.mse import mseplot
+
+DATA = pd.DataFrame(
+    {
+        "snr": np.repeat([0, 10], 10),
+        "mse": np.linspace(0.1, 1, 20),
+        "label": np.tile(["A", "B"], 10),
+    }
+)
+
+
+def render_labels(lang: str) -> tuple[str, str]:
+    """
+    Render an MSE plot in the given language and return its labels.
+    """
+    with language(lang):
+        ax = Figure().add_subplot()
+        mseplot(DATA, "snr", "mse", hue="label", ax=ax)
+        return ax.get_xlabel(), ax.get_ylabel()
+
+
+def expected_labels(lang: str) -> tuple[str, str]:
+    translations = {"en": en.TRANSLATIONS, "ru": ru.TRANSLATIONS}[lang]
+    return translations["x_label_snr"], translations["y_label_mse"]
+
+
+def test_language_context_is_restored():
+    """
+    Test that the override is removed after the block.
+    """
+    default = get_text("x_label_snr")
+    with language("ru"):
+        assert get_text("x_label_snr") == ru.TRANSLATIONS["x_label_snr"]
+        with language("en", translations={"x_label_snr": "custom"}):
+            assert get_text("x_label_snr") == "custom"
+        assert get_text("x_label_snr") == ru.TRANSLATIONS["x_label_snr"]
+    assert get_text("x_label_snr") == default
+
+
+def test_concurrent_threads_render_own_language():
+    """
+    Test that concurrent renders in threads do not affect each other.
+    """
+    languages = ["en", "ru"] * 16
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(render_labels, languages))
+    for lang, labels in zip(languages, results):
+        assert labels == expected_labels(lang)
+
+
+def test_concurrent_tasks_render_own_language():
+    """
+    Test that asyncio tasks keep their own language across awaits.
+    """
+
+    async def render(lang):
+        with language(lang):
+            await asyncio.sleep(0)
+            ax = Figure().add_subplot()
+            mseplot(DATA, "snr", "mse", hue="label", ax=ax)
+            await asyncio.sleep(0)
+            return ax.get_xlabel(), ax.get_ylabel()
+
+    async def main():
+        return await asyncio.gather(*(render(lang) for lang in ("ru", "en") * 4))
+
+    for lang, labels in zip(("ru", "en") * 4, asyncio.run(main())):
+        assert labels == expected_labels(lang)
+
+
+def test_pyplot_free_rendering():
+    """
+    Test that figures created in the pyplot-free mode are not registered with pyplot.
+    """
+    before = plt.get_fignums()
+    with pyplot_free():
+        ax = mseplot(DATA, "snr", "mse", hue="label")
+        fig, axes = boxplot(DATA, "snr", "mse", "label", y_limits=((0, 0.5), (0.5, 1)))
+    assert plt.get_fignums() == before
+    assert ax.get_yscale() == "log"
+    assert len(axes) == 2 and fig.canvas is not None
@@ -0,0 +1,69 @@
+"""Test downsampling and error bands."""
+
+import numpy as np
+
+from visualization_toolkit.core.downsample import lttb, minmax
+from visualization_toolkit.plots.error_band import error_quantiles, errorbandplot
+
+
+def test_minmax_keeps_extremes():
+    """
+    Test that min-max downsampling keeps the global extremes and the ends.
+    """
+    y = np.random.default_rng(0).normal(size=100_000)
+
+    index = minmax(y, 1000)
+
+    assert len(index) <= 1000
+    assert {0, len(y) - 1, np.argmin(y), np.argmax(y)} <= set(index)
+
+
+def test_lttb_selects_sorted_points():
+    """
+    Test that LTTB keeps the requested number of points including the ends.
+    """
+    t = np.arange(10_000)
+    y = np.sin(t / 100)
+
+    index = lttb(t, y, 500)
+
+    assert len(index) == 500
+    assert index[0] == 0 and index[-1] == len(t) - 1
+    assert np.all(np.diff(index) > 0)
+
+
+def test_error_quantiles_match_percentile():
+    """
+    Test that chunked band computation equals np.percentile over realizations.
+    """
+    errors = np.random.default_rng(0).normal(size=(51, 1000)) ** 2
+
+    band = error_quantiles(errors, errorbar_data=(10, 90), chunk_bytes=8 * 51 * 64)
+
+    np.testing.assert_array_equal(band, np.percentile(errors, [10, 50, 90], axis=0))
+
+
+def test_errorbandplot_draws_band():
+    """
+    Test that the drawn line and band are the statistics at the kept samples
+    and the extremes of the band are kept.
+    """
+    errors = np.random.default_rng(0).normal(size=(31, 20000)) ** 2
+    expected = np.percentile(errors, [5, 50, 95], axis=0)
+
+    ax = errorbandplot({"A": errors}, max_points=600)
+
+    (line,) = ax.get_lines()
+    index = line.get_xdata().astype(int)
+    assert len(index) <= 600
+    np.testing.assert_array_equal(line.get_ydata(), expected[1, index])
+
+    n = len(index)
+    vertices = ax.collections[0].get_paths()[0].vertices
+    lower, upper = vertices[1 : n + 1], vertices[n + 2 : 2 * n + 2][::-1]
+    np.testing.assert_array_equal(lower[:, 0], index)
+    np.testing.assert_array_equal(upper[:, 0], index)
+    np.testing.assert_array_equal(lower[:, 1], expected[0, index])
+    np.testing.assert_array_equal(upper[:, 1], expected[2, index])
+    assert upper[:, 1].max() == expected[2].max()
+    assert lower[:, 1].min() == expected[0].min()
@@ -0,0 +1,84 @@
+"""Test the faceted MSE plot and its grouped aggregation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.container import ErrorbarContainer
+
+from visualization_toolkit.core.aggregation import aggregate, aggregate_groups
+from visualization_toolkit.plots._figure import close
+from visualization_toolkit.plots.facet import mse_facetplot
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    n = 600
+    return pd.DataFrame(
+        {
+            "noise": rng.choice(["white", "pink"], n),
+            "length": rng.choice([64, 128, 256], n),
+            "label": rng.choice(["A", "B"], n),
+            "snr": rng.choice([0, 10, 20], n),
+            "mse": rng.gamma(2.0, size=n),
+        }
+    )
+
+
+@pytest.mark.parametrize("estimator", ["mean", "median"])
+def test_aggregate_groups_matches_aggregate(data, estimator):
+    """
+    Test that the single-pass aggregation equals `aggregate` of every group.
+    """
+    by = ["noise", "label", "snr"]
+    table = aggregate_groups(data, by, "mse", estimator, "p", (5, 95))
+
+    for (noise, label), group in data.groupby(["noise", "label"]):
+        x_list, center, err = aggregate(group, "snr", "mse", estimator, "p", (5, 95))
+        rows = table[(table["noise"] == noise) & (table["label"] == label)]
+        np.testing.assert_array_equal(rows["snr"], x_list)
+        np.testing.assert_allclose(rows["center"], center)
+        np.testing.assert_allclose(rows["err_low"], err[0])
+        np.testing.assert_allclose(rows["err_high"], err[1])
+
+
+def test_facet_render(data):
+    """
+    Test the grid shape and that every panel shows the curves of its facet.
+    """
+    fig, axes = mse_facetplot(
+        data, "snr", "mse", hue="label", row="noise", col="length", estimator="mean"
+    )
+
+    assert axes.shape == (2, 3)
+    for i, noise in enumerate(["pink", "white"]):
+        for j, length in enumerate([64, 128, 256]):
+            containers = [
+                c for c in axes[i, j].containers if isinstance(c, ErrorbarContainer)
+            ]
+            assert len(containers) == 2
+            for container in containers:
+                subset = data[
+                    (data["noise"] == noise)
+                    & (data["length"] == length)
+                    & (data["label"] == container.get_label())
+                ]
+                x_values, center = container.lines[0].get_data()
+                expected = subset.groupby("snr")["mse"].mean()
+                np.testing.assert_array_equal(x_values, expected.index)
+                np.testing.assert_allclose(center, expected.to_numpy())
+    assert len(fig.legends) == 1
+    close(fig)
+
+
+def test_facet_column_equal_to_hue(data):
+    """
+    Test that a facet column may also be the hue column.
+    """
+    fig, axes = mse_facetplot(data, "snr", "mse", hue="label", col="label")
+
+    assert axes.shape == (1, 2)
+    for ax, label in zip(axes[0], ["A", "B"]):
+        containers = [c for c in ax.containers if isinstance(c, ErrorbarContainer)]
+        assert [c.get_label() for c in containers] == [label]
+    close(fig)
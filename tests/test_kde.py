@@ -0,0 +1,22 @@
+"""Test binned kernel density estimation."""
+
+import numpy as np
+from scipy.stats import gaussian_kde
+
+from visualization_toolkit.core.kde import binned_kde
+
+
+def test_binned_kde_matches_gaussian_kde():
+    """
+    Test that the binned FFT estimate matches the exact one for every group.
+    """
+    rng = np.random.default_rng(0)
+    groups = [rng.normal(0, 1, 2000), rng.normal(2, 0.5, 300)]
+    grid = np.linspace(-5, 5, 512)
+
+    densities = binned_kde(groups, grid)
+
+    for values, density in zip(groups, densities):
+        expected = gaussian_kde(values)(grid)
+        np.testing.assert_allclose(density, expected, atol=1e-3 * expected.max())
+        assert np.isclose(np.trapezoid(density, grid), 1.0, atol=1e-3)
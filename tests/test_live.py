@@ -0,0 +1,152 @@
+"""Test the live-updating MSE plot."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.container import ErrorbarContainer
+
+from visualization_toolkit.plots import live
+from visualization_toolkit.plots._figure import close, subplots
+from visualization_toolkit.plots.live import LiveMSEPlot, _GroupStats
+from visualization_toolkit.plots.mse import mseplot
+
+
+def batch(rng, labels, n=60):
+    return pd.DataFrame(
+        {
+            "snr": rng.choice([0, 10, 20], n),
+            "label": rng.choice(labels, n),
+            "mse": rng.gamma(2.0, size=n),
+        }
+    )
+
+
+def curves(ax) -> dict:
+    """
+    Line data and error bar segments of every errorbar container by label.
+    """
+    result = {}
+    for container in ax.containers:
+        if isinstance(container, ErrorbarContainer):
+            data_line, _, barlinecols = container.lines
+            x, y = data_line.get_data()
+            order = np.argsort(x)
+            segments = np.asarray(barlinecols[0].get_segments())[order]
+            result[container.get_label()] = (np.asarray(x)[order], y[order], segments)
+    return result
+
+
+@pytest.mark.parametrize("window", [1, 4096])
+def test_group_stats_percentiles(window, monkeypatch):
+    """
+    Test that percentiles over merged chunks match `np.percentile`.
+    """
+    monkeypatch.setattr(live, "_SELECT_WINDOW", window)
+    rng = np.random.default_rng(0)
+    stats = _GroupStats()
+    values = []
+    for size in [5, 1, 17, 3, 40, 2, 2, 9]:
+        chunk = rng.integers(0, 10, size).astype(float)
+        stats.add(chunk)
+        values.append(chunk)
+        merged = np.concatenate(values)
+        for q in [0, 5, 37.5, 50, 95, 100]:
+            assert stats.percentile(q) == pytest.approx(np.percentile(merged, q))
+    assert len(stats.chunks) <= int(np.log2(stats.count)) + 1
+
+
+@pytest.mark.parametrize("estimator", ["median", "mean"])
+def test_updates_match_full_plot(estimator):
+    """
+    Test that the artists after several updates show the statistics of all data.
+    """
+    rng = np.random.default_rng(1)
+    batches = [batch(rng, ["A", "B"])] + [batch(rng, ["A", "B", "C"]) for _ in range(4)]
+    kwargs = dict(x="snr", y="mse", hue="label", estimator=estimator, logy=False)
+
+    fig, ax = subplots()
+    plot = LiveMSEPlot(batches[0], ax=ax, **kwargs)
+    for rows in batches[1:]:
+        assert plot.update(rows)
+    plot.redraw()
+
+    full_fig, full_ax = subplots()
+    mseplot(pd.concat(batches, ignore_index=True), ax=full_ax, **kwargs)
+
+    result, expected = curves(ax), curves(full_ax)
+    assert result.keys() == expected.keys()
+    for label, arrays in expected.items():
+        for value, expected_value in zip(result[label], arrays):
+            np.testing.assert_allclose(value, expected_value)
+    assert ax.get_ylim()[1] >= max(
+        arrays[2][:, 1, 1].max() for arrays in expected.values()
+    )
+    close(fig)
+    close(full_fig)
+
+
+def band_curves(ax) -> dict:
+    """
+    Line data and band outline of every band curve by label.
+    """
+    lines = [line for line in ax.get_lines() if not line.get_label().startswith("_")]
+    return {
+        line.get_label(): (*line.get_data(), band.get_paths()[0].vertices)
+        for line, band in zip(lines, ax.collections)
+    }
+
+
+def test_missing_hue_values_are_skipped():
+    """
+    Test that rows with a missing hue value do not shift the curves.
+    """
+    rng = np.random.default_rng(2)
+    batches = [batch(rng, ["A", None, "B"]) for _ in range(3)]
+    batches[0].loc[0, "label"] = None
+    for rows in batches:
+        rows.loc[rows["label"].isna(), "mse"] *= 100
+    kwargs = dict(x="snr", y="mse", hue="label", logy=False)
+
+    fig, ax = subplots()
+    plot = LiveMSEPlot(batches[0], ax=ax, **kwargs)
+    for rows in batches[1:]:
+        plot.update(rows)
+
+    full_fig, full_ax = subplots()
+    mseplot(pd.concat(batches, ignore_index=True), ax=full_ax, **kwargs)
+
+    result, expected = curves(ax), curves(full_ax)
+    assert result.keys() == expected.keys() == {"A", "B"}
+    for label, arrays in expected.items():
+        for value, expected_value in zip(result[label], arrays):
+            np.testing.assert_allclose(value, expected_value)
+    close(fig)
+    close(full_fig)
+
+
+def test_band_style_updates():
+    """
+    Test that the lines and bands of the band style follow the updates,
+    also for hue values added later.
+    """
+    rng = np.random.default_rng(3)
+    batches = [batch(rng, ["A", "B"])] + [batch(rng, ["A", "B", "C"]) for _ in range(2)]
+    kwargs = dict(x="snr", y="mse", hue="label", logy=False, errorbar_style="band")
+
+    fig, ax = subplots()
+    plot = LiveMSEPlot(batches[0], ax=ax, **kwargs)
+    for rows in batches[1:]:
+        changed = plot.update(rows)
+        assert len(changed) == 2 * rows["label"].nunique()
+    assert len(plot.artists) == 6
+
+    full_fig, full_ax = subplots()
+    mseplot(pd.concat(batches, ignore_index=True), ax=full_ax, **kwargs)
+
+    result, expected = band_curves(ax), band_curves(full_ax)
+    assert result.keys() == expected.keys() == {"A", "B", "C"}
+    for label, arrays in expected.items():
+        for value, expected_value in zip(result[label], arrays):
+            np.testing.assert_allclose(value, expected_value)
+    close(fig)
+    close(full_fig)
@@ -0,0 +1,62 @@
+"""Test the MSE experiment of ragged signals."""
+
+import importlib.util
+
+import numpy as np
+import pytest
+
+from visualization_toolkit.adapters.mse_experiment import mse_experiment, pack_signals
+from visualization_toolkit.config import config
+
+BACKENDS = [
+    "numpy",
+    pytest.param(
+        "numba",
+        marks=pytest.mark.skipif(
+            importlib.util.find_spec("numba") is None,
+            reason="numba is not installed",
+        ),
+    ),
+]
+
+
+@pytest.fixture
+def use_backend():
+    """
+    Restore the default backend after a test.
+    """
+    yield config.set_backend
+    config.set_backend("numpy")
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_ragged_mse_experiment(name, use_backend):
+    """
+    Test that the MSE of packed signals equals the MSE of every signal.
+    """
+    use_backend(name)
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(1, 300, size=12)
+    lengths[5] = 0
+    originals = [rng.normal(size=n) for n in lengths]
+    noisy = [signal + rng.normal(0, 0.5, size=len(signal)) for signal in originals]
+    flat, offsets = pack_signals(originals)
+
+    df = mse_experiment(
+        flat,
+        {"N": pack_signals(noisy)[0], "Z": flat},
+        [0, 10, 20],
+        "snr",
+        offsets=offsets,
+    )
+
+    expected = [
+        np.mean((a - b) ** 2) if len(a) else np.nan for a, b in zip(originals, noisy)
+    ]
+    noisy_rows = df[df["label"] == "N"]
+    np.testing.assert_allclose(noisy_rows["mse"], expected, rtol=1e-12)
+    np.testing.assert_array_equal(noisy_rows["snr"], np.repeat([0, 10, 20], 4))
+    np.testing.assert_array_equal(noisy_rows["run"], np.tile(np.arange(4), 3))
+    zero = df.loc[df["label"] == "Z", "mse"].to_numpy()
+    np.testing.assert_array_equal(zero[lengths > 0], 0)
+    assert np.isnan(zero[5])
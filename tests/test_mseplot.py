@@ -0,0 +1,45 @@
+"""Test the error band mode of mseplot."""
+
+import numpy as np
+import pandas as pd
+
+from visualization_toolkit.config import config
+from visualization_toolkit.core.aggregation import aggregate
+from visualization_toolkit.plots.mse import mseplot
+
+
+def test_band_style_draws_one_line_and_band_per_hue():
+    """
+    Test that every hue is drawn as one line and one band between the error limits.
+    """
+    rng = np.random.default_rng(0)
+    x_values = np.arange(200)
+    data = pd.DataFrame(
+        {
+            "snr": np.repeat(x_values, 30),
+            "label": np.tile(np.repeat(["A", "B", "C"], 10), 200),
+            "mse": rng.lognormal(size=6000),
+        }
+    )
+
+    with config.pyplot_free():
+        ax = mseplot(
+            data,
+            "snr",
+            "mse",
+            "label",
+            errorbar_style="band",
+            max_markers=20,
+            marker="o",
+            capsize=3,
+        )
+
+    assert [line.get_label() for line in ax.lines] == ["A", "B", "C"]
+    assert len(ax.collections) == 3
+    assert all(line.get_markevery() == 10 for line in ax.lines)
+    _, center, err = aggregate(
+        data[data["label"] == "B"], "snr", "mse", "median", "p", (5, 95)
+    )
+    np.testing.assert_allclose(ax.lines[1].get_ydata(), center)
+    band = ax.collections[1].get_paths()[0].vertices
+    np.testing.assert_allclose(band[1 : len(x_values) + 1, 1], center - err[0])
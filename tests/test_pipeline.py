@@ -0,0 +1,162 @@
+"""Test the pipelined render API."""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from visualization_toolkit.core.summary import Summary
+from visualization_toolkit.plots._figure import subplots
+from visualization_toolkit.plots._significance_boxplot import (
+    compare_hue_within_groups,
+    significance_levels_asterisk,
+)
+from visualization_toolkit.rendering.pipeline import RenderPipeline
+from visualization_toolkit.rendering.spec import (
+    PlotSpec,
+    draw,
+    encode,
+    prepare,
+    render,
+)
+
+# Without the version in the metadata, equal figures give equal files.
+SAVEFIG_KWARGS = {"metadata": {"Software": None}}
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10, 20], 40),
+            "label": np.tile(np.repeat(["A", "B"], 20), 3),
+            "mse": rng.gamma(2.0, size=120),
+        }
+    )
+
+
+def hue_significance(data):
+    return compare_hue_within_groups(data, "snr", "mse", "label")
+
+
+def make_specs(data) -> list[PlotSpec]:
+    common = dict(x="snr", y="mse", hue="label", savefig_kwargs=SAVEFIG_KWARGS)
+    significance = dict(
+        significance_fn=hue_significance,
+        significance_levels=significance_levels_asterisk,
+    )
+    return [
+        PlotSpec("mseplot", data, **common),
+        PlotSpec("mseplot", data, estimator="mean", **common, **significance),
+        PlotSpec("boxplot", data, **common, **significance),
+        PlotSpec("boxplot", data, y_limits="auto", **common),
+    ]
+
+
+def test_prepare_summarizes(data):
+    """
+    Test that the compute stage computes the statistics and the images
+    equal the ones drawn from the data.
+    """
+    for spec in make_specs(data):
+        prepared = prepare(spec)
+        if spec.kwargs.get("y_limits") == "auto":
+            # The automatic axis break needs the values of the boxes.
+            assert prepared.data is spec.data
+        else:
+            assert isinstance(prepared.data, Summary)
+        assert not callable(prepared.kwargs.get("significance_fn"))
+        assert encode(draw(prepared), savefig_kwargs=SAVEFIG_KWARGS) == encode(
+            draw(spec), savefig_kwargs=SAVEFIG_KWARGS
+        )
+
+
+def test_submit_map_and_render_async(data):
+    """
+    Test that all entry points give the images of the synchronous render,
+    also from several event loops.
+    """
+    specs = make_specs(data)
+    expected = [render(spec) for spec in specs]
+    with RenderPipeline(max_in_flight=2) as pipeline:
+        assert [pipeline.submit(spec).result() for spec in specs] == expected
+        assert list(pipeline.map(specs)) == expected
+
+        async def main():
+            return await asyncio.gather(*map(pipeline.render_async, specs))
+
+        for _ in range(2):
+            assert asyncio.run(main()) == expected
+
+
+def test_shared_in_flight_bound():
+    """
+    Test that synchronous and asynchronous callers share `max_in_flight`.
+    """
+    lock = threading.Lock()
+    active = [0, 0]
+
+    def slow_plot(data):
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        fig, _ = subplots()
+        return fig, None
+
+    spec = PlotSpec(slow_plot, None)
+    with RenderPipeline(draw_workers=8, max_in_flight=2) as pipeline:
+
+        async def main():
+            return await asyncio.gather(
+                *(pipeline.render_async(spec) for _ in range(4))
+            )
+
+        thread = threading.Thread(target=lambda: list(pipeline.map([spec] * 4)))
+        thread.start()
+        asyncio.run(main())
+        thread.join()
+    assert active[1] == 2
+
+
+def test_cancelled_render_holds_slot(caplog):
+    """
+    Test that a cancelled render keeps its slot until its running stage is
+    done and skips the later stages.
+    """
+    events = []
+
+    def slow_plot(data):
+        events.append(("start", data))
+        time.sleep(0.2)
+        events.append(("end", data))
+        fig, _ = subplots()
+        return fig, None
+
+    with RenderPipeline(max_in_flight=1) as pipeline:
+
+        async def main():
+            task = asyncio.create_task(pipeline.render_async(PlotSpec(slow_plot, 1)))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            waiting = [
+                asyncio.create_task(pipeline.render_async(PlotSpec(slow_plot, 2)))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0.05)
+            waiting.pop().cancel()
+            return await asyncio.gather(*waiting)
+
+        images = asyncio.run(main())
+    assert all(image.startswith(b"\x89PNG") for image in images)
+    assert events[:2] == [("start", 1), ("end", 1)]
+    assert len(events) == 6
+    assert "InvalidStateError" not in caplog.text
@@ -0,0 +1,123 @@
+"""Test the memory-budget execution planner."""
+
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from visualization_toolkit.adapters.mse_experiment import mse_experiment
+from visualization_toolkit.config import config, set_memory_budget
+from visualization_toolkit.core import backend
+from visualization_toolkit.core.aggregation import aggregate
+from visualization_toolkit.core.grouping import group_values
+from visualization_toolkit.core.planner import plan_execution
+
+
+@pytest.fixture
+def budget():
+    """
+    Restore the unlimited memory budget after a test.
+    """
+    yield set_memory_budget
+    set_memory_budget(None)
+
+
+def test_plan_execution():
+    """
+    Test that the first strategy fitting the budget is chosen.
+    """
+    plan = plan_execution("op", 1000, 100, budget=None)
+    assert (plan.strategy, plan.chunk_rows) == ("in_memory", 1000)
+
+    plan = plan_execution("op", 1000, 100, fixed_bytes=1000, budget=21_000)
+    assert (plan.strategy, plan.chunk_rows) == ("chunked", 200)
+    assert plan.estimated_bytes <= plan.budget
+
+    plan = plan_execution(
+        "op",
+        1000,
+        100,
+        fixed_bytes=50_000,
+        strategies=("in_memory", "chunked", "memmap"),
+        disk_bytes=40_000,
+        budget=30_000,
+    )
+    assert (plan.strategy, plan.chunk_rows) == ("memmap", 200)
+
+
+def test_set_memory_budget(budget):
+    """
+    Test parsing of memory budgets.
+    """
+    budget("1.5KiB")
+    assert config.get_memory_budget() == 1536
+    budget(2_000_000)
+    assert config.get_memory_budget() == 2_000_000
+    with pytest.raises(ValueError):
+        budget("2 parsecs")
+
+
+def test_budgeted_results(budget, monkeypatch):
+    """
+    Test that chunked and memmap strategies give the in-memory results.
+    """
+    monkeypatch.setattr(backend, "MSE_CHUNK_ELEMENTS", 1000)
+    rng = np.random.default_rng(0)
+    original = rng.normal(size=(200, 64)).astype(np.float32)
+    noisy = {"N": original + rng.normal(size=(200, 64)).astype(np.float32)}
+    df = pd.DataFrame(
+        {
+            "snr": rng.integers(0, 5, 2000),
+            "label": rng.choice(["a", "b"], 2000),
+            "mse": rng.gamma(2.0, size=2000),
+        }
+    )
+
+    expected = (
+        mse_experiment(original, noisy, [0, 10], "snr"),
+        aggregate(df, "snr", "mse", "median", "p", (5, 95)),
+        group_values(df, "snr", "mse", "label"),
+    )
+    budget(40_000)
+    result = (
+        mse_experiment(original, noisy, [0, 10], "snr"),
+        aggregate(df, "snr", "mse", "median", "p", (5, 95)),
+        group_values(df, "snr", "mse", "label"),
+    )
+    budget(20_000)
+    grouped = group_values(df, "snr", "mse", "label")
+
+    pd.testing.assert_frame_equal(result[0], expected[0])
+    for values, expected_values in zip(result[1], expected[1]):
+        np.testing.assert_array_equal(values, expected_values)
+    assert result[2].keys() == expected[2].keys()
+    assert grouped.keys() == expected[2].keys()
+    assert all(isinstance(v, np.memmap) for v in grouped.values())
+    for key, values in expected[2].items():
+        np.testing.assert_array_equal(result[2][key], values)
+        np.testing.assert_array_equal(grouped[key], values)
+
+
+@pytest.mark.parametrize("memory_budget", [3_000_000, 1_000_000])
+def test_group_values_peak(budget, memory_budget):
+    """
+    Test that the chunked and memmap groupings stay close to the budget.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "snr": rng.integers(0, 5, 200_000),
+            "label": rng.choice(["a", "b"], 200_000),
+            "mse": rng.gamma(2.0, size=200_000),
+        }
+    )
+    budget(memory_budget)
+    tracemalloc.start()
+    try:
+        groups = group_values(df, "snr", "mse", "label")
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert sum(len(values) for values in groups.values()) == len(df)
+    assert peak < 1.1 * memory_budget
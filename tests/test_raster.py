@@ -0,0 +1,72 @@
+"""Test the rasterization and flier decimation policy."""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from visualization_toolkit.core.downsample import decimate_extremes
+from visualization_toolkit.plots._raster import get_raster_policy
+from visualization_toolkit.plots.boxplot import boxplot
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10], 2000),
+            "label": np.tile(["A", "B"], 2000),
+            "mse": rng.standard_cauchy(4000),
+        }
+    )
+
+
+def split_lines(ax) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    fliers, others = [], []
+    for line in ax.get_lines():
+        is_flier = line.get_linestyle() == "None"
+        (fliers if is_flier else others).append(line.get_ydata())
+    return fliers, others
+
+
+def test_decimate_extremes():
+    """
+    Test that decimation keeps both extremes and the budget.
+    """
+    values = np.random.default_rng(0).normal(size=1000)
+    kept = decimate_extremes(values, 10)
+    assert len(kept) == 10
+    assert (kept.min(), kept.max()) == (values.min(), values.max())
+    assert decimate_extremes(values, None) is values
+
+    with pytest.raises(ValueError):
+        decimate_extremes(values, 1)
+    with pytest.raises(ValueError):
+        get_raster_policy({"max_fliers": 1})
+
+
+def test_fliers_decimated_before_drawing(data):
+    """
+    Test that boxes are drawn with at most `max_fliers` fliers and otherwise
+    look as without decimation.
+    """
+    kwargs = dict(x="snr", y="mse", hue="label")
+    fig, (ax,) = boxplot(data, raster_policy={"max_fliers": 20}, **kwargs)
+    reference_fig, (reference_ax,) = boxplot(
+        data, raster_policy={"max_fliers": None}, **kwargs
+    )
+
+    fliers, boxes = split_lines(ax)
+    reference_fliers, reference_boxes = split_lines(reference_ax)
+    assert len(fliers) == len(reference_fliers) == 4
+    for kept, full in zip(fliers, reference_fliers):
+        assert len(full) > 20
+        assert len(kept) == 20
+        assert (kept.min(), kept.max()) == (full.min(), full.max())
+
+    assert len(boxes) == len(reference_boxes)
+    for line, reference_line in zip(boxes, reference_boxes):
+        np.testing.assert_array_equal(line, reference_line)
+    plt.close(fig)
+    plt.close(reference_fig)
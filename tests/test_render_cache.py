@@ -0,0 +1,135 @@
+"""Test the content-addressed render cache."""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from visualization_toolkit.plots.mse import mseplot
+from visualization_toolkit.rendering import cache as render_cache
+from visualization_toolkit.rendering.cache import (
+    RenderCache,
+    render_to_file,
+    stable_token,
+)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10, 20], 20),
+            "label": np.tile(np.repeat(["A", "B"], 10), 3),
+            "mse": rng.random(60),
+            "run": np.tile(np.arange(10), 6),
+        }
+    )
+
+
+def render(data, cache, path, **kwargs):
+    return render_to_file(
+        mseplot, path, data, cache=cache, x="snr", y="mse", hue="label", **kwargs
+    )
+
+
+def test_hit_miss_and_invalidation(data, tmp_path):
+    """
+    Test that only changes of the used data or arguments cause a new render.
+    """
+    cache = RenderCache(tmp_path / "cache")
+    out = tmp_path / "out.png"
+
+    assert not render(data, cache, out)
+    assert render(data.copy(), cache, out)
+    assert out.stat().st_size > 0
+
+    data["run"] = 0
+    assert render(data, cache, out)
+
+    data.loc[0, "mse"] = 10.0
+    assert not render(data, cache, out)
+    assert not render(data, cache, out, estimator="mean")
+    assert len(list(cache.directory.iterdir())) == 3
+
+
+def test_directory_scanned_once(data, tmp_path, monkeypatch):
+    """
+    Test that the cache directory is scanned once, not at every render.
+    """
+    scans = []
+    original = os.scandir
+
+    def scandir(path):
+        scans.append(path)
+        return original(path)
+
+    monkeypatch.setattr(render_cache.os, "scandir", scandir)
+    cache = RenderCache(tmp_path / "cache", max_bytes=10**9)
+    for estimator in ["mean", "median"]:
+        for errorbar_data in [(5, 95), (10, 90), (25, 75)]:
+            render(
+                data,
+                cache,
+                tmp_path / "out.png",
+                estimator=estimator,
+                errorbar_data=errorbar_data,
+            )
+    assert len(scans) == 1
+    assert len(list(cache.directory.iterdir())) == 6
+
+
+SCALE = 1.0
+
+
+def scaled_significance(data):
+    return pd.DataFrame({"x": [0], "hue1": ["A"], "hue2": ["B"], "pvalue": SCALE})
+
+
+def test_function_globals_in_key(monkeypatch):
+    """
+    Test that changed globals read by a function argument give a new key,
+    and unstable ones bypass the cache.
+    """
+    token = stable_token(scaled_significance)
+    monkeypatch.setitem(globals(), "SCALE", 0.01)
+    assert stable_token(scaled_significance) != token
+
+    monkeypatch.setitem(globals(), "SCALE", threading.Lock())
+    with pytest.raises(TypeError):
+        stable_token(scaled_significance)
+
+
+def test_eviction(data, tmp_path):
+    """
+    Test that the least recently used files are evicted above `max_bytes`.
+    """
+    cache = RenderCache(tmp_path / "cache", max_bytes=1)
+    render(data, cache, tmp_path / "out.png")
+    render(data, cache, tmp_path / "out.png", estimator="mean")
+
+    assert list(cache.directory.iterdir()) == []
+
+
+def test_unstable_arguments_bypass_cache(data, tmp_path):
+    """
+    Test that arguments represented by their address are not cached.
+    """
+    with pytest.raises(TypeError):
+        stable_token(threading.Lock())
+    assert stable_token({"b": [1, 2.0], "a": None}) == stable_token(
+        {"a": None, "b": [1, 2.0]}
+    )
+
+    cache = RenderCache(tmp_path / "cache")
+    out = tmp_path / "out.png"
+
+    def sig(d, lock=threading.Lock()):
+        return pd.DataFrame()
+
+    assert not render(data, cache, out, significance_fn=sig)
+    assert not render(data, cache, out, significance_fn=sig)
+    assert out.stat().st_size > 0
+    assert not cache.directory.exists() or not list(cache.directory.iterdir())
@@ -0,0 +1,80 @@
+"""Test the streaming report writers."""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from visualization_toolkit.plots.mse import mseplot
+from visualization_toolkit.rendering.report import (
+    HtmlReportWriter,
+    PdfReportWriter,
+    write_report,
+)
+from visualization_toolkit.rendering.spec import PlotSpec
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10], 20),
+            "label": np.tile(["A", "B"], 20),
+            "mse": rng.gamma(2.0, size=40),
+        }
+    )
+
+
+def png_width(path) -> int:
+    return int.from_bytes(path.read_bytes()[16:20], "big")
+
+
+def test_pdf_report(data, tmp_path):
+    """
+    Test that specs and drawn figures become pages of one PDF.
+    """
+    path = tmp_path / "report.pdf"
+    items = [
+        PlotSpec("mseplot", data, x="snr", y="mse", hue="label"),
+        mseplot(data, "snr", "mse", hue="label").figure,
+    ]
+    assert write_report(iter(items), path) == 2
+    assert len(re.findall(rb"/Type\s*/Page\b(?!s)", path.read_bytes())) == 2
+
+    with PdfReportWriter(tmp_path / "other.pdf") as report:
+        with pytest.raises(ValueError):
+            report.add(
+                PlotSpec("mseplot", data, format="png", x="snr", y="mse", hue="label")
+            )
+
+
+def test_html_report(data, tmp_path):
+    """
+    Test that the settings of a spec take precedence over the report defaults.
+    """
+    spec = PlotSpec("mseplot", data, x="snr", y="mse", hue="label")
+    with HtmlReportWriter(tmp_path, savefig_kwargs={"dpi": 50}) as report:
+        report.add(spec, caption="default")
+        report.add(spec.replace(), caption="copy")
+        report.add(
+            PlotSpec(
+                "mseplot",
+                data,
+                savefig_kwargs={"dpi": 100},
+                x="snr",
+                y="mse",
+                hue="label",
+            )
+        )
+        report.add(
+            PlotSpec("mseplot", data, format="svg", x="snr", y="mse", hue="label")
+        )
+
+    assert report.pages == 4
+    index = (tmp_path / "index.html").read_text()
+    assert index.count("<img ") == 4
+    assert png_width(tmp_path / "figure_00000.png") == 300
+    assert png_width(tmp_path / "figure_00002.png") == 600
+    assert (tmp_path / "figure_00003.svg").exists()
@@ -0,0 +1,139 @@
+"""Test the local render server."""
+
+import http.client
+import json
+import socket
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from visualization_toolkit.rendering import server as server_module
+from visualization_toolkit.rendering.server import (
+    RenderServer,
+    read_data,
+    render_remote,
+)
+
+PNG_SIGNATURE = b"\x89PNG"
+
+
+@pytest.fixture(name="data")
+def fixture_data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10, 20], 20),
+            "mse": rng.lognormal(size=60),
+            "label": np.tile(["N", "MA"], 30),
+        }
+    )
+
+
+def test_render_over_http(data, tmp_path):
+    """
+    Test rendering from a data file and from inline data over localhost HTTP.
+    """
+    path = tmp_path / "results.csv"
+    data.to_csv(path, index=False)
+    kwargs = {"x": "snr", "y": "mse", "hue": "label"}
+
+    with RenderServer(port=0, data_root=tmp_path, warm=False) as server:
+        from_file = render_remote(
+            {
+                "plot": "mseplot",
+                "data_path": "results.csv",
+                "kwargs": {**kwargs, "significance_fn": "compare_hue_within_groups"},
+            },
+            server.address,
+        )
+        inline = render_remote(
+            {"plot": "boxplot", "data": data.to_dict("list"), "kwargs": kwargs},
+            server.address,
+        )
+        with pytest.raises(RuntimeError, match="not supported"):
+            render_remote({"plot": "unknown", "data": {}}, server.address)
+
+    assert from_file.startswith(PNG_SIGNATURE)
+    assert inline.startswith(PNG_SIGNATURE)
+
+
+def post(address: tuple, body: bytes) -> tuple[int, str]:
+    connection = http.client.HTTPConnection(*address, timeout=60)
+    try:
+        connection.request(
+            "POST", "/render", body=body, headers={"Content-Type": "application/json"}
+        )
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())["error"]
+    finally:
+        connection.close()
+
+
+def test_error_status(data, tmp_path, monkeypatch):
+    """
+    Test the status of rejected requests and of server errors.
+    """
+    path = tmp_path / "results.csv"
+    data.to_csv(path, index=False)
+    request = {"plot": "boxplot", "kwargs": {"x": "snr", "y": "mse"}}
+
+    with RenderServer(port=0, warm=False) as server:
+        # The default data root is the working directory.
+        status, message = post(
+            server.address, json.dumps({**request, "data_path": "/etc/hosts"}).encode()
+        )
+        assert status == 403
+        assert "outside of the data root" in message
+
+    with RenderServer(
+        port=0, data_root=tmp_path, max_request_bytes=1000, warm=False
+    ) as server:
+        assert post(server.address, b"{")[0] == 400
+        assert post(server.address, b" " * 1001)[0] == 413
+        missing = json.dumps({**request, "data_path": "missing.csv"}).encode()
+        assert post(server.address, missing)[0] == 404
+
+        def fail(path):
+            raise RuntimeError("disk failure")
+
+        monkeypatch.setattr(server_module, "_read_file", fail)
+        status, message = post(
+            server.address, json.dumps({**request, "data_path": "results.csv"}).encode()
+        )
+        assert status == 500
+        assert "disk failure" in message
+
+
+def test_read_data_cache(data, tmp_path):
+    """
+    Test that data files are read again only after a modification.
+    """
+    path = tmp_path / "results.csv"
+    data.to_csv(path, index=False)
+
+    first = read_data("results.csv", tmp_path)
+    pd.testing.assert_frame_equal(read_data(path), first)
+    data.iloc[:10].to_csv(path, index=False)
+    assert len(read_data(path, tmp_path)) == 10
+    with pytest.raises(PermissionError):
+        read_data("../results.csv", tmp_path / "sub")
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="no Unix sockets")
+def test_render_over_unix_socket(data, tmp_path):
+    """
+    Test rendering over a Unix socket with a restricted data root.
+    """
+    path = tmp_path / "results.csv"
+    data.to_csv(path, index=False)
+    request = {"plot": "boxplot", "kwargs": {"x": "snr", "y": "mse"}}
+
+    with RenderServer(
+        socket_path=tmp_path / "render.sock", data_root=tmp_path, warm=False
+    ) as server:
+        image = render_remote({**request, "data_path": str(path)}, server.address)
+        with pytest.raises(RuntimeError, match="outside of the data root"):
+            render_remote({**request, "data_path": "/etc/hosts"}, server.address)
+
+    assert image.startswith(PNG_SIGNATURE)
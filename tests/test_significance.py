@@ -0,0 +1,173 @@
+"""Test batched pairwise significance tests."""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+from scipy.stats import friedmanchisquare, kruskal, mannwhitneyu
+
+from visualization_toolkit.plots._figure import subplots
+from visualization_toolkit.plots._significance_boxplot import (
+    compare_all_pairs,
+    compare_hue_within_groups,
+    friedman_strata,
+    kruskal_strata,
+    mannwhitney_pairs,
+    significance_levels_asterisk,
+)
+from visualization_toolkit.plots.mse import add_curve_significance
+from visualization_toolkit.plots.significance_matrix import (
+    pvalue_matrix,
+    significance_heatmap,
+)
+
+
+def test_mannwhitney_pairs_matches_scipy():
+    """
+    Test that batched tests match separate scipy calls, including small samples with ties.
+    """
+    rng = np.random.default_rng(0)
+    samples = [rng.normal(size=n) for n in (5, 5, 12, 12, 30)]
+    samples += [rng.integers(0, 3, size=5).astype(float) for _ in range(3)]
+    pairs = list(itertools.combinations(range(len(samples)), 2))
+
+    pvalues = mannwhitney_pairs(samples, pairs, max_elements=40)
+
+    expected = [
+        mannwhitneyu(samples[i], samples[j], alternative="two-sided").pvalue
+        for i, j in pairs
+    ]
+    np.testing.assert_allclose(pvalues, expected)
+
+
+def test_omnibus_tests_match_scipy():
+    """
+    Test that the stratified Kruskal-Wallis and Friedman tests match scipy, including ties.
+    """
+    rng = np.random.default_rng(1)
+    n_strata, n_groups, n_blocks = 4, 3, 10
+    strata, groups, blocks = np.meshgrid(
+        np.arange(n_strata), np.arange(n_groups), np.arange(n_blocks), indexing="ij"
+    )
+    strata, groups, blocks = strata.ravel(), groups.ravel(), blocks.ravel()
+    values = rng.integers(0, 6, size=len(strata)) + 0.5 * groups * (strata % 2)
+    values = values.astype(float)
+    values[0] = np.nan
+
+    kruskal_p = kruskal_strata(values, strata, groups, n_strata, n_groups)
+    friedman_p = friedman_strata(values, strata, groups, blocks, n_strata, n_groups)
+
+    for s in range(n_strata):
+        cell = values[strata == s].reshape(n_groups, n_blocks)
+        expected = kruskal(*[row[~np.isnan(row)] for row in cell]).pvalue
+        np.testing.assert_allclose(kruskal_p[s], expected)
+        # The block with the missing value is left out
+        complete = ~np.isnan(cell).any(axis=0)
+        expected = friedmanchisquare(*cell[:, complete]).pvalue
+        np.testing.assert_allclose(friedman_p[s], expected)
+
+
+def test_omnibus_gates_pairwise_tests():
+    """
+    Test that pairwise tests run only within x groups with a significant omnibus test.
+    """
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10], 90),
+            "label": np.tile(np.repeat(["a", "b", "c"], 30), 2),
+            "run": np.tile(np.arange(30), 6),
+            "mse": rng.normal(size=180),
+        }
+    )
+    df.loc[(df["snr"] == 0) & (df["label"] == "c"), "mse"] += 3
+
+    for omnibus, block in [("kruskal", None), ("friedman", "run")]:
+        result = compare_hue_within_groups(
+            df, "snr", "mse", "label", omnibus=omnibus, block=block
+        )
+        assert set(result["x"]) == {0}
+        assert len(result) == 3
+        assert (result["omnibus_pvalue"] < 0.05).all()
+
+
+def test_reference_pairs_only():
+    """
+    Test that with a reference only its pairs are tested, with the p-values
+    of the full comparison.
+    """
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10], 60),
+            "label": np.tile(np.repeat(["a", "b", "c"], 20), 2),
+            "mse": rng.normal(size=120),
+        }
+    )
+
+    full = compare_hue_within_groups(df, "snr", "mse", "label")
+    result = compare_hue_within_groups(df, "snr", "mse", "label", reference="b")
+
+    expected = full[(full["hue1"] == "b") | (full["hue2"] == "b")]
+    pd.testing.assert_frame_equal(result, expected.reset_index(drop=True))
+    assert len(result) == 4
+
+
+def test_curve_significance_marks():
+    """
+    Test that only points differing from the reference curve are marked.
+    """
+    curves = [
+        ("A", np.array([1, 2]), np.array([1.0, 2.0]), None),
+        ("B", np.array([1, 2]), np.array([3.0, 4.0]), None),
+        ("C", np.array([1, 2]), np.array([5.0, 6.0]), None),
+    ]
+    sig_df = pd.DataFrame(
+        {
+            "x": [1, 1, 1, 2, 2, 2],
+            "hue1": ["A", "A", "B", "A", "A", "B"],
+            "hue2": ["B", "C", "C", "B", "C", "C"],
+            "pvalue": [0.0001, 0.5, 0.0001, 0.03, 0.2, 0.0001],
+        }
+    )
+    _, ax = subplots()
+
+    marks = add_curve_significance(
+        ax, sig_df, curves, ["r", "g", "b"], "A", significance_levels_asterisk
+    )
+
+    np.testing.assert_array_equal(marks.get_offsets(), [[1, 3.0], [2, 4.0]])
+    np.testing.assert_array_equal(marks.get_sizes(), [180, 60])
+
+
+def test_significance_heatmap_cells():
+    """
+    Test that the heatmap shows the symmetric matrix of `compare_all_pairs`.
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        {
+            "method": np.repeat(["a", "b", "c", "d"], 30),
+            "mse": rng.normal(np.repeat([0.0, 0.1, 1.0, 2.0], 30)),
+        }
+    )
+    sig_df = compare_all_pairs(data, "method", "mse")
+
+    order, matrix = pvalue_matrix(sig_df, "x1", "x2")
+    assert order == ["a", "b", "c", "d"]
+    np.testing.assert_array_equal(matrix, matrix.T)
+    assert np.isnan(np.diag(matrix)).all()
+    for row in sig_df.itertuples():
+        assert matrix[order.index(row.x1), order.index(row.x2)] == row.pvalue
+
+    fig, (ax,) = significance_heatmap(sig_df)
+    cells = ax.get_images()[0].get_array()
+    np.testing.assert_allclose(cells, -np.log10(matrix))
+
+    levels = significance_levels_asterisk
+    fig, (ax,) = significance_heatmap(sig_df, levels=levels)
+    cells = ax.get_images()[0].get_array()
+    for row in sig_df.itertuples():
+        i, j = order.index(row.x1), order.index(row.x2)
+        expected = np.searchsorted(sorted(levels), row.pvalue)
+        assert cells[i, j] == cells[j, i] == expected
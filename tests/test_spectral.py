@@ -0,0 +1,76 @@
+"""Test the spectral error metrics."""
+
+import numpy as np
+import pytest
+
+from visualization_toolkit.adapters.mse_experiment import mse_experiment
+from visualization_toolkit.core import backend
+from visualization_toolkit.metrics.spectral import band_energy, band_mse, spectral_snr
+
+
+@pytest.mark.parametrize("n_samples", [128, 127])
+@pytest.mark.parametrize("chunk", [backend.MSE_CHUNK_ELEMENTS, 300])
+def test_band_mse_sums_to_mse(n_samples, chunk, monkeypatch):
+    """
+    Test that band errors covering all frequencies sum up to the MSE.
+    """
+    monkeypatch.setattr(backend, "MSE_CHUNK_ELEMENTS", chunk)
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=(2, 10, n_samples))
+    bands = [(0, 0.1), (0.1, 0.25), (0.25, 0.5)]
+
+    result = band_mse(a, b, bands, dtype=np.float64)
+
+    assert result.shape == (10, 3)
+    np.testing.assert_allclose(result.sum(axis=1), np.mean((a - b) ** 2, axis=1))
+    np.testing.assert_allclose(band_mse(a, b, bands), result, rtol=1e-5)
+
+
+def test_band_mse_separates_frequencies():
+    """
+    Test that an error at a single frequency falls into its band only.
+    """
+    t = np.arange(1000) / 1000
+    a = np.zeros((1, 1000))
+    b = np.sin(2 * np.pi * 200 * t)[None]
+
+    result = band_mse(a, b, [(0, 100), (100, 500)], fs=1000, dtype=np.float64)
+
+    np.testing.assert_allclose(result[0], [0, 0.5], atol=1e-12)
+    np.testing.assert_allclose(
+        spectral_snr(b, 0.1 * b, [(0, 500)], fs=1000)[0], 10 * np.log10(1 / 0.81)
+    )
+
+
+def test_mse_experiment_bands(monkeypatch):
+    """
+    Test that the band experiment gives the band MSE and spectral SNR of every label.
+    """
+    monkeypatch.setattr(backend, "MSE_CHUNK_ELEMENTS", 256)
+    rng = np.random.default_rng(0)
+    original = rng.normal(size=(6, 64))
+    noisy = {
+        "N": original + rng.normal(0, 0.3, size=original.shape),
+        "S": 0.5 * original,
+    }
+    bands = {"low": (0, 0.1), "high": (0.1, 0.5)}
+    edges = list(bands.values())
+
+    df = mse_experiment(original, noisy, [0, 10], "snr", bands=bands)
+
+    np.testing.assert_allclose(
+        band_energy(original, edges).sum(axis=1),
+        np.mean(original**2, axis=1),
+        rtol=1e-5,
+    )
+    for label, signals in noisy.items():
+        rows = df[df["label"] == label]
+        np.testing.assert_array_equal(rows["band"], np.tile(list(bands), 6))
+        np.testing.assert_allclose(
+            rows["mse"], band_mse(original, signals, edges).ravel(), rtol=1e-6
+        )
+        np.testing.assert_allclose(
+            rows["spectral_snr"],
+            spectral_snr(original, signals, edges).ravel(),
+            rtol=1e-6,
+        )
@@ -0,0 +1,87 @@
+"""Test drawing from saved summaries."""
+
+import io
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+from visualization_toolkit.core.summary import load_summary, summarize
+from visualization_toolkit.plots._significance_boxplot import (
+    compare_hue_within_groups,
+    significance_levels_asterisk,
+)
+from visualization_toolkit.plots.boxplot import boxplot
+from visualization_toolkit.plots.mse import mseplot
+
+matplotlib.use("Agg")
+
+
+def _png(fig) -> bytes:
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def test_summary_draws_identical_figures(tmp_path):
+    """
+    Test that figures drawn from a saved summary equal the ones drawn from the data.
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        {
+            "snr": np.repeat([-6.0, 0.0, 6.0], 100),
+            "label": np.tile(["A", "B"], 150),
+            "mse": rng.lognormal(size=300),
+        }
+    )
+    path = tmp_path / "summary.npz"
+    summarize(data, "snr", "mse", "label").save(path)
+    summary = load_summary(path)
+
+    assert _png(mseplot(data, "snr", "mse", "label").figure) == _png(
+        mseplot(summary, "snr", "mse", "label").figure
+    )
+    styles = {"A": {"patch_artist": True, "notch": True}}
+    assert _png(boxplot(data, "snr", "mse", "label", styles=styles)[0]) == _png(
+        boxplot(summary, "snr", "mse", "label", styles=styles)[0]
+    )
+
+
+def test_summary_significance_fn(tmp_path):
+    """
+    Test that stored significance results are drawn by name.
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10], 40),
+            "label": np.tile(np.repeat(["A", "B"], 20), 2),
+            "mse": rng.gamma(2.0, size=80) + np.tile(np.repeat([0, 3], 20), 2),
+        }
+    )
+
+    def significance_fn(d):
+        return compare_hue_within_groups(d, "snr", "mse", "label")
+
+    path = tmp_path / "summary.npz"
+    summarize(data, "snr", "mse", "label", significance={"hue": significance_fn}).save(
+        path
+    )
+    summary = load_summary(path)
+
+    pd.testing.assert_frame_equal(
+        summary.significance_fn("hue")(None), significance_fn(data), check_dtype=False
+    )
+    with pytest.raises(ValueError):
+        summary.significance_fn("other")
+
+    kwargs = dict(significance_levels=significance_levels_asterisk)
+    assert _png(
+        mseplot(
+            data, "snr", "mse", "label", significance_fn=significance_fn, **kwargs
+        ).figure
+    ) == _png(
+        mseplot(summary, "snr", "mse", "label", significance_fn="hue", **kwargs).figure
+    )
@@ -0,0 +1,82 @@
+"""Test reuse of figure templates."""
+
+import io
+
+import numpy as np
+import pandas as pd
+
+from visualization_toolkit.config import config
+from visualization_toolkit.plots._figure import subplots
+from visualization_toolkit.plots.boxplot import boxplot
+from visualization_toolkit.plots.mse import mseplot
+from visualization_toolkit.plots.templates import TemplatePool
+
+
+def _png(fig) -> bytes:
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=50)
+    return buffer.getvalue()
+
+
+def _data(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10, 20], 40),
+            "mse": rng.lognormal(size=120) * np.repeat([1, 1, 50], 40),
+            "label": np.tile(["A", "B"], 60),
+        }
+    )
+
+
+def test_pooled_figures_equal_new_figures():
+    """
+    Test that renders on reused templates equal renders on new figures.
+    """
+    pool = TemplatePool()
+    styles = {"A": {}, "B": {}}
+    y_limits = ((0.01, 20), (20, 2000))
+    figures = set()
+    with config.pyplot_free():
+        for seed in range(3):
+            data = _data(seed)
+            expected = _png(
+                boxplot(data, "snr", "mse", "label", styles, y_limits, title=seed)[0]
+            )
+            fig, _ = boxplot(
+                data,
+                "snr",
+                "mse",
+                "label",
+                styles,
+                y_limits,
+                title=seed,
+                template_pool=pool,
+            )
+            assert _png(fig) == expected
+            figures.add(id(fig))
+            pool.release(fig)
+
+            expected = _png(mseplot(data, "snr", "mse", "label").figure)
+            ax = mseplot(data, "snr", "mse", "label", template_pool=pool)
+            assert _png(ax.figure) == expected
+            pool.release(ax.figure)
+
+    assert len(figures) == 1
+    assert len(pool) == 2
+
+
+def test_released_figure_drops_suptitle():
+    """
+    Test that the title of a figure is removed on release and set on reuse.
+    """
+    pool = TemplatePool()
+    fig, _ = pool.acquire("layout", subplots)
+    fig.suptitle("first")
+    pool.release(fig)
+
+    reused, _ = pool.acquire("layout", subplots)
+    assert reused is fig
+    assert reused.get_suptitle() == ""
+    reused.suptitle("second")
+    assert [text.get_text() for text in reused.texts] == ["second"]
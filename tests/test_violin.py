@@ -0,0 +1,50 @@
+"""Test the violin plot."""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.collections import PolyCollection
+
+from visualization_toolkit.plots.violin import violinplot
+
+
+def test_violins_clipped_to_groups():
+    """
+    Test that one violin is drawn per non-empty group, within the range of
+    its values and the width of its slot.
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        {
+            "snr": np.repeat([0, 10, 20], 200),
+            "label": np.tile(np.repeat(["A", "B"], 100), 3),
+            "mse": rng.lognormal(np.repeat([0.0, -1.0, -2.0], 200), 0.5),
+        }
+    )
+    data = data[~((data["snr"] == 20) & (data["label"] == "B"))]
+
+    fig, (ax,) = violinplot(data, "snr", "mse", "label")
+
+    bodies = [c for c in ax.collections if isinstance(c, PolyCollection)]
+    assert len(bodies) == 5
+
+    centers = {
+        (x_val, label): position + offset
+        for position, x_val in enumerate([0, 10, 20], start=1)
+        for offset, label in zip([-0.2, 0.2], ["A", "B"])
+    }
+    extents = [body.get_paths()[0].vertices for body in bodies]
+    for (x_val, label), group in data.groupby(["snr", "label"]):
+        values = group["mse"]
+        (vertices,) = [
+            vertices
+            for vertices in extents
+            if np.isclose(
+                vertices[:, 0].min() + vertices[:, 0].max(), 2 * centers[x_val, label]
+            )
+        ]
+        assert values.min() <= vertices[:, 1].min()
+        assert vertices[:, 1].max() <= values.max()
+        half_width = np.abs(vertices[:, 0] - centers[x_val, label]).max()
+        assert np.isclose(half_width, 0.4 * 0.45, rtol=0.05)
+    plt.close(fig)
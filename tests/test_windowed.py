@@ -0,0 +1,63 @@
+"""Test the windowed error metrics."""
+
+import numpy as np
+import pytest
+
+from visualization_toolkit.adapters.mse_experiment import mse_experiment
+from visualization_toolkit.core import backend
+from visualization_toolkit.metrics.windowed import window_starts, windowed_mse
+
+
+@pytest.mark.parametrize(
+    "window, step", [(10, None), (64, 7), (20, 10), (7, 3), (3, 5), (100, None)]
+)
+@pytest.mark.parametrize("chunk", [backend.MSE_CHUNK_ELEMENTS, 500])
+def test_windowed_mse(window, step, chunk, monkeypatch):
+    """
+    Test the windowed MSE against a direct computation of every window.
+    """
+    monkeypatch.setattr(backend, "MSE_CHUNK_ELEMENTS", chunk)
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=(2, 9, 100))
+
+    result = windowed_mse(a, b, window, step)
+
+    expected = [
+        [np.mean((a[i, k : k + window] - b[i, k : k + window]) ** 2) for k in starts]
+        for i in range(len(a))
+        for starts in [window_starts(a.shape[1], window, step)]
+    ]
+    np.testing.assert_allclose(result, expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize("step", [None, 250])
+def test_windowed_mse_after_large_errors(step):
+    """
+    Test that small errors after a long prefix of large errors keep their
+    precision.
+    """
+    error = np.repeat([1e3, 1e-4], 500_000)[None]
+
+    result = windowed_mse(np.zeros_like(error), error, 1000, step)
+
+    starts = window_starts(error.shape[1], 1000, step)
+    np.testing.assert_allclose(result[0, starts >= 500_000], 1e-8, rtol=1e-9)
+    np.testing.assert_allclose(result[0, starts + 1000 <= 500_000], 1e6, rtol=1e-9)
+
+
+def test_mse_experiment_window():
+    """
+    Test that the windowed experiment has one row per signal and window.
+    """
+    rng = np.random.default_rng(0)
+    original = rng.normal(size=(6, 40))
+    noisy = original + rng.normal(size=(6, 40))
+
+    df = mse_experiment(original, {"N": noisy}, [10, 20], "snr", window=10)
+
+    assert len(df) == 6 * 4
+    assert list(df["window"].unique()) == [0, 10, 20, 30]
+    run = df[(df["snr"] == 20) & (df["run"] == 1)]
+    np.testing.assert_allclose(
+        run["mse"], windowed_mse(original[4:5], noisy[4:5], 10)[0]
+    )